@@ -0,0 +1,427 @@
+"""
+Measure the latency, throughput and peak memory use of the conversions, distance
+functions, and coordinate construction in the frolov package.
+
+Each benchmark is run over several numbers of geometries:
+ - the scalar benchmarks loop over the geometries in python, one call per geometry
+ - the batch benchmarks make a single call on an array holding all the geometries
+
+For each run, the fastest of several repeats is kept, and the peak memory allocated
+during the call is measured separately (tracing allocations slows the call down).
+
+Usage:
+    python benchmarks/benchmark_conversions.py --output results.json
+    python benchmarks/benchmark_conversions.py --sizes 100 10000 --filter grid
+
+The JSON output holds a description of the machine and package versions, and one
+record per (benchmark, size), so that results from different releases can be compared.
+"""
+
+from __future__ import annotations
+
+import argparse
+import dataclasses
+import datetime
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Sequence
+
+import numpy as np
+from numpy.typing import NDArray
+
+import frolov.conversions as conversions
+from frolov.coordinates.cartesian_coordinate import CartesianCoordinateBatch
+from frolov.coordinates.cartesian_coordinate import cartesian_approx_eq
+from frolov.coordinates.cartesian_coordinate import cartesian_distance_squared
+from frolov.coordinates.grid_coordinate import GridCoordinate
+from frolov.coordinates.grid_coordinate import GridCoordinateBatch
+from frolov.coordinates.grid_coordinate import grid_approx_eq
+from frolov.coordinates.grid_coordinate import grid_distance_squared
+from frolov.coordinates.pairdistance_coordinate import PairDistanceCoordinate
+from frolov.coordinates.pairdistance_coordinate import PairDistanceCoordinateBatch
+from frolov.coordinates.pairdistance_coordinate import pairdistance_approx_eq
+from frolov.coordinates.pairdistance_coordinate import pairdistance_distance_squared
+from frolov.coordinates.perimetric_coordinate import PerimetricCoordinate
+from frolov.coordinates.perimetric_coordinate import PerimetricCoordinateBatch
+from frolov.coordinates.perimetric_coordinate import perimetric_approx_eq
+from frolov.coordinates.perimetric_coordinate import perimetric_distance_squared
+from frolov.validation import ValidationMode
+from frolov.validation import validation_mode
+
+DEFAULT_SIZES = (1, 100, 10_000, 1_000_000)
+DEFAULT_MAX_SCALAR_SIZE = 10_000
+DEFAULT_REPEAT = 3
+
+
+@dataclass
+class Inputs:
+    """The same set of geometries, in each of the four representations."""
+
+    grid: NDArray[np.float64]
+    perimetric: NDArray[np.float64]
+    pairdistance: NDArray[np.float64]
+    cartesian: NDArray[np.float64]
+
+    def rows(self, kind: str) -> NDArray[np.float64]:
+        return getattr(self, kind)  # type: ignore[no-any-return]
+
+    def coordinates(self, kind: str) -> List[Any]:
+        batch_types = {
+            "grid": GridCoordinateBatch,
+            "perimetric": PerimetricCoordinateBatch,
+            "pairdistance": PairDistanceCoordinateBatch,
+            "cartesian": CartesianCoordinateBatch,
+        }
+        with validation_mode(ValidationMode.OFF):
+            return list(batch_types[kind](self.rows(kind)))
+
+
+@dataclass
+class Benchmark:
+    name: str
+    style: str  # 'scalar' or 'batch'
+    setup: Callable[[Inputs], Any]
+    run: Callable[[Any], Any]
+
+
+@dataclass
+class Result:
+    name: str
+    style: str
+    n_geometries: int
+    seconds: float
+    seconds_per_geometry: float
+    geometries_per_second: float
+    peak_memory_bytes: int
+
+
+def make_inputs(n_geometries: int, seed: int = 0) -> Inputs:
+    """
+    Create geometries that satisfy all the coordinate constraints, and that can be
+    embedded in 3D space; candidates are drawn uniformly from a box in grid space.
+    """
+    rng = np.random.default_rng(seed)
+    lower = np.array([0.0, 0.0, 1.0, 1.0, 1.0, 0.0])
+    upper = np.array([3.0, 3.0, 3.0, 3.0, 3.0, 1.0])
+
+    accepted: List[NDArray[np.float64]] = []
+    n_accepted = 0
+    while n_accepted < n_geometries:
+        candidates = rng.uniform(lower, upper, size=(max(n_geometries, 16), 6))
+        with np.errstate(invalid="ignore", divide="ignore"):
+            points = conversions.grid_to_cartesian_batch(candidates)
+        embeddable = candidates[np.all(np.isfinite(points), axis=(1, 2))]
+        accepted.append(embeddable)
+        n_accepted += embeddable.shape[0]
+
+    grid = np.concatenate(accepted)[:n_geometries]
+    perimetric = conversions.grid_to_perimetric_batch(grid)
+    pairdistance = conversions.perimetric_to_pairdistance_batch(perimetric)
+    cartesian = conversions.pairdistance_to_cartesian_batch(pairdistance)
+
+    return Inputs(grid, perimetric, pairdistance, cartesian)
+
+
+def _scalar_loop(function: Callable[[Any], Any]) -> Callable[[List[Any]], None]:
+    def run(coords: List[Any]) -> None:
+        for coord in coords:
+            function(coord)
+
+    return run
+
+
+def _scalar_pair_loop(
+    function: Callable[[Any, Any], Any],
+) -> Callable[[List[Any]], None]:
+    def run(coords: List[Any]) -> None:
+        previous = coords[-1]
+        for coord in coords:
+            function(previous, coord)
+            previous = coord
+
+    return run
+
+
+def _construct_each(
+    coordinate_type: type, mode: ValidationMode
+) -> Callable[[List[Any]], None]:
+    def run(rows: List[Any]) -> None:
+        with validation_mode(mode):
+            for row in rows:
+                coordinate_type(*row)
+
+    return run
+
+
+def _construct_batch(
+    batch_type: type, mode: ValidationMode
+) -> Callable[[NDArray[np.float64]], None]:
+    def run(rows: NDArray[np.float64]) -> None:
+        with validation_mode(mode):
+            batch_type(rows)
+
+    return run
+
+
+def _rows_for(kind: str) -> Callable[[Inputs], NDArray[np.float64]]:
+    return lambda inputs: inputs.rows(kind)
+
+
+def _coordinates_for(kind: str) -> Callable[[Inputs], List[Any]]:
+    return lambda inputs: inputs.coordinates(kind)
+
+
+def _tuples_for(kind: str) -> Callable[[Inputs], List[Any]]:
+    return lambda inputs: [tuple(row) for row in inputs.rows(kind).tolist()]
+
+
+def make_benchmarks() -> List[Benchmark]:
+    benchmarks: List[Benchmark] = []
+
+    scalar_conversions = [
+        ("grid", conversions.grid_to_perimetric),
+        ("perimetric", conversions.perimetric_to_grid),
+        ("perimetric", conversions.perimetric_to_pairdistance),
+        ("pairdistance", conversions.pairdistance_to_perimetric),
+        ("pairdistance", conversions.pairdistance_to_cartesian),
+        ("cartesian", conversions.cartesian_to_pairdistance),
+        ("grid", conversions.grid_to_cartesian),
+        ("cartesian", conversions.cartesian_to_grid),
+    ]
+    for from_, function in scalar_conversions:
+        benchmarks.append(
+            Benchmark(
+                function.__name__,
+                "scalar",
+                _coordinates_for(from_),
+                _scalar_loop(function),
+            )
+        )
+
+    batch_conversions = [
+        ("grid", conversions.grid_to_perimetric_batch),
+        ("perimetric", conversions.perimetric_to_grid_batch),
+        ("perimetric", conversions.perimetric_to_pairdistance_batch),
+        ("pairdistance", conversions.pairdistance_to_perimetric_batch),
+        ("pairdistance", conversions.pairdistance_to_cartesian_batch),
+        ("pairdistance", conversions.pairdistance_to_cartesian_batch_with_status),
+        ("cartesian", conversions.cartesian_to_pairdistance_batch),
+        ("grid", conversions.grid_to_cartesian_batch),
+        ("cartesian", conversions.cartesian_to_grid_batch),
+    ]
+    for from_, batch_function in batch_conversions:
+        benchmarks.append(
+            Benchmark(
+                batch_function.__name__, "batch", _rows_for(from_), batch_function
+            )
+        )
+
+    pair_functions = [
+        ("grid", grid_distance_squared),
+        ("grid", grid_approx_eq),
+        ("perimetric", perimetric_distance_squared),
+        ("perimetric", perimetric_approx_eq),
+        ("pairdistance", pairdistance_distance_squared),
+        ("pairdistance", pairdistance_approx_eq),
+        ("cartesian", cartesian_distance_squared),
+        ("cartesian", cartesian_approx_eq),
+    ]
+    for kind, pair_function in pair_functions:
+        benchmarks.append(
+            Benchmark(
+                pair_function.__name__,
+                "scalar",
+                _coordinates_for(kind),
+                _scalar_pair_loop(pair_function),
+            )
+        )
+
+    coordinate_types = [
+        ("grid", GridCoordinate, GridCoordinateBatch),
+        ("perimetric", PerimetricCoordinate, PerimetricCoordinateBatch),
+        ("pairdistance", PairDistanceCoordinate, PairDistanceCoordinateBatch),
+    ]
+    for kind, coordinate_type, batch_type in coordinate_types:
+        for mode in (ValidationMode.EAGER, ValidationMode.OFF):
+            benchmarks.append(
+                Benchmark(
+                    f"{coordinate_type.__name__}[{mode.value}]",
+                    "scalar",
+                    _tuples_for(kind),
+                    _construct_each(coordinate_type, mode),
+                )
+            )
+            benchmarks.append(
+                Benchmark(
+                    f"{batch_type.__name__}[{mode.value}]",
+                    "batch",
+                    _rows_for(kind),
+                    _construct_batch(batch_type, mode),
+                )
+            )
+
+    return benchmarks
+
+
+def time_call(run: Callable[[Any], Any], argument: Any, repeat: int) -> float:
+    """The fastest of 'repeat' calls to 'run(argument)', in seconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run(argument)
+        best = min(best, time.perf_counter() - start)
+
+    return best
+
+
+def peak_memory_of_call(run: Callable[[Any], Any], argument: Any) -> int:
+    """The peak memory allocated during a call to 'run(argument)', in bytes."""
+    tracemalloc.start()
+    try:
+        baseline, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        run(argument)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return peak - baseline
+
+
+def run_benchmarks(
+    benchmarks: Sequence[Benchmark],
+    sizes: Sequence[int],
+    max_scalar_size: int,
+    repeat: int,
+    seed: int,
+) -> List[Result]:
+    results: List[Result] = []
+    for size in sizes:
+        inputs = make_inputs(size, seed)
+        for benchmark in benchmarks:
+            if benchmark.style == "scalar" and size > max_scalar_size:
+                continue
+
+            argument = benchmark.setup(inputs)
+            seconds = time_call(benchmark.run, argument, repeat)
+            peak_memory = peak_memory_of_call(benchmark.run, argument)
+
+            result = Result(
+                name=benchmark.name,
+                style=benchmark.style,
+                n_geometries=size,
+                seconds=seconds,
+                seconds_per_geometry=seconds / size,
+                geometries_per_second=size / seconds if seconds > 0.0 else float("inf"),
+                peak_memory_bytes=peak_memory,
+            )
+            results.append(result)
+            print_result(result)
+
+    return results
+
+
+def print_result(result: Result) -> None:
+    print(
+        f"{result.name:<48} {result.style:<6} {result.n_geometries:>9d} "
+        f"{1.0e6 * result.seconds_per_geometry:>12.4f} us/geom "
+        f"{result.geometries_per_second:>14.4e} geom/s "
+        f"{result.peak_memory_bytes / 2**20:>10.3f} MiB",
+        flush=True,
+    )
+
+
+def machine_description() -> Dict[str, Any]:
+    try:
+        from importlib.metadata import version
+
+        frolov_version: Optional[str] = version("frolov")
+    except Exception:
+        frolov_version = None
+
+    return {
+        "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "python": sys.version,
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "processor": platform.processor(),
+        "numpy": np.__version__,
+        "frolov": frolov_version,
+    }
+
+
+def parse_arguments(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=list(DEFAULT_SIZES),
+        help="the numbers of geometries to run each benchmark over",
+    )
+    parser.add_argument(
+        "--max-scalar-size",
+        type=int,
+        default=DEFAULT_MAX_SCALAR_SIZE,
+        help="the largest number of geometries to run the scalar benchmarks over",
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=DEFAULT_REPEAT,
+        help="the number of times each call is timed; the fastest is kept",
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--filter",
+        default=None,
+        help="only run the benchmarks whose names contain this string",
+    )
+    parser.add_argument(
+        "--output", default=None, help="the path of the JSON file to write"
+    )
+
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    arguments = parse_arguments(argv)
+
+    benchmarks = make_benchmarks()
+    if arguments.filter is not None:
+        benchmarks = [bench for bench in benchmarks if arguments.filter in bench.name]
+
+    results = run_benchmarks(
+        benchmarks,
+        arguments.sizes,
+        arguments.max_scalar_size,
+        arguments.repeat,
+        arguments.seed,
+    )
+
+    if arguments.output is not None:
+        report = {
+            "machine": machine_description(),
+            "settings": {
+                "sizes": arguments.sizes,
+                "max_scalar_size": arguments.max_scalar_size,
+                "repeat": arguments.repeat,
+                "seed": arguments.seed,
+            },
+            "results": [dataclasses.asdict(result) for result in results],
+        }
+        with open(arguments.output, "w") as fout:
+            json.dump(report, fout, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,9 +3,91 @@ from frolov.coordinates.grid_coordinate import GridCoordinate
 from frolov.coordinates.pairdistance_coordinate import PairDistanceCoordinate
 from frolov.coordinates.perimetric_coordinate import PerimetricCoordinate
 
+from frolov.coordinates.cartesian_coordinate import CartesianCoordinateBatch
+from frolov.coordinates.grid_coordinate import GridCoordinateBatch
+from frolov.coordinates.pairdistance_coordinate import PairDistanceCoordinateBatch
+from frolov.coordinates.perimetric_coordinate import PerimetricCoordinateBatch
+
 from frolov.conversions import cartesian_to_pairdistance
 from frolov.conversions import pairdistance_to_cartesian
 from frolov.conversions import pairdistance_to_perimetric
 from frolov.conversions import perimetric_to_pairdistance
 from frolov.conversions import perimetric_to_grid
 from frolov.conversions import grid_to_perimetric
+from frolov.conversions import grid_to_cartesian
+from frolov.conversions import cartesian_to_grid
+
+from frolov.conversions import cartesian_to_pairdistance_batch
+from frolov.conversions import pairdistance_to_cartesian_batch
+from frolov.conversions import pairdistance_to_perimetric_batch
+from frolov.conversions import perimetric_to_pairdistance_batch
+from frolov.conversions import perimetric_to_grid_batch
+from frolov.conversions import grid_to_perimetric_batch
+from frolov.conversions import grid_to_cartesian_batch
+from frolov.conversions import cartesian_to_grid_batch
+
+from frolov.conversions import COORDINATE_KINDS
+from frolov.conversions import get_batch_conversion
+
+from frolov.conversions import EmbeddingStatus
+from frolov.conversions import pairdistance_to_cartesian_batch_with_status
+
+from frolov.validation import InvalidCoordinateError
+from frolov.validation import EmbeddabilityReport
+from frolov.validation import ValidationMode
+from frolov.validation import ValidationReport
+from frolov.validation import get_validation_mode
+from frolov.validation import set_validation_mode
+from frolov.validation import validation_mode
+from frolov.validation import cayley_menger_volume_squared_batch
+from frolov.validation import validate_cartesian_batch
+from frolov.validation import validate_embeddable_pairdistance_batch
+from frolov.validation import validate_grid_batch
+from frolov.validation import validate_pairdistance_batch
+from frolov.validation import validate_perimetric_batch
+
+from frolov.storage import CoordinateWriter
+from frolov.storage import open_memmap
+from frolov.storage import read_header
+from frolov.storage import save
+
+from frolov.parallel import ParallelConverter
+
+from frolov.sampling import GridBounds
+from frolov.sampling import GridSampler
+from frolov.sampling import SymmetryReducedSampler
+from frolov.sampling import fundamental_domain_mask
+
+from frolov.symmetry import DeduplicationIndex
+from frolov.symmetry import canonicalize_pairdistance_batch
+from frolov.symmetry import canonicalize_perimetric_batch
+from frolov.symmetry import deduplicate_pairdistance_batch
+from frolov.symmetry import is_canonical_pairdistance_batch
+
+from frolov.spatial import KDTree
+
+from frolov.cache import ConversionCache
+from frolov.cache import cached_conversion
+
+from frolov.jacobians import chain_jacobians
+from frolov.jacobians import get_batch_jacobian
+
+from frolov.profiling import ProfileRegistry
+from frolov.profiling import disable_profiling
+from frolov.profiling import enable_profiling
+
+from frolov.tensor_grid import TensorGrid
+
+from frolov.moves import Walker
+from frolov.moves import WalkerBatch
+
+from frolov.selection import farthest_point_sampling
+from frolov.selection import greedy_k_center
+
+from frolov.precision import approx_eq_eps_sq
+
+from frolov.trajectory import convert_trajectory
+from frolov.trajectory import iter_frames
+
+from frolov.scan import EnergyCache
+from frolov.scan import scan_potential
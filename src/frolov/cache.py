@@ -0,0 +1,165 @@
+"""
+This module contains an opt-in cache for the conversions between single coordinates.
+
+Scans and optimizations over a potential energy surface tend to revisit the same
+geometries many times, and each visit repeats the same chain of conversions (for
+example, grid -> perimetric -> pair distance -> Cartesian). Wrapping a conversion
+function with 'cached_conversion()' stores its most recent results, so that repeated
+conversions of the same coordinate are looked up instead of recomputed.
+
+The cache is keyed on the values of the input coordinate. If a 'tolerance' is given, the
+values are first rounded to the nearest multiple of the tolerance; all the coordinates
+that round to the same values then share a single cached result, namely the result for
+the first of them to be converted. This is only appropriate when differences smaller than
+the tolerance do not matter to the caller.
+
+The cache holds at most 'maxsize' results, and discards the least recently used result
+when it is full.
+"""
+
+from __future__ import annotations
+
+import functools
+import threading
+from collections import OrderedDict
+from typing import Any
+from typing import Callable
+from typing import Hashable
+from typing import NamedTuple
+from typing import Optional
+from typing import Tuple
+from typing import TypeVar
+
+from frolov.coordinates.cartesian_coordinate import CartesianCoordinate
+
+InputT = TypeVar("InputT")
+OutputT = TypeVar("OutputT")
+
+
+class CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    evictions: int
+    maxsize: int
+    currsize: int
+
+
+def _coordinate_values(coord: Any) -> Tuple[float, ...]:
+    """The values of a coordinate, with the points of a CartesianCoordinate flattened."""
+    if not isinstance(coord, CartesianCoordinate):
+        return coord.unpack()  # type: ignore[no-any-return]
+
+    return tuple(point[i] for point in coord.unpack() for i in range(3))
+
+
+class ConversionCache:
+    """
+    A least-recently-used cache for the results of conversions between coordinates.
+
+    A single cache can be shared by several conversion functions; the results of each
+    function are stored under separate keys.
+    """
+
+    def __init__(self, maxsize: int = 1024, tolerance: Optional[float] = None) -> None:
+        if maxsize < 1:
+            raise ValueError(f"The maximum size must be positive, found {maxsize}")
+        if tolerance is not None and not tolerance > 0.0:
+            raise ValueError(f"The tolerance must be positive, found {tolerance}")
+
+        self._maxsize = maxsize
+        self._tolerance = tolerance
+        self._results: OrderedDict[Hashable, Any] = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    @property
+    def maxsize(self) -> int:
+        return self._maxsize
+
+    @property
+    def tolerance(self) -> Optional[float]:
+        return self._tolerance
+
+    def __len__(self) -> int:
+        return len(self._results)
+
+    def key(self, coord: Any) -> Tuple[Any, ...]:
+        """The key that the results for 'coord' are stored under."""
+        values = _coordinate_values(coord)
+        if self._tolerance is None:
+            return (type(coord),) + values
+
+        tolerance = self._tolerance
+        return (type(coord),) + tuple(round(value / tolerance) for value in values)
+
+    def info(self) -> CacheInfo:
+        return CacheInfo(
+            self._hits, self._misses, self._evictions, self._maxsize, len(self._results)
+        )
+
+    def clear(self) -> None:
+        """Remove all the stored results, and reset the statistics."""
+        with self._lock:
+            self._results.clear()
+            self._hits = 0
+            self._misses = 0
+            self._evictions = 0
+
+    def get_or_compute(
+        self, func: Callable[[InputT], OutputT], coord: InputT
+    ) -> OutputT:
+        """Look up the result of 'func(coord)', computing and storing it if needed."""
+        key = (func, self.key(coord))
+
+        with self._lock:
+            if key in self._results:
+                self._results.move_to_end(key)
+                self._hits += 1
+                return self._results[key]  # type: ignore[no-any-return]
+            self._misses += 1
+
+        # the conversion itself is done outside the lock, so that other threads are
+        # not blocked while it runs
+        result = func(coord)
+
+        with self._lock:
+            self._results[key] = result
+            self._results.move_to_end(key)
+            while len(self._results) > self._maxsize:
+                self._results.popitem(last=False)
+                self._evictions += 1
+
+        return result
+
+    def wrap(self, func: Callable[[InputT], OutputT]) -> Callable[[InputT], OutputT]:
+        """
+        Wrap a conversion function so that its results are stored in this cache. The
+        wrapper has the same signature as 'func', and the cache is available through
+        its 'cache' attribute.
+        """
+
+        @functools.wraps(func)
+        def wrapper(coord: InputT) -> OutputT:
+            return self.get_or_compute(func, coord)
+
+        wrapper.cache = self  # type: ignore[attr-defined]
+        return wrapper
+
+
+def cached_conversion(
+    func: Callable[[InputT], OutputT],
+    maxsize: int = 1024,
+    tolerance: Optional[float] = None,
+) -> Callable[[InputT], OutputT]:
+    """
+    Wrap a conversion function with a new ConversionCache of its own.
+
+    Example:
+    >>> cached_grid_to_cartesian = cached_conversion(grid_to_cartesian, maxsize=4096)
+    >>> points = cached_grid_to_cartesian(gridcoord)
+    >>> cached_grid_to_cartesian.cache.info()
+    CacheInfo(hits=0, misses=1, evictions=0, maxsize=4096, currsize=1)
+    """
+    return ConversionCache(maxsize, tolerance).wrap(func)
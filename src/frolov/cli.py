@@ -0,0 +1,232 @@
+"""
+The command-line interface of the frolov package.
+
+Usage:
+    python -m frolov convert INPUT OUTPUT --from KIND --to KIND [options]
+
+The coordinate kinds are named as in 'frolov.conversions.COORDINATE_KINDS'. The format of
+each file is chosen from its suffix:
+ - '.csv'    : text, one coordinate per row, with the values separated by commas
+ - '.npy'    : a numpy array of shape (N, 6), or (N, 4, 3) for Cartesian coordinates
+ - '.frolov' : the binary format of 'frolov.storage'
+ - '.xyz'    : (input only) a trajectory in the XYZ format of 'frolov.trajectory',
+               which holds Cartesian coordinates
+ - anything else : text, one coordinate per row, with the values separated by whitespace
+
+In text files, a Cartesian coordinate is written as a flat row of 12 values
+(x0, y0, z0, x1, ..., z3).
+
+The input is read, converted, and written in chunks of '--chunk-size' rows, so the
+memory used does not depend on the size of the input. The conversion is always carried
+out in float64; '--dtype float32' only rounds the values written.
+"""
+
+from __future__ import annotations
+
+import argparse
+import math
+import struct
+import sys
+import time
+from pathlib import Path
+from typing import Any
+from typing import Iterator
+from typing import Optional
+from typing import Sequence
+from typing import Tuple
+
+import numpy as np
+from numpy.typing import NDArray
+
+from frolov.conversions import COORDINATE_KINDS
+from frolov.conversions import row_shape
+from frolov.parallel import ParallelConverter
+from frolov.precision import resolve_dtype
+from frolov.storage import FILE_SUFFIX
+from frolov.storage import CoordinateWriter
+from frolov.stream import DEFAULT_CHUNK_SIZE
+from frolov.stream import iter_chunks
+from frolov.trajectory import iter_xyz_frames
+
+# the total size of the header of the '.npy' files written; this leaves room for a
+# shape with a count of up to 20 digits, so that the header can be rewritten in place
+_NPY_HEADER_SIZE = 128
+
+
+class _TextWriter:
+    def __init__(self, path: Path, delimiter: str, dtype: np.dtype[Any]) -> None:
+        self._fout = open(path, "w")
+        self._delimiter = delimiter
+        self._dtype = dtype
+        # enough significant digits to recover every value exactly
+        self._format = "%.9g" if dtype == np.float32 else "%.17g"
+
+    def write(self, chunk: NDArray[np.float64]) -> None:
+        rows = chunk.reshape(chunk.shape[0], -1).astype(self._dtype, copy=False)
+        np.savetxt(self._fout, rows, fmt=self._format, delimiter=self._delimiter)
+
+    def close(self) -> None:
+        self._fout.close()
+
+
+class _NpyWriter:
+    """
+    Write an '.npy' file one chunk at a time. The number of rows is not known until all
+    the chunks are written, so the header is rewritten when the writer is closed.
+    """
+
+    def __init__(
+        self, path: Path, shape: Tuple[int, ...], dtype: np.dtype[Any]
+    ) -> None:
+        self._fout = open(path, "wb")
+        self._shape = shape
+        self._dtype = dtype
+        self._count = 0
+        self._fout.write(self._header())
+
+    def _header(self) -> bytes:
+        description = {
+            "descr": np.lib.format.dtype_to_descr(self._dtype),
+            "fortran_order": False,
+            "shape": (self._count,) + self._shape,
+        }
+        prefix = np.lib.format.magic(1, 0)
+        n_header = _NPY_HEADER_SIZE - len(prefix) - 2
+        encoded = repr(description).encode("latin1").ljust(n_header - 1) + b"\n"
+
+        return prefix + struct.pack("<H", n_header) + encoded
+
+    def write(self, chunk: NDArray[np.float64]) -> None:
+        self._fout.write(np.ascontiguousarray(chunk, dtype=self._dtype).tobytes())
+        self._count += chunk.shape[0]
+
+    def close(self) -> None:
+        if self._fout.closed:
+            return
+
+        self._fout.seek(0)
+        self._fout.write(self._header())
+        self._fout.close()
+
+
+def _open_writer(path: Path, kind: str, dtype: np.dtype[Any]) -> Any:
+    if path.suffix == FILE_SUFFIX:
+        return CoordinateWriter(path, kind, dtype)
+    if path.suffix == ".npy":
+        return _NpyWriter(path, row_shape(kind), dtype)
+    if path.suffix == ".csv":
+        return _TextWriter(path, ",", dtype)
+
+    return _TextWriter(path, " ", dtype)
+
+
+def _iter_input_chunks(
+    path: Path, kind: str, chunk_size: int
+) -> Iterator[NDArray[np.float64]]:
+    if path.suffix == ".xyz":
+        if kind != "cartesian":
+            raise ValueError(f"'{path}' holds cartesian coordinates, not {kind}")
+        return iter_xyz_frames(path, chunk_size)
+
+    return iter_chunks(path, kind, chunk_size)
+
+
+def run_convert(arguments: argparse.Namespace) -> int:
+    from_ = arguments.from_
+    to = arguments.to
+    n_workers = arguments.workers
+    chunk_size = arguments.chunk_size
+    if n_workers < 1:
+        raise ValueError(f"At least one worker is needed, found {n_workers}")
+
+    # each chunk that is read is shared between the workers
+    worker_chunk_size = max(1, math.ceil(chunk_size / n_workers))
+    converter = ParallelConverter(from_, to, n_workers, worker_chunk_size)
+
+    n_rows = 0
+    start = time.perf_counter()
+    with converter, np.errstate(invalid="ignore", divide="ignore"):
+        writer = _open_writer(
+            Path(arguments.output), to, resolve_dtype(arguments.dtype)
+        )
+        try:
+            for chunk in _iter_input_chunks(Path(arguments.input), from_, chunk_size):
+                writer.write(converter.convert(chunk))
+                n_rows += chunk.shape[0]
+        finally:
+            writer.close()
+    elapsed = time.perf_counter() - start
+
+    if not arguments.quiet:
+        rate = n_rows / elapsed if elapsed > 0.0 else float("inf")
+        print(
+            f"converted {n_rows} {from_} coordinates to {to} coordinates "
+            f"in {elapsed:.3f} s ({rate:.4g} rows/s)",
+            file=sys.stderr,
+        )
+
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="frolov",
+        description="Tools for working with four-body perimetric coordinates.",
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    convert_parser = subparsers.add_parser(
+        "convert",
+        help="convert a file of coordinates from one kind to another",
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    convert_parser.add_argument("input", help="the file holding the coordinates")
+    convert_parser.add_argument("output", help="the file to write the results to")
+    convert_parser.add_argument(
+        "--from",
+        dest="from_",
+        required=True,
+        choices=COORDINATE_KINDS,
+        help="the kind of coordinate in the input file",
+    )
+    convert_parser.add_argument(
+        "--to",
+        required=True,
+        choices=COORDINATE_KINDS,
+        help="the kind of coordinate to write to the output file",
+    )
+    convert_parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=DEFAULT_CHUNK_SIZE,
+        help="the number of rows to read and convert at a time (default: %(default)s)",
+    )
+    convert_parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="the number of processes to convert each chunk with (default: %(default)s)",
+    )
+    convert_parser.add_argument(
+        "--dtype",
+        default="float64",
+        choices=("float32", "float64"),
+        help="the precision of the values written (default: %(default)s)",
+    )
+    convert_parser.add_argument(
+        "--quiet", action="store_true", help="do not report the conversion rate"
+    )
+    convert_parser.set_defaults(handler=run_convert)
+
+    return parser
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = build_parser()
+    arguments = parser.parse_args(argv)
+
+    try:
+        return int(arguments.handler(arguments))
+    except (OSError, ValueError) as error:
+        parser.exit(1, f"frolov: error: {error}\n")
@@ -1,26 +1,148 @@
+import enum
+import functools
 import math
+from typing import Callable
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Protocol
+from typing import Tuple
+from typing import TypeVar
+
+import numpy as np
+from numpy.typing import DTypeLike
+from numpy.typing import NDArray
 
 from cartesian import Cartesian3D
-from cartesian.measure import euclidean_distance
 
 from frolov.coordinates.cartesian_coordinate import CartesianCoordinate
+from frolov.coordinates.cartesian_coordinate import _point_components
 from frolov.coordinates.grid_coordinate import GridCoordinate
 from frolov.coordinates.pairdistance_coordinate import PairDistanceCoordinate
 from frolov.coordinates.perimetric_coordinate import PerimetricCoordinate
+from frolov.precision import resolve_dtype
+from frolov.profiling import profiled
 
+# The arithmetic of each conversion is written once, in the private '_*_values()'
+# functions below. These functions work equally well on six python floats (for the
+# scalar conversions) and on six 1D numpy arrays holding the columns of a batch (for
+# the batched conversions), because both support the same arithmetic operators.
+Value = TypeVar("Value", float, NDArray[np.float64])
+SixValues = Tuple[Value, Value, Value, Value, Value, Value]
 
-def cartesian_to_pairdistance(points: CartesianCoordinate) -> PairDistanceCoordinate:
-    """Calculate the 6 relative pair distances from the 4 Cartesian points."""
-    point0, point1, point2, point3 = points.unpack()
 
-    r01 = euclidean_distance(point0, point1)
-    r02 = euclidean_distance(point0, point2)
-    r03 = euclidean_distance(point0, point3)
-    r12 = euclidean_distance(point1, point2)
-    r13 = euclidean_distance(point1, point3)
-    r23 = euclidean_distance(point2, point3)
+def _pairdistance_to_perimetric_values(
+    r01: Value, r02: Value, r03: Value, r12: Value, r13: Value, r23: Value
+) -> SixValues[Value]:
+    u1 = 0.5 * (r02 + r01 - r12)
+    u2 = 0.5 * (r01 + r12 - r02)
+    u3 = 0.5 * (r12 + r02 - r01)
+    t3 = 0.5 * (r13 + r03 - r01)
+    s3 = 0.5 * (r23 + r12 - r13)
+    w3 = 0.5 * (r23 + r02 - r03)
+
+    return (u1, u2, u3, t3, s3, w3)
+
+
+def _perimetric_to_pairdistance_values(
+    u1: Value, u2: Value, u3: Value, t3: Value, s3: Value, w3: Value
+) -> SixValues[Value]:
+    r12 = u1 + u2
+    r13 = u1 + u3
+    r14 = u1 + s3 + t3 - w3
+    r23 = u2 + u3
+    r24 = u2 + w3 + t3 - s3
+    r34 = t3 + w3 + s3 - u3
+
+    return (r12, r13, r14, r23, r24, r34)
+
+
+def _perimetric_to_grid_values(
+    u1: Value, u2: Value, u3: Value, t3: Value, s3: Value, w3: Value
+) -> SixValues[Value]:
+    grid_u1 = u1
+    grid_u2 = u2
+    grid_s3 = s3 / u2
+    grid_u3 = u3 / s3
+    grid_t3 = t3 / u3
+    grid_w3 = (w3 - s3 + u2) / (u1 + u2)
+
+    return (grid_u1, grid_u2, grid_u3, grid_t3, grid_s3, grid_w3)
+
+
+def _grid_to_perimetric_values(
+    grid_u1: Value,
+    grid_u2: Value,
+    grid_u3: Value,
+    grid_t3: Value,
+    grid_s3: Value,
+    grid_w3: Value,
+) -> SixValues[Value]:
+    u1 = grid_u1
+    u2 = grid_u2
+    s3 = grid_s3 * u2
+    u3 = grid_u3 * s3
+    t3 = grid_t3 * u3
+    w3 = grid_w3 * (u1 + u2) + (s3 - u2)
+
+    return (u1, u2, u3, t3, s3, w3)
+
+
+def _pairdistance_to_cartesian_values(
+    r01: Value,
+    r02: Value,
+    r03: Value,
+    r12: Value,
+    r13: Value,
+    r23: Value,
+    sqrt: Callable[[Value], Value],
+) -> Tuple[Value, Value, Value, Value, Value]:
+    """
+    Calculate the five non-trivial Cartesian components (x2, y2, x3, y3, z3) of the
+    four points placed by 'pairdistance_to_cartesian()'.
+    """
+    x2 = (r01**2 + r02**2 - r12**2) / (2.0 * r01)
+    y2 = sqrt(r02**2 - x2**2)
+
+    x3 = (r03**2 - r13**2 + r01**2) / (2.0 * r01)
+    y3 = (r03**2 - r23**2 + r02**2 - 2.0 * x2 * x3) / (2.0 * y2)
+    z3 = sqrt(r03**2 - x3**2 - y3**2)
+
+    return (x2, y2, x3, y3, z3)
+
+
+def _cartesian_to_pairdistance_values(
+    point0: Cartesian3D, point1: Cartesian3D, point2: Cartesian3D, point3: Cartesian3D
+) -> SixValues[float]:
+    q0 = _point_components(point0)
+    q1 = _point_components(point1)
+    q2 = _point_components(point2)
+    q3 = _point_components(point3)
+
+    r01 = math.dist(q0, q1)
+    r02 = math.dist(q0, q2)
+    r03 = math.dist(q0, q3)
+    r12 = math.dist(q1, q2)
+    r13 = math.dist(q1, q3)
+    r23 = math.dist(q2, q3)
 
-    return PairDistanceCoordinate(r01, r02, r03, r12, r13, r23)
+    return (r01, r02, r03, r12, r13, r23)
+
+
+def _cartesian_from_values(
+    r01: float, x2: float, y2: float, x3: float, y3: float, z3: float
+) -> CartesianCoordinate:
+    point0 = Cartesian3D(0.0, 0.0, 0.0)
+    point1 = Cartesian3D(r01, 0.0, 0.0)
+    point2 = Cartesian3D(x2, y2, 0.0)
+    point3 = Cartesian3D(x3, y3, z3)
+
+    return CartesianCoordinate(point0, point1, point2, point3)
+
+
+def cartesian_to_pairdistance(points: CartesianCoordinate) -> PairDistanceCoordinate:
+    """Calculate the 6 relative pair distances from the 4 Cartesian points."""
+    return PairDistanceCoordinate(*_cartesian_to_pairdistance_values(*points.unpack()))
 
 
 def pairdistance_to_cartesian(pairdists: PairDistanceCoordinate) -> CartesianCoordinate:
@@ -44,23 +166,11 @@ def pairdistance_to_cartesian(pairdists: PairDistanceCoordinate) -> CartesianCoo
     three DOF describing the orientation in space of the four-body system are also lost.
     """
     r01, r02, r03, r12, r13, r23 = pairdists.unpack()
+    components = _pairdistance_to_cartesian_values(
+        r01, r02, r03, r12, r13, r23, math.sqrt
+    )
 
-    cos_theta102 = (r01**2 + r02**2 - r12**2) / (2.0 * r01 * r02)
-
-    x2 = r02 * cos_theta102
-    y2 = math.sqrt(r02**2 - x2**2)
-    z2 = 0.0
-
-    x3 = (r03**2 - r13**2 + r01**2) / (2.0 * r01)
-    y3 = (r03**2 - r23**2 + r02**2 - 2.0 * x2 * x3) / (2.0 * y2)
-    z3 = math.sqrt(r03**2 - x3**2 - y3**2)
-
-    point0 = Cartesian3D(0.0, 0.0, 0.0)
-    point1 = Cartesian3D(r01, 0.0, 0.0)
-    point2 = Cartesian3D(x2, y2, z2)
-    point3 = Cartesian3D(x3, y3, z3)
-
-    return CartesianCoordinate(point0, point1, point2, point3)
+    return _cartesian_from_values(r01, *components)
 
 
 def pairdistance_to_perimetric(
@@ -71,16 +181,9 @@ def pairdistance_to_perimetric(
 
     These conversions are taken directly from equation (24) in the paper.
     """
-    r01, r02, r03, r12, r13, r23 = pairdists.unpack()
-
-    u1 = 0.5 * (r02 + r01 - r12)
-    u2 = 0.5 * (r01 + r12 - r02)
-    u3 = 0.5 * (r12 + r02 - r01)
-    t3 = 0.5 * (r13 + r03 - r01)
-    s3 = 0.5 * (r23 + r12 - r13)
-    w3 = 0.5 * (r23 + r02 - r03)
-
-    return PerimetricCoordinate(u1, u2, u3, t3, s3, w3)
+    return PerimetricCoordinate(
+        *_pairdistance_to_perimetric_values(*pairdists.unpack())
+    )
 
 
 def perimetric_to_pairdistance(
@@ -92,41 +195,420 @@ def perimetric_to_pairdistance(
 
     These conversions are taken directly from equation (25) in the paper.
     """
-    u1, u2, u3, t3, s3, w3 = perimetric.unpack()
-
-    r12 = u1 + u2
-    r13 = u1 + u3
-    r14 = u1 + s3 + t3 - w3
-    r23 = u2 + u3
-    r24 = u2 + w3 + t3 - s3
-    r34 = t3 + w3 + s3 - u3
-
-    return PairDistanceCoordinate(r12, r13, r14, r23, r24, r34)
+    return PairDistanceCoordinate(
+        *_perimetric_to_pairdistance_values(*perimetric.unpack())
+    )
 
 
 def perimetric_to_grid(perimetric: PerimetricCoordinate) -> GridCoordinate:
     """Perform the inverse transformations of 'grid_to_perimetric()'"""
-    u1, u2, u3, t3, s3, w3 = perimetric.unpack()
-
-    grid_u1 = u1
-    grid_u2 = u2
-    grid_s3 = s3 / u2
-    grid_u3 = u3 / s3
-    grid_t3 = t3 / u3
-    grid_w3 = (w3 - s3 + u2) / (u1 + u2)
-
-    return GridCoordinate(grid_u1, grid_u2, grid_u3, grid_t3, grid_s3, grid_w3)
+    return GridCoordinate(*_perimetric_to_grid_values(*perimetric.unpack()))
 
 
 def grid_to_perimetric(gridcoord: GridCoordinate) -> PerimetricCoordinate:
     """Perform the transformations that turn a grid coordinate into a perimetric coordinate."""
-    grid_u1, grid_u2, grid_u3, grid_t3, grid_s3, grid_w3 = gridcoord.unpack()
+    return PerimetricCoordinate(*_grid_to_perimetric_values(*gridcoord.unpack()))
 
-    u1 = grid_u1
-    u2 = grid_u2
-    s3 = grid_s3 * u2
-    u3 = grid_u3 * s3
-    t3 = grid_t3 * u3
-    w3 = grid_w3 * (u1 + u2) + (s3 - u2)
 
-    return PerimetricCoordinate(u1, u2, u3, t3, s3, w3)
+def grid_to_cartesian(gridcoord: GridCoordinate) -> CartesianCoordinate:
+    """
+    Convert a grid coordinate directly into four Cartesian points.
+
+    This gives the same result as chaining 'grid_to_perimetric()',
+    'perimetric_to_pairdistance()' and 'pairdistance_to_cartesian()', but none of the
+    intermediate coordinate instances are created (or checked).
+    """
+    perimetrics = _grid_to_perimetric_values(*gridcoord.unpack())
+    r01, r02, r03, r12, r13, r23 = _perimetric_to_pairdistance_values(*perimetrics)
+    components = _pairdistance_to_cartesian_values(
+        r01, r02, r03, r12, r13, r23, math.sqrt
+    )
+
+    return _cartesian_from_values(r01, *components)
+
+
+def cartesian_to_grid(points: CartesianCoordinate) -> GridCoordinate:
+    """
+    Convert four Cartesian points directly into a grid coordinate.
+
+    This gives the same result as chaining 'cartesian_to_pairdistance()',
+    'pairdistance_to_perimetric()' and 'perimetric_to_grid()', but none of the
+    intermediate coordinate instances are created (or checked).
+    """
+    pairdists = _cartesian_to_pairdistance_values(*points.unpack())
+    perimetrics = _pairdistance_to_perimetric_values(*pairdists)
+
+    return GridCoordinate(*_perimetric_to_grid_values(*perimetrics))
+
+
+# --- batched conversions ------------------------------------------------------------
+#
+# The functions below are the array counterparts of the scalar conversions above. Each
+# takes an array holding N coordinates (one per row) and returns an array holding the
+# N converted coordinates. The six columns follow the same order as the fields of the
+# corresponding coordinate dataclass (and the order of its 'unpack()' method):
+#  - grid         : (grid_u1, grid_u2, grid_u3, grid_t3, grid_s3, grid_w3)
+#  - perimetric   : (u1, u2, u3, t3, s3, w3)
+#  - pair distance: (r01, r02, r03, r12, r13, r23)
+#
+# Cartesian batches have the shape (N, 4, 3); the second axis indexes the point, and
+# the third axis indexes the (x, y, z) components.
+
+
+def _as_six_column_batch(
+    coords: NDArray[np.float64], dtype: DTypeLike = np.float64
+) -> NDArray[np.float64]:
+    coords = np.asarray(coords, dtype=dtype)
+    if coords.ndim != 2 or coords.shape[1] != 6:
+        raise ValueError(f"Expected an array of shape (N, 6), found {coords.shape}")
+
+    return coords
+
+
+def _as_cartesian_batch(points: NDArray[np.float64]) -> NDArray[np.float64]:
+    points = np.asarray(points, dtype=np.float64)
+    if points.ndim != 3 or points.shape[1:] != (4, 3):
+        raise ValueError(f"Expected an array of shape (N, 4, 3), found {points.shape}")
+
+    return points
+
+
+def _stack_columns(
+    columns: SixValues[NDArray[np.float64]], dtype: DTypeLike = np.float64
+) -> NDArray[np.float64]:
+    """Gather six columns into a single C-contiguous array of shape (N, 6)."""
+    output = np.empty((columns[0].shape[0], 6), dtype=dtype)
+    for i_column, column in enumerate(columns):
+        output[:, i_column] = column
+
+    return output
+
+
+def _pairdistance_columns_from_cartesian(
+    points: NDArray[np.float64],
+) -> SixValues[NDArray[np.float64]]:
+    def pair_distance(i0: int, i1: int) -> NDArray[np.float64]:
+        sep = points[:, i0, :] - points[:, i1, :]
+        distance: NDArray[np.float64] = np.sqrt(np.einsum("ij,ij->i", sep, sep))
+        return distance
+
+    return (
+        pair_distance(0, 1),
+        pair_distance(0, 2),
+        pair_distance(0, 3),
+        pair_distance(1, 2),
+        pair_distance(1, 3),
+        pair_distance(2, 3),
+    )
+
+
+def _cartesian_from_columns(
+    pairdist_columns: SixValues[NDArray[np.float64]], dtype: DTypeLike = np.float64
+) -> NDArray[np.float64]:
+    """
+    Place the four points of each geometry; the columns must be float64, and the points
+    are rounded to 'dtype' only once they are placed.
+    """
+    r01 = pairdist_columns[0]
+    x2, y2, x3, y3, z3 = _pairdistance_to_cartesian_values(*pairdist_columns, np.sqrt)
+
+    points = np.zeros((r01.shape[0], 4, 3), dtype=dtype)
+    points[:, 1, 0] = r01
+    points[:, 2, 0] = x2
+    points[:, 2, 1] = y2
+    points[:, 3, 0] = x3
+    points[:, 3, 1] = y3
+    points[:, 3, 2] = z3
+
+    return points
+
+
+@profiled
+def cartesian_to_pairdistance_batch(
+    points: NDArray[np.float64], dtype: Optional[DTypeLike] = None
+) -> NDArray[np.float64]:
+    """The batched version of 'cartesian_to_pairdistance()'; maps (N, 4, 3) -> (N, 6)."""
+    points = _as_cartesian_batch(points)
+    return _stack_columns(
+        _pairdistance_columns_from_cartesian(points), resolve_dtype(dtype)
+    )
+
+
+@profiled
+def pairdistance_to_cartesian_batch(
+    pairdists: NDArray[np.float64], dtype: Optional[DTypeLike] = None
+) -> NDArray[np.float64]:
+    """
+    The batched version of 'pairdistance_to_cartesian()'; maps (N, 6) -> (N, 4, 3).
+
+    The four points of each geometry are placed using the same conventions as in the
+    scalar version. They are always placed in float64, and then rounded to 'dtype'.
+    """
+    pairdists = _as_six_column_batch(pairdists)
+    return _cartesian_from_columns(
+        tuple(pairdists.T), resolve_dtype(dtype)  # type: ignore[arg-type]
+    )
+
+
+@profiled
+def pairdistance_to_perimetric_batch(
+    pairdists: NDArray[np.float64], dtype: Optional[DTypeLike] = None
+) -> NDArray[np.float64]:
+    """The batched version of 'pairdistance_to_perimetric()'; see equation (24)."""
+    dtype = resolve_dtype(dtype)
+    pairdists = _as_six_column_batch(pairdists, dtype)
+    return _stack_columns(_pairdistance_to_perimetric_values(*pairdists.T), dtype)
+
+
+@profiled
+def perimetric_to_pairdistance_batch(
+    perimetrics: NDArray[np.float64], dtype: Optional[DTypeLike] = None
+) -> NDArray[np.float64]:
+    """The batched version of 'perimetric_to_pairdistance()'; see equation (25)."""
+    dtype = resolve_dtype(dtype)
+    perimetrics = _as_six_column_batch(perimetrics, dtype)
+    return _stack_columns(_perimetric_to_pairdistance_values(*perimetrics.T), dtype)
+
+
+@profiled
+def perimetric_to_grid_batch(
+    perimetrics: NDArray[np.float64], dtype: Optional[DTypeLike] = None
+) -> NDArray[np.float64]:
+    """The batched version of 'perimetric_to_grid()'."""
+    dtype = resolve_dtype(dtype)
+    perimetrics = _as_six_column_batch(perimetrics, dtype)
+    return _stack_columns(_perimetric_to_grid_values(*perimetrics.T), dtype)
+
+
+@profiled
+def grid_to_perimetric_batch(
+    gridcoords: NDArray[np.float64], dtype: Optional[DTypeLike] = None
+) -> NDArray[np.float64]:
+    """The batched version of 'grid_to_perimetric()'."""
+    dtype = resolve_dtype(dtype)
+    gridcoords = _as_six_column_batch(gridcoords, dtype)
+    return _stack_columns(_grid_to_perimetric_values(*gridcoords.T), dtype)
+
+
+@profiled
+def grid_to_cartesian_batch(
+    gridcoords: NDArray[np.float64], dtype: Optional[DTypeLike] = None
+) -> NDArray[np.float64]:
+    """
+    The batched version of 'grid_to_cartesian()'; maps (N, 6) -> (N, 4, 3).
+
+    The intermediate perimetric and pair distance values are only ever held as columns,
+    and are never gathered into (N, 6) arrays. As in 'pairdistance_to_cartesian_batch()',
+    everything is calculated in float64, and only the points are rounded to 'dtype'.
+    """
+    gridcoords = _as_six_column_batch(gridcoords)
+    perimetric_columns = _grid_to_perimetric_values(*gridcoords.T)
+    pairdist_columns = _perimetric_to_pairdistance_values(*perimetric_columns)
+
+    return _cartesian_from_columns(pairdist_columns, resolve_dtype(dtype))
+
+
+@profiled
+def cartesian_to_grid_batch(
+    points: NDArray[np.float64], dtype: Optional[DTypeLike] = None
+) -> NDArray[np.float64]:
+    """
+    The batched version of 'cartesian_to_grid()'; maps (N, 4, 3) -> (N, 6). Everything is
+    calculated in float64, and only the grid coordinates are rounded to 'dtype'.
+    """
+    points = _as_cartesian_batch(points)
+    pairdist_columns = _pairdistance_columns_from_cartesian(points)
+    perimetric_columns = _pairdistance_to_perimetric_values(*pairdist_columns)
+
+    return _stack_columns(
+        _perimetric_to_grid_values(*perimetric_columns), resolve_dtype(dtype)
+    )
+
+
+# --- embedding degenerate geometries ---------------------------------------------
+
+
+class EmbeddingStatus(enum.IntEnum):
+    """
+    How the four points of a geometry were placed by
+    'pairdistance_to_cartesian_batch_with_status()'.
+     - OK             : the four points span 3D space
+     - PLANAR         : the four points lie in a plane (point3 has z == 0)
+     - COLLINEAR      : point0, point1 and point2 lie on a line (point2 has y == 0)
+     - NON_EMBEDDABLE : no four points in 3D space have these pair distances
+    """
+
+    OK = 0
+    PLANAR = 1
+    COLLINEAR = 2
+    NON_EMBEDDABLE = 3
+
+
+@profiled
+def pairdistance_to_cartesian_batch_with_status(
+    pairdists: NDArray[np.float64],
+    rtol: float = 1.0e-9,
+    dtype: Optional[DTypeLike] = None,
+) -> Tuple[NDArray[np.float64], NDArray[np.int8]]:
+    """
+    A version of 'pairdistance_to_cartesian_batch()' that accepts degenerate geometries,
+    and reports how each geometry was placed, as an EmbeddingStatus value per row.
+
+    The squares of y2 and z3 are found as differences of squared distances; for planar
+    and collinear geometries, round-off error can make them slightly negative. Squares
+    no more negative than 'rtol' times the square of the longest pair distance of the
+    geometry are treated as zero.
+
+    If point0, point1 and point2 are collinear, the usual construction of point3 divides
+    by zero; instead, point3 is placed in the xy-plane, and the remaining pair distance
+    (r23) is checked for consistency.
+
+    The points of non-embeddable geometries are set to NaN. Geometries where point0 and
+    point1 coincide are also reported as non-embeddable, as the construction needs them
+    to define the x-axis. No errors or warnings are raised for any row.
+
+    The points are placed in float64, and then rounded to 'dtype'.
+    """
+    pairdists = _as_six_column_batch(pairdists)
+    r01, r02, r03, r12, r13, r23 = pairdists.T
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        tolerance = rtol * np.max(pairdists, axis=1) ** 2
+        is_bad_input = ~np.all(np.isfinite(pairdists) & (pairdists >= 0.0), axis=1)
+        is_bad_input |= r01**2 <= tolerance
+
+        x2 = (r01**2 + r02**2 - r12**2) / (2.0 * r01)
+        y2_squared = r02**2 - x2**2
+        is_collinear = y2_squared <= tolerance
+        y2 = np.sqrt(np.maximum(y2_squared, 0.0))
+
+        x3 = (r03**2 - r13**2 + r01**2) / (2.0 * r01)
+
+        # the general case; point2 does not lie on the x-axis
+        y3 = (r03**2 - r23**2 + r02**2 - 2.0 * x2 * x3) / (2.0 * y2)
+        z3_squared = r03**2 - x3**2 - y3**2
+        is_planar = ~is_collinear & (z3_squared <= tolerance)
+        is_non_embeddable = ~is_collinear & (z3_squared < -tolerance)
+        z3 = np.where(is_planar, 0.0, np.sqrt(np.maximum(z3_squared, 0.0)))
+
+        # the collinear case; point3 is placed at its distance from the x-axis, in the
+        # xy-plane, and r23 is only known to within the error caused by setting y2 to 0
+        radial_squared = r03**2 - x3**2
+        r23_residual = r23**2 - (x3 - x2) ** 2 - np.maximum(radial_squared, 0.0)
+        r23_tolerance = 2.0 * np.sqrt(tolerance * np.maximum(radial_squared, 0.0))
+        is_non_embeddable |= is_collinear & (
+            (radial_squared < -tolerance)
+            | (np.abs(r23_residual) > r23_tolerance + tolerance)
+        )
+        y3 = np.where(is_collinear, np.sqrt(np.maximum(radial_squared, 0.0)), y3)
+        z3 = np.where(is_collinear, 0.0, z3)
+
+    is_non_embeddable |= (y2_squared < -tolerance) | is_bad_input
+
+    status = np.full(pairdists.shape[0], EmbeddingStatus.OK, dtype=np.int8)
+    status[is_planar] = EmbeddingStatus.PLANAR
+    status[is_collinear] = EmbeddingStatus.COLLINEAR
+    status[is_non_embeddable] = EmbeddingStatus.NON_EMBEDDABLE
+
+    points = np.zeros((pairdists.shape[0], 4, 3), dtype=resolve_dtype(dtype))
+    points[:, 1, 0] = r01
+    points[:, 2, 0] = x2
+    points[:, 2, 1] = y2
+    points[:, 3, 0] = x3
+    points[:, 3, 1] = y3
+    points[:, 3, 2] = z3
+    points[is_non_embeddable] = np.nan
+
+    return points, status
+
+
+# --- looking up batched conversions by name ---------------------------------------
+
+BatchConversion = Callable[[NDArray[np.float64]], NDArray[np.float64]]
+
+
+class _PrecisionBatchConversion(Protocol):
+    """A batched conversion that can return its result in a given precision."""
+
+    def __call__(
+        self, coords: NDArray[np.float64], /, dtype: Optional[DTypeLike] = None
+    ) -> NDArray[np.float64]: ...
+
+
+# The names of the four coordinate representations, ordered so that each one can be
+# converted directly into its neighbours
+COORDINATE_KINDS = ("grid", "perimetric", "pairdistance", "cartesian")
+
+_BATCH_CONVERSIONS: Dict[Tuple[str, str], _PrecisionBatchConversion] = {
+    ("grid", "perimetric"): grid_to_perimetric_batch,
+    ("perimetric", "grid"): perimetric_to_grid_batch,
+    ("perimetric", "pairdistance"): perimetric_to_pairdistance_batch,
+    ("pairdistance", "perimetric"): pairdistance_to_perimetric_batch,
+    ("pairdistance", "cartesian"): pairdistance_to_cartesian_batch,
+    ("cartesian", "pairdistance"): cartesian_to_pairdistance_batch,
+    ("grid", "cartesian"): grid_to_cartesian_batch,
+    ("cartesian", "grid"): cartesian_to_grid_batch,
+}
+
+
+def _compose(first: BatchConversion, second: BatchConversion) -> BatchConversion:
+    def composed(coords: NDArray[np.float64]) -> NDArray[np.float64]:
+        return second(first(coords))
+
+    return composed
+
+
+def _copy_batch(
+    coords: NDArray[np.float64], dtype: Optional[DTypeLike] = None
+) -> NDArray[np.float64]:
+    return np.array(coords, dtype=resolve_dtype(dtype))
+
+
+def row_shape(kind: str) -> Tuple[int, ...]:
+    """The shape of the values that make up a single coordinate of the given kind."""
+    check_coordinate_kind(kind)
+    return (4, 3) if kind == "cartesian" else (6,)
+
+
+def check_coordinate_kind(kind: str) -> None:
+    if kind not in COORDINATE_KINDS:
+        raise ValueError(
+            f"Unknown coordinate kind '{kind}'; expected one of {COORDINATE_KINDS}"
+        )
+
+
+def get_batch_conversion(
+    from_: str, to: str, dtype: Optional[DTypeLike] = None
+) -> BatchConversion:
+    """
+    Get the batched conversion that turns an array of coordinates of kind 'from_' into
+    an array of coordinates of kind 'to'. The kinds are named as in 'COORDINATE_KINDS'.
+
+    Fused conversions are used where they exist; otherwise the conversions between
+    neighbouring kinds are chained together. If 'dtype' is given, the result is an array
+    of that dtype (see 'frolov.precision').
+    """
+    check_coordinate_kind(from_)
+    check_coordinate_kind(to)
+
+    steps: List[_PrecisionBatchConversion]
+    if from_ == to:
+        steps = [_copy_batch]
+    elif (from_, to) in _BATCH_CONVERSIONS:
+        steps = [_BATCH_CONVERSIONS[(from_, to)]]
+    else:
+        i_from = COORDINATE_KINDS.index(from_)
+        i_to = COORDINATE_KINDS.index(to)
+        # a stop index of -1 would wrap around, so the reversed chains are sliced
+        # forwards and then reversed
+        kinds = COORDINATE_KINDS[min(i_from, i_to) : max(i_from, i_to) + 1]
+        if i_to < i_from:
+            kinds = kinds[::-1]
+        steps = [_BATCH_CONVERSIONS[pair] for pair in zip(kinds[:-1], kinds[1:])]
+
+    conversions: List[BatchConversion] = list(steps)
+    if dtype is not None:
+        # the intermediate steps keep full precision; only the result is rounded
+        conversions[-1] = functools.partial(steps[-1], dtype=resolve_dtype(dtype))
+
+    return functools.reduce(_compose, conversions)
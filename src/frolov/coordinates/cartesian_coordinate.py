@@ -9,24 +9,95 @@ chosen to maintain consistency with the other coordinate types (GridCoordinate,
 
 from __future__ import annotations
 
+import math
 from dataclasses import dataclass
 from typing import Tuple
 
+import numpy as np
+from numpy.typing import NDArray
+
 from cartesian import Cartesian3D
-from cartesian.measure import euclidean_distance
+
+from frolov.coordinates.coordinate_batch import CoordinateBatch
+from frolov.coordinates.coordinate_batch import slot_setters
+from frolov.validation import ValidationReport
+from frolov.validation import validate_cartesian_batch
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True, init=False)
 class CartesianCoordinate:
     point0: Cartesian3D
     point1: Cartesian3D
     point2: Cartesian3D
     point3: Cartesian3D
 
+    def __init__(
+        self,
+        point0: Cartesian3D,
+        point1: Cartesian3D,
+        point2: Cartesian3D,
+        point3: Cartesian3D,
+    ) -> None:
+        _set_point0(self, point0)
+        _set_point1(self, point1)
+        _set_point2(self, point2)
+        _set_point3(self, point3)
+
     def unpack(self) -> Tuple[Cartesian3D, ...]:
         return (self.point0, self.point1, self.point2, self.point3)
 
 
+def _point_components(point: Cartesian3D) -> Tuple[float, float, float]:
+    return (point[0], point[1], point[2])
+
+
+_set_point0, _set_point1, _set_point2, _set_point3 = slot_setters(CartesianCoordinate)
+
+
+class CartesianCoordinateBatch(CoordinateBatch[CartesianCoordinate]):
+    """
+    An array-backed collection of CartesianCoordinate instances, with shape (N, 4, 3).
+
+    The second axis indexes the four points, and the third axis indexes the (x, y, z)
+    components of each point.
+    """
+
+    _kind = "cartesian"
+    _fields = ("point0", "point1", "point2", "point3")
+    _row_shape = (4, 3)
+
+    @property
+    def point0(self) -> NDArray[np.float64]:
+        return self._data[:, 0, :]
+
+    @property
+    def point1(self) -> NDArray[np.float64]:
+        return self._data[:, 1, :]
+
+    @property
+    def point2(self) -> NDArray[np.float64]:
+        return self._data[:, 2, :]
+
+    @property
+    def point3(self) -> NDArray[np.float64]:
+        return self._data[:, 3, :]
+
+    @classmethod
+    def _row_to_coordinate(cls, row: NDArray[np.float64]) -> CartesianCoordinate:
+        points = [Cartesian3D(x, y, z) for (x, y, z) in row.tolist()]
+        return CartesianCoordinate(*points)
+
+    @classmethod
+    def _validate_array(cls, data: NDArray[np.float64]) -> ValidationReport:
+        return validate_cartesian_batch(data)
+
+    @classmethod
+    def _coordinate_to_row(
+        cls, coord: CartesianCoordinate
+    ) -> Tuple[Tuple[float, float, float], ...]:
+        return tuple(_point_components(point) for point in coord.unpack())
+
+
 def cartesian_distance_squared(
     c0: CartesianCoordinate, c1: CartesianCoordinate
 ) -> float:
@@ -34,8 +105,11 @@ def cartesian_distance_squared(
     Calculate the sum of the euclidean distance between each corresponding pair
     of points between the two CartesianCoordinate instances.
     """
-    return sum(
-        [euclidean_distance(q0, q1) for (q0, q1) in zip(c0.unpack(), c1.unpack())]
+    return (
+        math.dist(_point_components(c0.point0), _point_components(c1.point0))
+        + math.dist(_point_components(c0.point1), _point_components(c1.point1))
+        + math.dist(_point_components(c0.point2), _point_components(c1.point2))
+        + math.dist(_point_components(c0.point3), _point_components(c1.point3))
     )
 
 
@@ -44,5 +118,9 @@ def cartesian_approx_eq(
 ) -> bool:
     """
     Checks if two coordinate instances are close enough to be essentially equal.
+
+    Unlike the other '*_approx_eq()' functions, 'eps_sq' is compared against a sum of
+    distances rather than of squared differences; the rounding error of points taken
+    from a float32 batch adds about 4e-7 per unit of length to that sum.
     """
     return cartesian_distance_squared(c0, c1) < eps_sq
@@ -0,0 +1,209 @@
+"""
+A CoordinateBatch instance holds many coordinates of the same kind in a single
+contiguous float array, with one geometry per row.
+
+Storing a large collection of geometries as a list of frozen dataclass instances costs
+hundreds of bytes per geometry, and scatters the values across the heap. The batch
+containers store only the raw values (48 bytes per geometry in double precision), and
+expose each named field of the corresponding scalar coordinate as a zero-copy view into
+the underlying array.
+
+The scalar coordinate instances are only created on demand, when the batch is indexed
+with an integer, or iterated over.
+
+Whether a batch checks the constraints of its coordinates when it is constructed depends
+on the validation mode (see 'frolov.validation'). The check is performed once, over the
+whole array, instead of once per coordinate.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+from typing import Any
+from typing import Callable
+from typing import ClassVar
+from typing import Generic
+from typing import Iterable
+from typing import Iterator
+from typing import Optional
+from typing import Sequence
+from typing import Tuple
+from typing import Type
+from typing import TypeVar
+from typing import overload
+
+import numpy as np
+from numpy.typing import ArrayLike
+from numpy.typing import DTypeLike
+from numpy.typing import NDArray
+
+from frolov.precision import resolve_dtype
+from frolov.validation import ValidationMode
+from frolov.validation import ValidationReport
+from frolov.validation import get_validation_mode
+
+CoordinateT = TypeVar("CoordinateT")
+BatchT = TypeVar("BatchT", bound="CoordinateBatch[Any]")
+
+
+def column_view(index: int, name: str) -> property:
+    """Create a read-only property that returns a zero-copy view of a single field."""
+
+    def getter(self: CoordinateBatch[Any]) -> NDArray[np.float64]:
+        return self._data[:, index]
+
+    return property(getter, doc=f"A view of the '{name}' field of every coordinate.")
+
+
+def slot_setters(cls: type) -> Tuple[Callable[[Any, Any], None], ...]:
+    """
+    The functions that set each field of a frozen, slotted dataclass, in field order.
+
+    The '__init__()' generated for a frozen dataclass sets each field with a call to
+    'object.__setattr__()'. Calling the '__set__()' method of each slot directly skips
+    the generic attribute lookup, and makes creating a scalar coordinate about twice as
+    fast.
+    """
+    return tuple(getattr(cls, field.name).__set__ for field in dataclasses.fields(cls))
+
+
+class CoordinateBatch(Generic[CoordinateT]):
+    """
+    The base class for the columnar containers of each coordinate type.
+
+    Subclasses must set '_kind' (the name of the coordinate type), '_fields' (the names
+    of the fields, in storage order), and '_row_shape' (the shape of the values that make
+    up a single coordinate). They must also implement the conversions between a single
+    row and a scalar coordinate instance, and the check of the constraints of each row.
+
+    The values are stored as float64 unless another 'dtype' is given (see
+    'frolov.precision').
+    """
+
+    _kind: ClassVar[str]
+    _fields: ClassVar[Tuple[str, ...]]
+    _row_shape: ClassVar[Tuple[int, ...]]
+
+    def __init__(self, data: ArrayLike, dtype: Optional[DTypeLike] = None) -> None:
+        data = np.ascontiguousarray(data, dtype=resolve_dtype(dtype))
+        self._check_shape(data)
+        self._data = data
+        self._report: Optional[ValidationReport] = None
+
+        mode = get_validation_mode()
+        if mode is not ValidationMode.OFF:
+            self._report = self._validate_array(data)
+            if mode is ValidationMode.EAGER:
+                self._report.raise_if_invalid(self._kind)
+
+    @classmethod
+    def _wrap(cls: Type[BatchT], data: NDArray[np.float64]) -> BatchT:
+        """Create a batch around an existing array, without copying or checking it."""
+        batch = cls.__new__(cls)
+        batch._data = data
+        batch._report = None
+        return batch
+
+    @classmethod
+    def _check_shape(cls, data: NDArray[np.float64]) -> None:
+        if data.ndim != 1 + len(cls._row_shape) or data.shape[1:] != cls._row_shape:
+            expected_shape = ("N",) + cls._row_shape
+            raise ValueError(
+                f"{cls.__name__} requires an array of shape {expected_shape}, found {data.shape}"
+            )
+
+    @classmethod
+    def _row_to_coordinate(cls, row: NDArray[np.float64]) -> CoordinateT:
+        raise NotImplementedError
+
+    @classmethod
+    def _coordinate_to_row(cls, coord: CoordinateT) -> Sequence[Any]:
+        raise NotImplementedError
+
+    @classmethod
+    def _validate_array(cls, data: NDArray[np.float64]) -> ValidationReport:
+        raise NotImplementedError
+
+    @classmethod
+    def from_coordinates(cls: Type[BatchT], coords: Iterable[Any]) -> BatchT:
+        """Create a batch from an iterable of scalar coordinate instances."""
+        rows = [cls._coordinate_to_row(coord) for coord in coords]
+        data = np.array(rows, dtype=np.float64).reshape((len(rows),) + cls._row_shape)
+
+        return cls(data)
+
+    @classmethod
+    def concatenate(cls: Type[BatchT], batches: Iterable[BatchT]) -> BatchT:
+        """Join several batches of the same type into a single new batch."""
+        arrays = [batch.data for batch in batches]
+        if len(arrays) == 0:
+            return cls(np.empty((0,) + cls._row_shape, dtype=np.float64))
+
+        return cls(np.concatenate(arrays, axis=0), dtype=np.result_type(*arrays))
+
+    @property
+    def data(self) -> NDArray[np.float64]:
+        """The underlying array; the first axis indexes the coordinates."""
+        return self._data
+
+    @property
+    def dtype(self) -> np.dtype[Any]:
+        return self._data.dtype
+
+    def astype(self: BatchT, dtype: DTypeLike) -> BatchT:
+        """
+        A batch holding the same coordinates with values of the given dtype; the values
+        are not checked again.
+        """
+        return self._wrap(self._data.astype(resolve_dtype(dtype)))
+
+    @property
+    def kind(self) -> str:
+        return self._kind
+
+    @property
+    def fields(self) -> Tuple[str, ...]:
+        return self._fields
+
+    @property
+    def validation_report(self) -> Optional[ValidationReport]:
+        """
+        The result of the check performed when the batch was constructed, or None if no
+        check was performed.
+        """
+        return self._report
+
+    def validate(self) -> ValidationReport:
+        """Check every coordinate in the batch against its constraints."""
+        return self._validate_array(self._data)
+
+    def valid_rows(self: BatchT) -> BatchT:
+        """Create a new batch holding only the coordinates that satisfy their constraints."""
+        return self[self.validate().mask]
+
+    def __len__(self) -> int:
+        return int(self._data.shape[0])
+
+    @overload
+    def __getitem__(self, index: int) -> CoordinateT: ...
+
+    @overload
+    def __getitem__(self: BatchT, index: slice | NDArray[Any]) -> BatchT: ...
+
+    def __getitem__(self, index: Any) -> Any:
+        """
+        Indexing with an integer creates the corresponding scalar coordinate instance.
+        Slicing returns a batch that shares memory with this one, and indexing with an
+        integer or boolean array returns a batch holding a copy of the selected rows.
+        """
+        if isinstance(index, (int, np.integer)):
+            return self._row_to_coordinate(self._data[index])
+
+        return self._wrap(self._data[index])
+
+    def __iter__(self) -> Iterator[CoordinateT]:
+        for row in self._data:
+            yield self._row_to_coordinate(row)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(n_coords={len(self)})"
@@ -17,11 +17,24 @@ original way of arranging the limits would cause 'grid_s3' to be undefined
 in the case where u2 == u3.
 """
 
+from __future__ import annotations
+
 from dataclasses import dataclass
 from typing import Tuple
 
+import numpy as np
+from numpy.typing import NDArray
+
+from frolov.coordinates.coordinate_batch import CoordinateBatch
+from frolov.coordinates.coordinate_batch import slot_setters
+from frolov.coordinates.coordinate_batch import column_view
+from frolov.validation import InvalidCoordinateError
+from frolov.validation import ValidationReport
+from frolov.validation import checks_each_coordinate
+from frolov.validation import validate_grid_batch
 
-@dataclass(frozen=True)
+
+@dataclass(frozen=True, slots=True, init=False)
 class GridCoordinate:
     grid_u1: float
     grid_u2: float
@@ -30,8 +43,26 @@ class GridCoordinate:
     grid_s3: float
     grid_w3: float
 
-    def __post_init__(self) -> None:
-        assert self._satisfies_grid_constraints()
+    def __init__(
+        self,
+        grid_u1: float,
+        grid_u2: float,
+        grid_u3: float,
+        grid_t3: float,
+        grid_s3: float,
+        grid_w3: float,
+    ) -> None:
+        _set_grid_u1(self, grid_u1)
+        _set_grid_u2(self, grid_u2)
+        _set_grid_u3(self, grid_u3)
+        _set_grid_t3(self, grid_t3)
+        _set_grid_s3(self, grid_s3)
+        _set_grid_w3(self, grid_w3)
+
+        if checks_each_coordinate() and not self._satisfies_grid_constraints():
+            raise InvalidCoordinateError(
+                f"{self} does not satisfy the grid constraints"
+            )
 
     def unpack(self) -> Tuple[float, ...]:
         return (
@@ -44,18 +75,48 @@ class GridCoordinate:
         )
 
     def _satisfies_grid_constraints(self) -> bool:
-        return all(
-            [
-                self.grid_u1 >= 0,
-                self.grid_u2 >= 0,
-                self.grid_u3 >= 1,
-                self.grid_t3 >= 1,
-                self.grid_s3 >= 1,
-                1 >= self.grid_w3 >= 0,
-            ]
+        return (
+            self.grid_u1 >= 0
+            and self.grid_u2 >= 0
+            and self.grid_u3 >= 1
+            and self.grid_t3 >= 1
+            and self.grid_s3 >= 1
+            and 1 >= self.grid_w3 >= 0
         )
 
 
+_set_grid_u1, _set_grid_u2, _set_grid_u3, _set_grid_t3, _set_grid_s3, _set_grid_w3 = (
+    slot_setters(GridCoordinate)
+)
+
+
+class GridCoordinateBatch(CoordinateBatch[GridCoordinate]):
+    """An array-backed collection of GridCoordinate instances, with shape (N, 6)."""
+
+    _kind = "grid"
+    _fields = ("grid_u1", "grid_u2", "grid_u3", "grid_t3", "grid_s3", "grid_w3")
+    _row_shape = (6,)
+
+    grid_u1 = column_view(0, "grid_u1")
+    grid_u2 = column_view(1, "grid_u2")
+    grid_u3 = column_view(2, "grid_u3")
+    grid_t3 = column_view(3, "grid_t3")
+    grid_s3 = column_view(4, "grid_s3")
+    grid_w3 = column_view(5, "grid_w3")
+
+    @classmethod
+    def _row_to_coordinate(cls, row: NDArray[np.float64]) -> GridCoordinate:
+        return GridCoordinate(*row.tolist())
+
+    @classmethod
+    def _validate_array(cls, data: NDArray[np.float64]) -> ValidationReport:
+        return validate_grid_batch(data)
+
+    @classmethod
+    def _coordinate_to_row(cls, coord: GridCoordinate) -> Tuple[float, ...]:
+        return coord.unpack()
+
+
 def grid_distance_squared(c0: GridCoordinate, c1: GridCoordinate) -> float:
     """
     Calculating the sum of the squared differences between each coordinate.
@@ -63,7 +124,14 @@ def grid_distance_squared(c0: GridCoordinate, c1: GridCoordinate) -> float:
     It is important to note that this function makes the (possibly) unsubstantiated
     assumption that all 6 grid coordinate elements should all be weighted equally.
     """
-    return sum([(q0 - q1) ** 2 for (q0, q1) in zip(c0.unpack(), c1.unpack())])
+    return (
+        (c0.grid_u1 - c1.grid_u1) ** 2
+        + (c0.grid_u2 - c1.grid_u2) ** 2
+        + (c0.grid_u3 - c1.grid_u3) ** 2
+        + (c0.grid_t3 - c1.grid_t3) ** 2
+        + (c0.grid_s3 - c1.grid_s3) ** 2
+        + (c0.grid_w3 - c1.grid_w3) ** 2
+    )
 
 
 def grid_approx_eq(
@@ -71,5 +139,8 @@ def grid_approx_eq(
 ) -> bool:
     """
     Checks if two coordinate instances are close enough to be essentially equal.
+
+    The default 'eps_sq' allows for the rounding error of float64 values, and of float32
+    values up to about 200; see 'frolov.precision.approx_eq_eps_sq()' for larger ones.
     """
     return grid_distance_squared(c0, c1) < eps_sq
@@ -8,8 +8,19 @@ from __future__ import annotations
 from dataclasses import dataclass
 from typing import Tuple
 
+import numpy as np
+from numpy.typing import NDArray
 
-@dataclass(frozen=True)
+from frolov.coordinates.coordinate_batch import CoordinateBatch
+from frolov.coordinates.coordinate_batch import slot_setters
+from frolov.coordinates.coordinate_batch import column_view
+from frolov.validation import InvalidCoordinateError
+from frolov.validation import ValidationReport
+from frolov.validation import checks_each_coordinate
+from frolov.validation import validate_pairdistance_batch
+
+
+@dataclass(frozen=True, slots=True, init=False)
 class PairDistanceCoordinate:
     r01: float
     r02: float
@@ -18,15 +29,64 @@ class PairDistanceCoordinate:
     r13: float
     r23: float
 
-    def __post_init__(self) -> None:
-        assert self._are_all_nonnegative()
+    def __init__(
+        self, r01: float, r02: float, r03: float, r12: float, r13: float, r23: float
+    ) -> None:
+        _set_r01(self, r01)
+        _set_r02(self, r02)
+        _set_r03(self, r03)
+        _set_r12(self, r12)
+        _set_r13(self, r13)
+        _set_r23(self, r23)
+
+        if checks_each_coordinate() and not self._are_all_nonnegative():
+            raise InvalidCoordinateError(f"{self} has negative pair distances")
 
     def unpack(self) -> Tuple[float, ...]:
         return (self.r01, self.r02, self.r03, self.r12, self.r13, self.r23)
 
     def _are_all_nonnegative(self) -> bool:
         """It does not make physical sense for a pair distance to be negative"""
-        return all([pairdist >= 0.0 for pairdist in self.unpack()])
+        return (
+            self.r01 >= 0.0
+            and self.r02 >= 0.0
+            and self.r03 >= 0.0
+            and self.r12 >= 0.0
+            and self.r13 >= 0.0
+            and self.r23 >= 0.0
+        )
+
+
+_set_r01, _set_r02, _set_r03, _set_r12, _set_r13, _set_r23 = slot_setters(
+    PairDistanceCoordinate
+)
+
+
+class PairDistanceCoordinateBatch(CoordinateBatch[PairDistanceCoordinate]):
+    """An array-backed collection of PairDistanceCoordinate instances, with shape (N, 6)."""
+
+    _kind = "pairdistance"
+    _fields = ("r01", "r02", "r03", "r12", "r13", "r23")
+    _row_shape = (6,)
+
+    r01 = column_view(0, "r01")
+    r02 = column_view(1, "r02")
+    r03 = column_view(2, "r03")
+    r12 = column_view(3, "r12")
+    r13 = column_view(4, "r13")
+    r23 = column_view(5, "r23")
+
+    @classmethod
+    def _row_to_coordinate(cls, row: NDArray[np.float64]) -> PairDistanceCoordinate:
+        return PairDistanceCoordinate(*row.tolist())
+
+    @classmethod
+    def _validate_array(cls, data: NDArray[np.float64]) -> ValidationReport:
+        return validate_pairdistance_batch(data)
+
+    @classmethod
+    def _coordinate_to_row(cls, coord: PairDistanceCoordinate) -> Tuple[float, ...]:
+        return coord.unpack()
 
 
 def pairdistance_distance_squared(
@@ -35,7 +95,14 @@ def pairdistance_distance_squared(
     """
     Calculating the sum of the squared differences between each coordinate.
     """
-    return sum([(q0 - q1) ** 2 for (q0, q1) in zip(c0.unpack(), c1.unpack())])
+    return (
+        (c0.r01 - c1.r01) ** 2
+        + (c0.r02 - c1.r02) ** 2
+        + (c0.r03 - c1.r03) ** 2
+        + (c0.r12 - c1.r12) ** 2
+        + (c0.r13 - c1.r13) ** 2
+        + (c0.r23 - c1.r23) ** 2
+    )
 
 
 def pairdistance_approx_eq(
@@ -43,5 +110,8 @@ def pairdistance_approx_eq(
 ) -> bool:
     """
     Checks if two coordinate instances are close enough to be essentially equal.
+
+    The default 'eps_sq' allows for the rounding error of float64 values, and of float32
+    values up to about 200; see 'frolov.precision.approx_eq_eps_sq()' for larger ones.
     """
     return pairdistance_distance_squared(c0, c1) < eps_sq
@@ -3,8 +3,19 @@ from __future__ import annotations
 from dataclasses import dataclass
 from typing import Tuple
 
+import numpy as np
+from numpy.typing import NDArray
 
-@dataclass(frozen=True)
+from frolov.coordinates.coordinate_batch import CoordinateBatch
+from frolov.coordinates.coordinate_batch import slot_setters
+from frolov.coordinates.coordinate_batch import column_view
+from frolov.validation import InvalidCoordinateError
+from frolov.validation import ValidationReport
+from frolov.validation import checks_each_coordinate
+from frolov.validation import validate_perimetric_batch
+
+
+@dataclass(frozen=True, slots=True, init=False)
 class PerimetricCoordinate:
     u1: float
     u2: float
@@ -13,31 +24,87 @@ class PerimetricCoordinate:
     s3: float
     w3: float
 
-    def __post_init__(self) -> None:
-        assert self._satisfies_s3_inequality()
-        assert self._satisfies_w3_inequality()
-        assert self._are_all_nonnegative()
+    def __init__(
+        self, u1: float, u2: float, u3: float, t3: float, s3: float, w3: float
+    ) -> None:
+        _set_u1(self, u1)
+        _set_u2(self, u2)
+        _set_u3(self, u3)
+        _set_t3(self, t3)
+        _set_s3(self, s3)
+        _set_w3(self, w3)
+
+        if not checks_each_coordinate():
+            return
+
+        if not self._satisfies_s3_inequality():
+            raise InvalidCoordinateError(f"{self} does not satisfy the 's3' inequality")
+        if not self._satisfies_w3_inequality():
+            raise InvalidCoordinateError(f"{self} does not satisfy the 'w3' inequality")
+        if not self._are_all_nonnegative():
+            raise InvalidCoordinateError(f"{self} has negative values")
 
     def unpack(self) -> Tuple[float, ...]:
         return (self.u1, self.u2, self.u3, self.t3, self.s3, self.w3)
 
     def _satisfies_s3_inequality(self) -> bool:
         """Check if 's3' satisfies the inequality in equation (32) of the paper."""
-        lower_limit = max(0.0, self.u3 - self.t3)
-        upper_limit = self.u2 + self.u3
-
-        return lower_limit <= self.s3 <= upper_limit
+        # max(0, u3 - t3) <= s3 <= u2 + u3
+        s3 = self.s3
+        return 0.0 <= s3 and self.u3 - self.t3 <= s3 <= self.u2 + self.u3
 
     def _satisfies_w3_inequality(self) -> bool:
         """Check if 'w3' satisfies the inequality in equation (32) of the paper."""
-        lower_limit = max(0.0, self.u3 - self.t3, self.s3 - self.u2)
-        upper_limit = min(self.u1 + self.u3, self.u1 + self.s3)
-
-        return lower_limit <= self.w3 <= upper_limit
+        # max(0, u3 - t3, s3 - u2) <= w3 <= min(u1 + u3, u1 + s3)
+        w3 = self.w3
+        return (
+            0.0 <= w3
+            and self.u3 - self.t3 <= w3 <= self.u1 + self.u3
+            and self.s3 - self.u2 <= w3 <= self.u1 + self.s3
+        )
 
     def _are_all_nonnegative(self) -> bool:
         """None of the coordinates, as constructed in the paper, can be negative."""
-        return all([peri >= 0.0 for peri in self.unpack()])
+        return (
+            self.u1 >= 0.0
+            and self.u2 >= 0.0
+            and self.u3 >= 0.0
+            and self.t3 >= 0.0
+            and self.s3 >= 0.0
+            and self.w3 >= 0.0
+        )
+
+
+_set_u1, _set_u2, _set_u3, _set_t3, _set_s3, _set_w3 = slot_setters(
+    PerimetricCoordinate
+)
+
+
+class PerimetricCoordinateBatch(CoordinateBatch[PerimetricCoordinate]):
+    """An array-backed collection of PerimetricCoordinate instances, with shape (N, 6)."""
+
+    _kind = "perimetric"
+    _fields = ("u1", "u2", "u3", "t3", "s3", "w3")
+    _row_shape = (6,)
+
+    u1 = column_view(0, "u1")
+    u2 = column_view(1, "u2")
+    u3 = column_view(2, "u3")
+    t3 = column_view(3, "t3")
+    s3 = column_view(4, "s3")
+    w3 = column_view(5, "w3")
+
+    @classmethod
+    def _row_to_coordinate(cls, row: NDArray[np.float64]) -> PerimetricCoordinate:
+        return PerimetricCoordinate(*row.tolist())
+
+    @classmethod
+    def _validate_array(cls, data: NDArray[np.float64]) -> ValidationReport:
+        return validate_perimetric_batch(data)
+
+    @classmethod
+    def _coordinate_to_row(cls, coord: PerimetricCoordinate) -> Tuple[float, ...]:
+        return coord.unpack()
 
 
 def perimetric_distance_squared(
@@ -49,7 +116,14 @@ def perimetric_distance_squared(
     It is important to note that this function makes the (possibly) unsubstantiated
     assumption that all 6 coordinate elements should all be weighted equally.
     """
-    return sum([(q0 - q1) ** 2 for (q0, q1) in zip(c0.unpack(), c1.unpack())])
+    return (
+        (c0.u1 - c1.u1) ** 2
+        + (c0.u2 - c1.u2) ** 2
+        + (c0.u3 - c1.u3) ** 2
+        + (c0.t3 - c1.t3) ** 2
+        + (c0.s3 - c1.s3) ** 2
+        + (c0.w3 - c1.w3) ** 2
+    )
 
 
 def perimetric_approx_eq(
@@ -57,5 +131,8 @@ def perimetric_approx_eq(
 ) -> bool:
     """
     Checks if two coordinate instances are close enough to be essentially equal.
+
+    The default 'eps_sq' allows for the rounding error of float64 values, and of float32
+    values up to about 200; see 'frolov.precision.approx_eq_eps_sq()' for larger ones.
     """
     return perimetric_distance_squared(c0, c1) < eps_sq
@@ -0,0 +1,372 @@
+"""
+This module contains the Jacobians of the conversions in 'frolov.conversions'.
+
+The Jacobian of a conversion from coordinates 'x' to coordinates 'y' is the matrix
+J[i, j] = dy[i] / dx[j]. The rows and columns follow the same order as the columns of the
+batched conversions:
+ - grid         : (grid_u1, grid_u2, grid_u3, grid_t3, grid_s3, grid_w3)
+ - perimetric   : (u1, u2, u3, t3, s3, w3)
+ - pair distance: (r01, r02, r03, r12, r13, r23)
+ - cartesian    : (x0, y0, z0, x1, y1, z1, x2, y2, z2, x3, y3, z3)
+
+The batched functions take the same (N, 6) or (N, 4, 3) arrays as the batched conversions,
+and return an array of N Jacobians, of shape (N, 6, 6), (N, 12, 6) or (N, 6, 12). The scalar
+functions take a single coordinate instance, and return a single Jacobian.
+
+The Jacobians of the conversions between pair distance and perimetric coordinates are
+constant, since equations (24) and (25) in the paper are linear. The Jacobian of
+'pairdistance_to_cartesian()' is undefined when point2 lies on the x-axis, or when point3
+lies in the xy-plane (the derivatives of the square roots diverge); these rows are
+filled with infinities or NaNs.
+"""
+
+from __future__ import annotations
+
+import functools
+from typing import Callable
+from typing import Tuple
+
+import numpy as np
+from numpy.typing import NDArray
+
+from frolov.conversions import COORDINATE_KINDS
+from frolov.conversions import _as_cartesian_batch
+from frolov.conversions import _as_six_column_batch
+from frolov.conversions import _pairdistance_to_cartesian_values
+from frolov.conversions import _pairdistance_to_perimetric_values
+from frolov.conversions import _perimetric_to_pairdistance_values
+from frolov.conversions import _stack_columns
+from frolov.conversions import check_coordinate_kind
+from frolov.conversions import get_batch_conversion
+from frolov.coordinates.cartesian_coordinate import CartesianCoordinate
+from frolov.coordinates.grid_coordinate import GridCoordinate
+from frolov.coordinates.pairdistance_coordinate import PairDistanceCoordinate
+from frolov.coordinates.perimetric_coordinate import PerimetricCoordinate
+
+BatchJacobian = Callable[[NDArray[np.float64]], NDArray[np.float64]]
+
+_PAIRS = ((0, 1), (0, 2), (0, 3), (1, 2), (1, 3), (2, 3))
+
+
+def _linear_map_matrix(
+    values_function: Callable[..., Tuple[NDArray[np.float64], ...]],
+) -> NDArray[np.float64]:
+    """
+    The matrix of a linear conversion; column 'j' is the image of the j-th unit vector.
+
+    The unit vectors are passed in as the six columns of a batch of six coordinates.
+    """
+    return _stack_columns(values_function(*np.eye(6))).T  # type: ignore[arg-type]
+
+
+_PAIRDISTANCE_TO_PERIMETRIC_MATRIX = _linear_map_matrix(
+    _pairdistance_to_perimetric_values
+)
+_PERIMETRIC_TO_PAIRDISTANCE_MATRIX = _linear_map_matrix(
+    _perimetric_to_pairdistance_values
+)
+
+
+def _broadcast_matrix(
+    matrix: NDArray[np.float64], n_coords: int
+) -> NDArray[np.float64]:
+    return np.broadcast_to(matrix, (n_coords,) + matrix.shape).copy()
+
+
+def pairdistance_to_perimetric_jacobian_batch(
+    pairdists: NDArray[np.float64],
+) -> NDArray[np.float64]:
+    """The Jacobians of 'pairdistance_to_perimetric_batch()'; see equation (24)."""
+    pairdists = _as_six_column_batch(pairdists)
+    return _broadcast_matrix(_PAIRDISTANCE_TO_PERIMETRIC_MATRIX, pairdists.shape[0])
+
+
+def perimetric_to_pairdistance_jacobian_batch(
+    perimetrics: NDArray[np.float64],
+) -> NDArray[np.float64]:
+    """The Jacobians of 'perimetric_to_pairdistance_batch()'; see equation (25)."""
+    perimetrics = _as_six_column_batch(perimetrics)
+    return _broadcast_matrix(_PERIMETRIC_TO_PAIRDISTANCE_MATRIX, perimetrics.shape[0])
+
+
+def grid_to_perimetric_jacobian_batch(
+    gridcoords: NDArray[np.float64],
+) -> NDArray[np.float64]:
+    """The Jacobians of 'grid_to_perimetric_batch()'."""
+    gridcoords = _as_six_column_batch(gridcoords)
+    grid_u1, grid_u2, grid_u3, grid_t3, grid_s3, grid_w3 = gridcoords.T
+
+    s3 = grid_s3 * grid_u2
+    u3 = grid_u3 * s3
+
+    jacobians = np.zeros((gridcoords.shape[0], 6, 6), dtype=np.float64)
+
+    # u1 = grid_u1
+    jacobians[:, 0, 0] = 1.0
+
+    # u2 = grid_u2
+    jacobians[:, 1, 1] = 1.0
+
+    # u3 = grid_u3 * grid_s3 * grid_u2
+    jacobians[:, 2, 1] = grid_u3 * grid_s3
+    jacobians[:, 2, 2] = s3
+    jacobians[:, 2, 4] = grid_u3 * grid_u2
+
+    # t3 = grid_t3 * grid_u3 * grid_s3 * grid_u2
+    jacobians[:, 3, 1] = grid_t3 * grid_u3 * grid_s3
+    jacobians[:, 3, 2] = grid_t3 * s3
+    jacobians[:, 3, 3] = u3
+    jacobians[:, 3, 4] = grid_t3 * grid_u3 * grid_u2
+
+    # s3 = grid_s3 * grid_u2
+    jacobians[:, 4, 1] = grid_s3
+    jacobians[:, 4, 4] = grid_u2
+
+    # w3 = grid_w3 * (grid_u1 + grid_u2) + grid_s3 * grid_u2 - grid_u2
+    jacobians[:, 5, 0] = grid_w3
+    jacobians[:, 5, 1] = grid_w3 + grid_s3 - 1.0
+    jacobians[:, 5, 4] = grid_u2
+    jacobians[:, 5, 5] = grid_u1 + grid_u2
+
+    return jacobians
+
+
+def perimetric_to_grid_jacobian_batch(
+    perimetrics: NDArray[np.float64],
+) -> NDArray[np.float64]:
+    """The Jacobians of 'perimetric_to_grid_batch()'."""
+    perimetrics = _as_six_column_batch(perimetrics)
+    u1, u2, u3, t3, s3, w3 = perimetrics.T
+
+    denominator = u1 + u2
+    grid_w3 = (w3 - s3 + u2) / denominator
+
+    jacobians = np.zeros((perimetrics.shape[0], 6, 6), dtype=np.float64)
+
+    # grid_u1 = u1
+    jacobians[:, 0, 0] = 1.0
+
+    # grid_u2 = u2
+    jacobians[:, 1, 1] = 1.0
+
+    # grid_u3 = u3 / s3
+    jacobians[:, 2, 2] = 1.0 / s3
+    jacobians[:, 2, 4] = -u3 / s3**2
+
+    # grid_t3 = t3 / u3
+    jacobians[:, 3, 2] = -t3 / u3**2
+    jacobians[:, 3, 3] = 1.0 / u3
+
+    # grid_s3 = s3 / u2
+    jacobians[:, 4, 1] = -s3 / u2**2
+    jacobians[:, 4, 4] = 1.0 / u2
+
+    # grid_w3 = (w3 - s3 + u2) / (u1 + u2)
+    jacobians[:, 5, 0] = -grid_w3 / denominator
+    jacobians[:, 5, 1] = (1.0 - grid_w3) / denominator
+    jacobians[:, 5, 4] = -1.0 / denominator
+    jacobians[:, 5, 5] = 1.0 / denominator
+
+    return jacobians
+
+
+def pairdistance_to_cartesian_jacobian_batch(
+    pairdists: NDArray[np.float64],
+) -> NDArray[np.float64]:
+    """
+    The Jacobians of 'pairdistance_to_cartesian_batch()', of shape (N, 12, 6).
+
+    The derivatives are found by differentiating the construction of the points one
+    component at a time; each '*_grad' array holds the gradient of a component with
+    respect to the six pair distances, with shape (N, 6).
+    """
+    pairdists = _as_six_column_batch(pairdists)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        r01, r02, r03, r12, r13, r23 = (
+            pairdists[:, i_column, np.newaxis] for i_column in range(6)
+        )
+        x2, y2, x3, y3, z3 = _pairdistance_to_cartesian_values(
+            r01, r02, r03, r12, r13, r23, np.sqrt
+        )
+        unit = np.eye(6)
+
+        # x2 * r01 = (r01^2 + r02^2 - r12^2) / 2
+        x2_grad = (r01 * unit[0] + r02 * unit[1] - r12 * unit[3] - x2 * unit[0]) / r01
+
+        # y2^2 = r02^2 - x2^2
+        y2_grad = (r02 * unit[1] - x2 * x2_grad) / y2
+
+        # x3 * r01 = (r03^2 - r13^2 + r01^2) / 2
+        x3_grad = (r03 * unit[2] - r13 * unit[4] + r01 * unit[0] - x3 * unit[0]) / r01
+
+        # y3 * y2 = (r03^2 - r23^2 + r02^2) / 2 - x2 * x3
+        y3_grad = (
+            r03 * unit[2]
+            - r23 * unit[5]
+            + r02 * unit[1]
+            - x3 * x2_grad
+            - x2 * x3_grad
+            - y3 * y2_grad
+        ) / y2
+
+        # z3^2 = r03^2 - x3^2 - y3^2
+        z3_grad = (r03 * unit[2] - x3 * x3_grad - y3 * y3_grad) / z3
+
+    jacobians = np.zeros((pairdists.shape[0], 12, 6), dtype=np.float64)
+    jacobians[:, 3, 0] = 1.0
+    jacobians[:, 6] = x2_grad
+    jacobians[:, 7] = y2_grad
+    jacobians[:, 9] = x3_grad
+    jacobians[:, 10] = y3_grad
+    jacobians[:, 11] = z3_grad
+
+    return jacobians
+
+
+def cartesian_to_pairdistance_jacobian_batch(
+    points: NDArray[np.float64],
+) -> NDArray[np.float64]:
+    """The Jacobians of 'cartesian_to_pairdistance_batch()', of shape (N, 6, 12)."""
+    points = _as_cartesian_batch(points)
+
+    jacobians = np.zeros((points.shape[0], 6, 12), dtype=np.float64)
+    for i_pair, (i0, i1) in enumerate(_PAIRS):
+        separation = points[:, i0, :] - points[:, i1, :]
+        distance = np.sqrt(np.einsum("ij,ij->i", separation, separation))
+        direction = separation / distance[:, np.newaxis]
+
+        jacobians[:, i_pair, 3 * i0 : 3 * i0 + 3] = direction
+        jacobians[:, i_pair, 3 * i1 : 3 * i1 + 3] = -direction
+
+    return jacobians
+
+
+# --- scalar Jacobians ---------------------------------------------------------------
+
+
+def _six_value_row(coord: object) -> NDArray[np.float64]:
+    return np.array([coord.unpack()], dtype=np.float64)  # type: ignore[attr-defined]
+
+
+def pairdistance_to_perimetric_jacobian(
+    pairdists: PairDistanceCoordinate,
+) -> NDArray[np.float64]:
+    jacobian: NDArray[np.float64] = pairdistance_to_perimetric_jacobian_batch(
+        _six_value_row(pairdists)
+    )[0]
+    return jacobian
+
+
+def perimetric_to_pairdistance_jacobian(
+    perimetric: PerimetricCoordinate,
+) -> NDArray[np.float64]:
+    jacobian: NDArray[np.float64] = perimetric_to_pairdistance_jacobian_batch(
+        _six_value_row(perimetric)
+    )[0]
+    return jacobian
+
+
+def grid_to_perimetric_jacobian(gridcoord: GridCoordinate) -> NDArray[np.float64]:
+    jacobian: NDArray[np.float64] = grid_to_perimetric_jacobian_batch(
+        _six_value_row(gridcoord)
+    )[0]
+    return jacobian
+
+
+def perimetric_to_grid_jacobian(
+    perimetric: PerimetricCoordinate,
+) -> NDArray[np.float64]:
+    jacobian: NDArray[np.float64] = perimetric_to_grid_jacobian_batch(
+        _six_value_row(perimetric)
+    )[0]
+    return jacobian
+
+
+def pairdistance_to_cartesian_jacobian(
+    pairdists: PairDistanceCoordinate,
+) -> NDArray[np.float64]:
+    jacobian: NDArray[np.float64] = pairdistance_to_cartesian_jacobian_batch(
+        _six_value_row(pairdists)
+    )[0]
+    return jacobian
+
+
+def cartesian_to_pairdistance_jacobian(
+    points: CartesianCoordinate,
+) -> NDArray[np.float64]:
+    row = [(point[0], point[1], point[2]) for point in points.unpack()]
+    jacobian: NDArray[np.float64] = cartesian_to_pairdistance_jacobian_batch(
+        np.array([row])
+    )[0]
+    return jacobian
+
+
+# --- the chain rule -----------------------------------------------------------------
+
+
+def chain_jacobians(*jacobians: NDArray[np.float64]) -> NDArray[np.float64]:
+    """
+    Combine the Jacobians of a sequence of conversions, given in the order in which the
+    conversions are applied, into the Jacobian of the whole sequence.
+
+    Example:
+    >>> # the derivatives of the pair distances with respect to the grid coordinates
+    >>> perimetrics = grid_to_perimetric_batch(gridcoords)
+    >>> jacobians = chain_jacobians(
+    ...     grid_to_perimetric_jacobian_batch(gridcoords),
+    ...     perimetric_to_pairdistance_jacobian_batch(perimetrics),
+    ... )
+    """
+    if not jacobians:
+        raise ValueError("At least one Jacobian is needed")
+
+    return functools.reduce(lambda total, step: step @ total, jacobians)
+
+
+_BATCH_JACOBIANS = {
+    ("grid", "perimetric"): grid_to_perimetric_jacobian_batch,
+    ("perimetric", "grid"): perimetric_to_grid_jacobian_batch,
+    ("perimetric", "pairdistance"): perimetric_to_pairdistance_jacobian_batch,
+    ("pairdistance", "perimetric"): pairdistance_to_perimetric_jacobian_batch,
+    ("pairdistance", "cartesian"): pairdistance_to_cartesian_jacobian_batch,
+    ("cartesian", "pairdistance"): cartesian_to_pairdistance_jacobian_batch,
+}
+
+
+def _n_values(kind: str) -> int:
+    return 12 if kind == "cartesian" else 6
+
+
+def get_batch_jacobian(from_: str, to: str) -> BatchJacobian:
+    """
+    Get the function that calculates the Jacobians of the conversion from coordinates of
+    kind 'from_' to coordinates of kind 'to', at each coordinate of an array. The kinds
+    are named as in 'COORDINATE_KINDS'.
+
+    The Jacobians of the conversions between neighbouring kinds are combined using the
+    chain rule; the intermediate coordinates are found using the batched conversions.
+    """
+    check_coordinate_kind(from_)
+    check_coordinate_kind(to)
+
+    i_from = COORDINATE_KINDS.index(from_)
+    i_to = COORDINATE_KINDS.index(to)
+    step = 1 if i_to >= i_from else -1
+    kinds = [COORDINATE_KINDS[i_kind] for i_kind in range(i_from, i_to + step, step)]
+    pairs = list(zip(kinds[:-1], kinds[1:]))
+
+    def jacobian(coords: NDArray[np.float64]) -> NDArray[np.float64]:
+        coords = np.asarray(coords, dtype=np.float64)
+        if not pairs:
+            identity = np.eye(_n_values(from_))
+            return _broadcast_matrix(identity, coords.shape[0])
+
+        step_jacobians = []
+        for i_pair, pair in enumerate(pairs):
+            step_jacobians.append(_BATCH_JACOBIANS[pair](coords))
+            if i_pair + 1 < len(pairs):
+                coords = get_batch_conversion(*pair)(coords)
+
+        return chain_jacobians(*step_jacobians)
+
+    return jacobian
@@ -0,0 +1,305 @@
+"""
+This module contains walkers for Monte Carlo simulations, in which each step moves a
+single one of the four particles.
+
+A walker holds the Cartesian positions of the four particles, together with the pair
+distance, perimetric, and grid coordinates of the geometry. When a particle moves, only
+the three pair distances that involve that particle change; a walker recalculates
+those three pair distances, and only the perimetric coordinates that depend on them
+(see equation (24) in the paper):
+ - moving particle 0, 1 or 2 changes five of the six perimetric coordinates
+ - moving particle 3 changes only t3, s3 and w3
+
+Each updated perimetric coordinate is recalculated from the current pair distances,
+rather than adjusted by the change in the pair distances, so that round-off error does
+not build up over many moves.
+
+Every grid coordinate except grid_u1 and grid_u2 depends on several perimetric
+coordinates, so the grid coordinates are recalculated after each move.
+
+The 'Walker' class handles a single geometry using python floats, which is faster than
+numpy for so few values. The 'WalkerBatch' class handles many independent geometries at
+once, using numpy arrays.
+
+In a Metropolis step, the proposed move is made on a copy of the walker, with 'moved()';
+the copy replaces the original (for a Walker) or its rows are copied into the original
+with 'accept()' (for a WalkerBatch) if the move is accepted.
+"""
+
+from __future__ import annotations
+
+import math
+from typing import List
+from typing import Optional
+from typing import Sequence
+from typing import Tuple
+
+import numpy as np
+from numpy.typing import ArrayLike
+from numpy.typing import NDArray
+
+from frolov.conversions import _perimetric_to_grid_values
+from frolov.conversions import cartesian_to_pairdistance_batch
+from frolov.conversions import pairdistance_to_perimetric_batch
+from frolov.conversions import perimetric_to_grid_batch
+from frolov.coordinates.grid_coordinate import GridCoordinate
+from frolov.coordinates.pairdistance_coordinate import PairDistanceCoordinate
+from frolov.coordinates.perimetric_coordinate import PerimetricCoordinate
+
+_PAIRS = ((0, 1), (0, 2), (0, 3), (1, 2), (1, 3), (2, 3))
+
+# each perimetric coordinate in equation (24) has the form (r[a] + r[b] - r[c]) / 2,
+# where (a, b, c) are columns of the pair distances (r01, r02, r03, r12, r13, r23)
+_PERIMETRIC_TERMS = (
+    (1, 0, 3),  # u1 = (r02 + r01 - r12) / 2
+    (0, 3, 1),  # u2 = (r01 + r12 - r02) / 2
+    (3, 1, 0),  # u3 = (r12 + r02 - r01) / 2
+    (4, 2, 0),  # t3 = (r13 + r03 - r01) / 2
+    (5, 3, 4),  # s3 = (r23 + r12 - r13) / 2
+    (5, 1, 2),  # w3 = (r23 + r02 - r03) / 2
+)
+
+
+def _moved_pair_columns(i_particle: int) -> Tuple[Tuple[int, int], ...]:
+    """The (column, other particle) of each pair distance that involves the particle."""
+    return tuple(
+        (i_column, i1 if i0 == i_particle else i0)
+        for (i_column, (i0, i1)) in enumerate(_PAIRS)
+        if i_particle in (i0, i1)
+    )
+
+
+def _affected_perimetric_columns(i_particle: int) -> Tuple[int, ...]:
+    moved_columns = {i_column for (i_column, _) in _moved_pair_columns(i_particle)}
+    return tuple(
+        i_perimetric
+        for (i_perimetric, terms) in enumerate(_PERIMETRIC_TERMS)
+        if moved_columns.intersection(terms)
+    )
+
+
+_MOVED_PAIR_COLUMNS = tuple(_moved_pair_columns(i) for i in range(4))
+_AFFECTED_PERIMETRIC_COLUMNS = tuple(_affected_perimetric_columns(i) for i in range(4))
+
+
+def _check_particle(i_particle: int) -> None:
+    if not 0 <= i_particle < 4:
+        raise ValueError(f"The particle index must be 0, 1, 2 or 3, found {i_particle}")
+
+
+class Walker:
+    """The four particle positions, and the coordinates, of a single geometry."""
+
+    __slots__ = ("_positions", "_pairdists", "_perimetrics", "_gridcoords")
+
+    def __init__(self, positions: ArrayLike) -> None:
+        points = np.asarray(positions, dtype=np.float64)
+        if points.shape != (4, 3):
+            raise ValueError(
+                f"Expected positions of shape (4, 3), found {points.shape}"
+            )
+
+        self._positions: List[Tuple[float, float, float]] = [
+            (x, y, z) for (x, y, z) in points.tolist()
+        ]
+        self._pairdists: List[float] = [
+            math.dist(self._positions[i0], self._positions[i1]) for (i0, i1) in _PAIRS
+        ]
+        self._perimetrics: List[float] = [
+            0.5 * (self._pairdists[a] + self._pairdists[b] - self._pairdists[c])
+            for (a, b, c) in _PERIMETRIC_TERMS
+        ]
+        self._gridcoords = _perimetric_to_grid_values(*self._perimetrics)
+
+    @property
+    def positions(self) -> NDArray[np.float64]:
+        return np.array(self._positions)
+
+    @property
+    def pairdists(self) -> Tuple[float, ...]:
+        """The pair distances, in the order (r01, r02, r03, r12, r13, r23)."""
+        return tuple(self._pairdists)
+
+    @property
+    def perimetrics(self) -> Tuple[float, ...]:
+        """The perimetric coordinates, in the order (u1, u2, u3, t3, s3, w3)."""
+        return tuple(self._perimetrics)
+
+    @property
+    def gridcoords(self) -> Tuple[float, ...]:
+        """The grid coordinates, in the same order as the fields of GridCoordinate."""
+        return tuple(self._gridcoords)
+
+    def pairdistance_coordinate(self) -> PairDistanceCoordinate:
+        return PairDistanceCoordinate(*self._pairdists)
+
+    def perimetric_coordinate(self) -> PerimetricCoordinate:
+        return PerimetricCoordinate(*self._perimetrics)
+
+    def grid_coordinate(self) -> GridCoordinate:
+        return GridCoordinate(*self._gridcoords)
+
+    def copy(self) -> Walker:
+        walker = Walker.__new__(Walker)
+        walker._positions = self._positions.copy()
+        walker._pairdists = self._pairdists.copy()
+        walker._perimetrics = self._perimetrics.copy()
+        walker._gridcoords = self._gridcoords
+        return walker
+
+    def move(self, i_particle: int, position: Sequence[float]) -> None:
+        """Move the particle 'i_particle' to 'position', and update the coordinates."""
+        _check_particle(i_particle)
+        x, y, z = position
+        new_position = (float(x), float(y), float(z))
+        self._positions[i_particle] = new_position
+
+        pairdists = self._pairdists
+        for i_column, i_other in _MOVED_PAIR_COLUMNS[i_particle]:
+            pairdists[i_column] = math.dist(new_position, self._positions[i_other])
+
+        perimetrics = self._perimetrics
+        for i_perimetric in _AFFECTED_PERIMETRIC_COLUMNS[i_particle]:
+            a, b, c = _PERIMETRIC_TERMS[i_perimetric]
+            perimetrics[i_perimetric] = 0.5 * (
+                pairdists[a] + pairdists[b] - pairdists[c]
+            )
+
+        self._gridcoords = _perimetric_to_grid_values(*perimetrics)
+
+    def moved(self, i_particle: int, position: Sequence[float]) -> Walker:
+        """A copy of this walker, with the particle 'i_particle' moved to 'position'."""
+        walker = self.copy()
+        walker.move(i_particle, position)
+        return walker
+
+
+class WalkerBatch:
+    """
+    The four particle positions, and the coordinates, of many independent geometries.
+
+    The positions are held in an array of shape (N, 4, 3), and the pair distance,
+    perimetric and grid coordinates in arrays of shape (N, 6), in the same column order
+    as the batched conversions.
+    """
+
+    def __init__(self, positions: ArrayLike) -> None:
+        points = np.array(positions, dtype=np.float64)
+        if points.ndim != 3 or points.shape[1:] != (4, 3):
+            raise ValueError(
+                f"Expected positions of shape (N, 4, 3), found {points.shape}"
+            )
+
+        self._positions = points
+        self._pairdists = cartesian_to_pairdistance_batch(points)
+        self._perimetrics = pairdistance_to_perimetric_batch(self._pairdists)
+        self._gridcoords = perimetric_to_grid_batch(self._perimetrics)
+
+    @property
+    def positions(self) -> NDArray[np.float64]:
+        return self._positions
+
+    @property
+    def pairdists(self) -> NDArray[np.float64]:
+        return self._pairdists
+
+    @property
+    def perimetrics(self) -> NDArray[np.float64]:
+        return self._perimetrics
+
+    @property
+    def gridcoords(self) -> NDArray[np.float64]:
+        return self._gridcoords
+
+    def __len__(self) -> int:
+        return int(self._positions.shape[0])
+
+    def copy(self) -> WalkerBatch:
+        walkers = WalkerBatch.__new__(WalkerBatch)
+        walkers._positions = self._positions.copy()
+        walkers._pairdists = self._pairdists.copy()
+        walkers._perimetrics = self._perimetrics.copy()
+        walkers._gridcoords = self._gridcoords.copy()
+        return walkers
+
+    def _move_rows(
+        self,
+        i_particle: int,
+        rows: slice | NDArray[np.int64],
+        new_positions: NDArray[np.float64],
+    ) -> None:
+        self._positions[rows, i_particle] = new_positions
+
+        pairdists = self._pairdists
+        for i_column, i_other in _MOVED_PAIR_COLUMNS[i_particle]:
+            separation = new_positions - self._positions[rows, i_other]
+            pairdists[rows, i_column] = np.sqrt(
+                np.einsum("ij,ij->i", separation, separation)
+            )
+
+        perimetrics = self._perimetrics
+        for i_perimetric in _AFFECTED_PERIMETRIC_COLUMNS[i_particle]:
+            a, b, c = _PERIMETRIC_TERMS[i_perimetric]
+            perimetrics[rows, i_perimetric] = 0.5 * (
+                pairdists[rows, a] + pairdists[rows, b] - pairdists[rows, c]
+            )
+
+        grid_columns = _perimetric_to_grid_values(*perimetrics[rows].T)
+        for i_column, column in enumerate(grid_columns):
+            self._gridcoords[rows, i_column] = column
+
+    def move(self, i_particle: int | ArrayLike, new_positions: ArrayLike) -> None:
+        """
+        Move one particle of each walker to the corresponding row of the (N, 3) array
+        'new_positions', and update the coordinates.
+
+        'i_particle' is either a single particle index used for every walker, or an
+        array holding the index of the particle to move in each walker.
+        """
+        new_positions = np.asarray(new_positions, dtype=np.float64)
+        if new_positions.shape != (len(self), 3):
+            raise ValueError(
+                f"Expected new positions of shape ({len(self)}, 3), found {new_positions.shape}"
+            )
+
+        if np.ndim(i_particle) == 0:
+            _check_particle(int(i_particle))  # type: ignore[arg-type]
+            self._move_rows(int(i_particle), slice(None), new_positions)  # type: ignore[arg-type]
+            return
+
+        i_particles = np.asarray(i_particle)
+        if i_particles.shape != (len(self),):
+            raise ValueError(
+                f"Expected {len(self)} particle indices, found shape {i_particles.shape}"
+            )
+        if np.any((i_particles < 0) | (i_particles > 3)):
+            raise ValueError("The particle indices must be 0, 1, 2 or 3")
+
+        for i_particle_group in range(4):
+            rows = np.flatnonzero(i_particles == i_particle_group)
+            if rows.size > 0:
+                self._move_rows(i_particle_group, rows, new_positions[rows])
+
+    def moved(
+        self, i_particle: int | ArrayLike, new_positions: ArrayLike
+    ) -> WalkerBatch:
+        """A copy of these walkers, with the moves of 'move()' applied."""
+        walkers = self.copy()
+        walkers.move(i_particle, new_positions)
+        return walkers
+
+    def accept(self, proposal: WalkerBatch, mask: Optional[ArrayLike] = None) -> None:
+        """
+        Replace the walkers for which 'mask' is True with the corresponding walkers of
+        'proposal' (usually created with 'moved()'); all of them if 'mask' is None.
+        """
+        if len(proposal) != len(self):
+            raise ValueError(
+                f"Expected a proposal of {len(self)} walkers, found {len(proposal)}"
+            )
+
+        rows = slice(None) if mask is None else np.asarray(mask, dtype=np.bool_)
+        self._positions[rows] = proposal._positions[rows]
+        self._pairdists[rows] = proposal._pairdists[rows]
+        self._perimetrics[rows] = proposal._perimetrics[rows]
+        self._gridcoords[rows] = proposal._gridcoords[rows]
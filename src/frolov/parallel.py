@@ -0,0 +1,182 @@
+"""
+This module contains a converter that spreads the batched conversions of a very large
+array over several worker processes.
+
+The input and output arrays are placed in shared memory (using the standard library's
+'multiprocessing.shared_memory' module). Each worker attaches to the shared blocks by
+name, converts its own contiguous shard of rows, and writes the result directly into the
+corresponding rows of the output. No coordinates are pickled, and the output is always
+in the same order as the input.
+"""
+
+from __future__ import annotations
+
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.context import BaseContext
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+import numpy as np
+from numpy.typing import NDArray
+
+from frolov.conversions import get_batch_conversion
+from frolov.conversions import row_shape
+from frolov.stream import DEFAULT_CHUNK_SIZE
+
+
+def _convert_shard(
+    from_: str,
+    to: str,
+    input_name: str,
+    input_shape: Tuple[int, ...],
+    output_name: str,
+    output_shape: Tuple[int, ...],
+    i_start: int,
+    i_stop: int,
+) -> None:
+    """Convert the rows [i_start, i_stop) of the shared input into the shared output."""
+    # the worker processes share the resource tracker of the parent process, which
+    # owns the shared memory blocks and is responsible for unlinking them
+    input_shm = SharedMemory(name=input_name)
+    output_shm = SharedMemory(name=output_name)
+    try:
+        inputs = np.ndarray(input_shape, dtype=np.float64, buffer=input_shm.buf)
+        outputs = np.ndarray(output_shape, dtype=np.float64, buffer=output_shm.buf)
+
+        conversion = get_batch_conversion(from_, to)
+        outputs[i_start:i_stop] = conversion(inputs[i_start:i_stop])
+
+        # the views must be released before the shared memory can be closed
+        del inputs, outputs
+    finally:
+        input_shm.close()
+        output_shm.close()
+
+
+def _create_shared_array(
+    shape: Tuple[int, ...],
+) -> Tuple[SharedMemory, NDArray[np.float64]]:
+    n_bytes = max(1, math.prod(shape) * np.dtype(np.float64).itemsize)
+    shm = SharedMemory(create=True, size=n_bytes)
+    array: NDArray[np.float64] = np.ndarray(shape, dtype=np.float64, buffer=shm.buf)
+
+    return shm, array
+
+
+class ParallelConverter:
+    """
+    Convert arrays of coordinates of kind 'from_' into arrays of coordinates of kind
+    'to', using a pool of 'n_workers' processes. Each task sent to the pool converts
+    'chunk_size' rows.
+
+    The pool is created when it is first needed, and is kept alive between calls to
+    'convert()' until 'close()' is called (or the 'with' block is exited).
+
+    Arrays with no more than 'chunk_size' rows are converted in the calling process, as
+    the cost of starting the tasks would outweigh the benefit.
+    """
+
+    def __init__(
+        self,
+        from_: str,
+        to: str,
+        n_workers: Optional[int] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        mp_context: Optional[BaseContext] = None,
+    ) -> None:
+        if chunk_size < 1:
+            raise ValueError(f"The chunk size must be positive, found {chunk_size}")
+
+        self._from = from_
+        self._to = to
+        self._conversion = get_batch_conversion(from_, to)
+        self._n_workers = n_workers if n_workers is not None else (os.cpu_count() or 1)
+        self._chunk_size = chunk_size
+        self._mp_context = mp_context
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+        if self._n_workers < 1:
+            raise ValueError(f"At least one worker is needed, found {self._n_workers}")
+
+    @property
+    def n_workers(self) -> int:
+        return self._n_workers
+
+    @property
+    def chunk_size(self) -> int:
+        return self._chunk_size
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self._n_workers, mp_context=self._mp_context
+            )
+
+        return self._executor
+
+    def convert(self, coords: NDArray[np.float64]) -> NDArray[np.float64]:
+        """Convert all the coordinates in 'coords'; the first axis indexes the rows."""
+        coords = np.asarray(coords, dtype=np.float64)
+        n_rows = coords.shape[0]
+        if coords.shape[1:] != row_shape(self._from):
+            expected_shape = ("N",) + row_shape(self._from)
+            raise ValueError(
+                f"Expected an array of shape {expected_shape}, found {coords.shape}"
+            )
+
+        if self._n_workers == 1 or n_rows <= self._chunk_size:
+            return self._conversion(coords)
+
+        input_shape = coords.shape
+        output_shape = (n_rows,) + row_shape(self._to)
+
+        input_shm, inputs = _create_shared_array(input_shape)
+        output_shm, outputs = _create_shared_array(output_shape)
+        try:
+            inputs[:] = coords
+
+            executor = self._get_executor()
+            futures: List[Any] = []
+            for i_start in range(0, n_rows, self._chunk_size):
+                i_stop = min(i_start + self._chunk_size, n_rows)
+                future = executor.submit(
+                    _convert_shard,
+                    self._from,
+                    self._to,
+                    input_shm.name,
+                    input_shape,
+                    output_shm.name,
+                    output_shape,
+                    i_start,
+                    i_stop,
+                )
+                futures.append(future)
+
+            for future in futures:
+                future.result()
+
+            result = outputs.copy()
+            del inputs, outputs
+        finally:
+            input_shm.close()
+            input_shm.unlink()
+            output_shm.close()
+            output_shm.unlink()
+
+        return result
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def __enter__(self) -> ParallelConverter:
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
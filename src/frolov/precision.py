@@ -0,0 +1,75 @@
+"""
+This module contains the choice of floating-point precision for arrays of coordinates.
+
+The batched conversions, the samplers, the batch containers and the storage functions
+accept a 'dtype' argument, which must be one of:
+ - float64 (the default): the same precision as the scalar coordinates, which hold
+   python floats
+ - float32: half the memory and bandwidth; the values carry a relative rounding error
+   of about 6e-8, which is enough for pair distances and perimetric coordinates used as
+   training data
+
+Conversions between the six-value coordinate kinds are carried out in the requested
+precision. Conversions that involve Cartesian coordinates are always carried out in
+float64, and only the result is rounded to the requested precision; placing the four
+points from their pair distances involves differences of squares, which lose too many
+digits in float32 for nearly planar or nearly collinear geometries. The conversions
+returned by 'get_batch_conversion()' keep the intermediate steps of a chain in float64,
+and round only the result.
+
+Scalar coordinates created from a float32 batch hold the rounded values. The default
+tolerance 'eps_sq = 1.0e-6' of the '*_approx_eq()' functions for the six-value
+coordinate kinds (grid, perimetric, and pair distance) is much larger than the
+rounding error of float32 values of order 1 (and of float64 values of any reasonable
+size), but not of float32 values larger than about 200; 'approx_eq_eps_sq()' gives a
+tolerance that allows for the rounding error at a given scale.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+from typing import Optional
+from typing import Tuple
+
+import numpy as np
+from numpy.typing import DTypeLike
+
+DEFAULT_DTYPE = np.dtype(np.float64)
+SUPPORTED_DTYPES: Tuple[np.dtype[Any], ...] = (
+    np.dtype(np.float32),
+    np.dtype(np.float64),
+)
+
+# the number of units in the last place that the values can differ by after a few
+# conversions, in 'approx_eq_eps_sq()'
+_N_ULPS = 16
+
+
+def resolve_dtype(dtype: Optional[DTypeLike] = None) -> np.dtype[Any]:
+    """
+    The numpy dtype for a 'dtype' argument; None means the default (float64). Raises a
+    ValueError for dtypes other than float32 and float64.
+    """
+    if dtype is None:
+        return DEFAULT_DTYPE
+
+    resolved = np.dtype(dtype)
+    if resolved not in SUPPORTED_DTYPES:
+        raise ValueError(
+            f"Unsupported dtype '{resolved}'; expected one of "
+            f"{tuple(str(supported) for supported in SUPPORTED_DTYPES)}"
+        )
+
+    return resolved
+
+
+def approx_eq_eps_sq(dtype: Optional[DTypeLike] = None, scale: float = 1.0) -> float:
+    """
+    A value of 'eps_sq' for the '*_approx_eq()' functions that allows for the rounding
+    error of six values of magnitude 'scale' stored with the given dtype. The result is
+    never smaller than the default tolerance of those functions (1.0e-6).
+    """
+    eps = float(np.finfo(resolve_dtype(dtype)).eps)
+    rounding_eps_sq = 6.0 * (_N_ULPS * eps * abs(scale)) ** 2
+
+    return max(1.0e-6, rounding_eps_sq)
@@ -0,0 +1,446 @@
+"""
+This module contains samplers that generate batches of grid coordinates from
+low-discrepancy (quasi-random) sequences.
+
+All six grid coordinates can be varied independently of one another, so the sampling
+region is a box in grid space. Points from a low-discrepancy sequence cover such a box
+much more evenly than independent uniform random points do, so fewer samples are needed
+to cover the box to a given resolution.
+
+Two sequences are available:
+ - 'sobol'
+    - the Sobol sequence in base 2, with the direction numbers of Joe and Kuo
+    - balance properties are best when the number of points drawn is a power of 2
+ - 'halton'
+    - the Halton sequence, using the first six primes as bases
+
+When 'scramble' is True, the sequences are randomized (a random digital shift for the
+Sobol sequence, and random digit permutations for the Halton sequence). Randomization
+keeps the low-discrepancy structure, but makes each seed produce a different point set.
+Samplers with independent randomizations (for example, one per worker) are created with
+'GridSampler.spawn()'.
+
+Five of the grid coordinates (grid_u1, grid_u2, grid_u3, grid_t3, grid_s3) have no upper
+limit, so the box being sampled must be chosen by the user through a GridBounds instance.
+
+When the four particles are identical, each geometry in the box is usually sampled under
+several of its 24 labellings (see 'frolov.symmetry'). The 'SymmetryReducedSampler' only
+keeps the points of the sequence that lie in a fundamental domain of the box: a point
+is kept when its own labelling is the lexicographically smallest (by pair distances) of
+the labellings of its geometry that also lie in the box. Each geometry with a labelling
+in the box is then represented by exactly one point. The points are found by rejection,
+so the fraction of points kept (the efficiency) is also the fraction of energy
+evaluations needed; it is never smaller than 1/24. The grid constraints already fix much
+of the order of the labels (for example, s3 <= u3 <= t3), so a geometry usually has
+only one or two labellings in the grid domain, and the efficiency for a box of grid
+coordinates is typically between 0.5 and 0.6.
+"""
+
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from dataclasses import fields
+from typing import Any
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+import numpy as np
+from numpy.typing import DTypeLike
+from numpy.typing import NDArray
+
+from frolov.conversions import grid_to_perimetric_batch
+from frolov.conversions import pairdistance_to_perimetric_batch
+from frolov.conversions import perimetric_to_grid_batch
+from frolov.conversions import perimetric_to_pairdistance_batch
+from frolov.precision import resolve_dtype
+from frolov.symmetry import PERMUTATION_COLUMNS
+from frolov.symmetry import PERMUTATIONS
+from frolov.symmetry import smaller_labellings_pairdistance_batch
+
+N_GRID_DIMENSIONS = 6
+
+_N_SOBOL_BITS = 32
+
+# The (degree, coefficients, initial direction numbers) of the primitive polynomials for
+# dimensions 2 to 6 of the Sobol sequence, taken from the 'new-joe-kuo-6.21201' table
+# (S. Joe and F. Y. Kuo, SIAM J. Sci. Comput. 30, 2635 (2008)). The first dimension is
+# the van der Corput sequence in base 2.
+_SOBOL_PARAMETERS: Tuple[Tuple[int, int, Tuple[int, ...]], ...] = (
+    (1, 0, (1,)),
+    (2, 1, (1, 3)),
+    (3, 1, (1, 3, 1)),
+    (3, 2, (1, 1, 1)),
+    (4, 1, (1, 1, 3, 3)),
+)
+
+_HALTON_BASES = (2, 3, 5, 7, 11, 13)
+
+# the smallest and largest number of points drawn from the sequence at a time by the
+# SymmetryReducedSampler
+_MIN_REDUCED_DRAW = 1024
+_MAX_REDUCED_DRAW = 65536
+
+
+@dataclass(frozen=True)
+class GridBounds:
+    """
+    The (lower, upper) limits of the box in grid space to sample from. The limits must
+    lie within the region allowed by the grid constraints.
+    """
+
+    grid_u1: Tuple[float, float] = (0.0, 10.0)
+    grid_u2: Tuple[float, float] = (0.0, 10.0)
+    grid_u3: Tuple[float, float] = (1.0, 10.0)
+    grid_t3: Tuple[float, float] = (1.0, 10.0)
+    grid_s3: Tuple[float, float] = (1.0, 10.0)
+    grid_w3: Tuple[float, float] = (0.0, 1.0)
+
+    def __post_init__(self) -> None:
+        minimum_values = (0.0, 0.0, 1.0, 1.0, 1.0, 0.0)
+        maximum_values = (math.inf,) * 5 + (1.0,)
+
+        limits = zip(fields(self), minimum_values, maximum_values)
+        for field, minimum_value, maximum_value in limits:
+            lower, upper = getattr(self, field.name)
+            if not minimum_value <= lower <= upper <= maximum_value:
+                raise ValueError(
+                    f"The bounds for '{field.name}' must satisfy "
+                    f"{minimum_value} <= lower <= upper <= {maximum_value}; found ({lower}, {upper})"
+                )
+
+    @property
+    def lower(self) -> NDArray[np.float64]:
+        return np.array([getattr(self, field.name)[0] for field in fields(self)])
+
+    @property
+    def upper(self) -> NDArray[np.float64]:
+        return np.array([getattr(self, field.name)[1] for field in fields(self)])
+
+    def scale(self, unit_points: NDArray[np.float64]) -> NDArray[np.float64]:
+        """Map an (N, 6) array of points in the unit hypercube into the box."""
+        lower = self.lower
+        return lower + unit_points * (self.upper - lower)
+
+    def contains(self, gridcoords: NDArray[np.float64]) -> NDArray[np.bool_]:
+        """Check which rows of an (N, 6) array of grid coordinates lie in the box."""
+        gridcoords = np.asarray(gridcoords)
+        is_inside: NDArray[np.bool_] = np.all(
+            (self.lower <= gridcoords) & (gridcoords <= self.upper), axis=1
+        )
+        return is_inside
+
+
+def _sobol_direction_numbers() -> NDArray[np.uint64]:
+    """Create the (6, 32) array of direction numbers for the Sobol sequence."""
+    directions = np.zeros((N_GRID_DIMENSIONS, _N_SOBOL_BITS), dtype=np.uint64)
+    bit_numbers = np.arange(1, _N_SOBOL_BITS + 1, dtype=np.uint64)
+    directions[0] = np.uint64(1) << (np.uint64(_N_SOBOL_BITS) - bit_numbers)
+
+    for i_dim, (degree, coefficients, initial) in enumerate(_SOBOL_PARAMETERS, 1):
+        m = list(initial)
+        for k in range(degree, _N_SOBOL_BITS):
+            m_k = m[k - degree] ^ (m[k - degree] << degree)
+            for i_coeff in range(1, degree):
+                if (coefficients >> (degree - 1 - i_coeff)) & 1:
+                    m_k ^= m[k - i_coeff] << i_coeff
+            m.append(m_k)
+
+        for k in range(_N_SOBOL_BITS):
+            directions[i_dim, k] = m[k] << (_N_SOBOL_BITS - 1 - k)
+
+    return directions
+
+
+_SOBOL_DIRECTIONS = _sobol_direction_numbers()
+
+
+def sobol_points(
+    i_start: int, n_points: int, shift: Optional[NDArray[np.uint64]] = None
+) -> NDArray[np.float64]:
+    """
+    Create the points with indices [i_start, i_start + n_points) of the six-dimensional
+    Sobol sequence, as an (n_points, 6) array in the unit hypercube. If given, 'shift'
+    holds a 32-bit integer per dimension that is XOR-ed into the points (a digital shift).
+    """
+    if i_start + n_points > 2**_N_SOBOL_BITS:
+        raise ValueError(f"Only 2^{_N_SOBOL_BITS} points of the sequence are available")
+
+    indices = np.arange(i_start, i_start + n_points, dtype=np.uint64)
+    gray_codes = indices ^ (indices >> np.uint64(1))
+
+    integers = np.zeros((n_points, N_GRID_DIMENSIONS), dtype=np.uint64)
+    for i_bit in range(_N_SOBOL_BITS):
+        remaining_bits = gray_codes >> np.uint64(i_bit)
+        if not np.any(remaining_bits):
+            break
+        has_bit = (remaining_bits & np.uint64(1)).astype(np.bool_)
+        integers[has_bit] ^= _SOBOL_DIRECTIONS[:, i_bit]
+
+    if shift is not None:
+        integers ^= shift
+
+    return integers.astype(np.float64) / float(2**_N_SOBOL_BITS)
+
+
+def halton_points(
+    i_start: int,
+    n_points: int,
+    permutations: Optional[List[NDArray[np.int64]]] = None,
+) -> NDArray[np.float64]:
+    """
+    Create the points with indices [i_start, i_start + n_points) of the six-dimensional
+    Halton sequence, as an (n_points, 6) array in the unit hypercube. If given,
+    'permutations[i_dim]' holds a permutation of the digits for each digit position of
+    dimension 'i_dim', as an array of shape (n_digits, base).
+    """
+    indices = np.arange(i_start, i_start + n_points, dtype=np.int64)
+
+    points = np.zeros((n_points, N_GRID_DIMENSIONS), dtype=np.float64)
+    for i_dim, base in enumerate(_HALTON_BASES):
+        n_digits = _halton_n_digits(base)
+        remaining = indices.copy()
+        scale = 1.0 / base
+        for i_digit in range(n_digits):
+            digits = remaining % base
+            if permutations is not None:
+                digits = permutations[i_dim][i_digit][digits]
+            elif not np.any(remaining):
+                break
+            points[:, i_dim] += digits * scale
+            remaining //= base
+            scale /= base
+
+    return points
+
+
+def _halton_n_digits(base: int) -> int:
+    """The number of digits needed to reach double precision in the given base."""
+    return int(math.ceil(53 / math.log2(base)))
+
+
+class GridSampler:
+    """
+    Generate batches of grid coordinates from a low-discrepancy sequence.
+
+    Each call to 'sample()' continues the sequence from where the previous call stopped.
+    """
+
+    def __init__(
+        self,
+        method: str = "sobol",
+        bounds: Optional[GridBounds] = None,
+        scramble: bool = True,
+        seed: int | np.random.SeedSequence | None = None,
+        dtype: Optional[DTypeLike] = None,
+    ) -> None:
+        if method not in ("sobol", "halton"):
+            raise ValueError(f"Unknown method '{method}'; expected 'sobol' or 'halton'")
+
+        self._method = method
+        self._dtype = resolve_dtype(dtype)
+        self._bounds = bounds if bounds is not None else GridBounds()
+        self._scramble = scramble
+        self._seed_sequence = (
+            seed
+            if isinstance(seed, np.random.SeedSequence)
+            else np.random.SeedSequence(seed)
+        )
+        self._position = 0
+
+        self._shift: Optional[NDArray[np.uint64]] = None
+        self._permutations: Optional[List[NDArray[np.int64]]] = None
+        if scramble:
+            rng = np.random.default_rng(self._seed_sequence)
+            if method == "sobol":
+                self._shift = rng.integers(
+                    0, 2**_N_SOBOL_BITS, size=N_GRID_DIMENSIONS, dtype=np.uint64
+                )
+            else:
+                self._permutations = [
+                    np.array(
+                        [rng.permutation(base) for _ in range(_halton_n_digits(base))]
+                    )
+                    for base in _HALTON_BASES
+                ]
+
+    @property
+    def method(self) -> str:
+        return self._method
+
+    @property
+    def bounds(self) -> GridBounds:
+        return self._bounds
+
+    @property
+    def dtype(self) -> np.dtype[Any]:
+        return self._dtype
+
+    @property
+    def position(self) -> int:
+        """The index in the sequence of the next point to be generated."""
+        return self._position
+
+    def skip(self, n_points: int) -> None:
+        """Advance the sequence without generating the points."""
+        self._position += n_points
+
+    def sample_unit(self, n_points: int) -> NDArray[np.float64]:
+        """Generate the next 'n_points' points of the sequence in the unit hypercube."""
+        if self._method == "sobol":
+            points = sobol_points(self._position, n_points, self._shift)
+        else:
+            points = halton_points(self._position, n_points, self._permutations)
+
+        self._position += n_points
+        return points
+
+    def sample(self, n_points: int) -> NDArray[np.float64]:
+        """
+        Generate the next 'n_points' grid coordinates, as an (n_points, 6) array of the
+        sampler's dtype. The points are scaled into the bounds in float64.
+        """
+        points = self._bounds.scale(self.sample_unit(n_points))
+        return points.astype(self._dtype, copy=False)
+
+    def spawn(self, n_streams: int) -> List[GridSampler]:
+        """
+        Create 'n_streams' new samplers with the same method and bounds, each with its
+        own independent randomization. The result is reproducible for a given seed.
+        """
+        return [
+            GridSampler(
+                self._method, self._bounds, self._scramble, child_seed, self._dtype
+            )
+            for child_seed in self._seed_sequence.spawn(n_streams)
+        ]
+
+
+def fundamental_domain_mask(
+    gridcoords: NDArray[np.float64], bounds: Optional[GridBounds] = None
+) -> NDArray[np.bool_]:
+    """
+    Check which rows of an (N, 6) array of grid coordinates in the box 'bounds' lie in
+    its fundamental domain under relabelling of the particles; that is, no other
+    labelling of the same geometry that also lies in the box has lexicographically
+    smaller pair distances.
+    """
+    bounds = bounds if bounds is not None else GridBounds()
+    gridcoords = np.asarray(gridcoords, dtype=np.float64)
+    pairdists = perimetric_to_pairdistance_batch(grid_to_perimetric_batch(gridcoords))
+
+    # only the smaller labellings can disqualify a row, and only if they lie in the box
+    i_rows, i_perms = np.nonzero(smaller_labellings_pairdistance_batch(pairdists))
+    permuted = pairdists[i_rows[:, np.newaxis], PERMUTATION_COLUMNS[i_perms]]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        permuted_gridcoords = perimetric_to_grid_batch(
+            pairdistance_to_perimetric_batch(permuted)
+        )
+
+    mask = np.ones(gridcoords.shape[0], dtype=np.bool_)
+    mask[i_rows[bounds.contains(permuted_gridcoords)]] = False
+
+    return mask
+
+
+class SymmetryReducedSampler:
+    """
+    Generate batches of grid coordinates from a low-discrepancy sequence, keeping only
+    the points that lie in the fundamental domain of the box (see 'fundamental_domain_mask()').
+
+    The points of the sequence are drawn and filtered in batches; points that were kept
+    but not yet returned are held over for the next call to 'sample()'.
+    """
+
+    def __init__(
+        self,
+        method: str = "sobol",
+        bounds: Optional[GridBounds] = None,
+        scramble: bool = True,
+        seed: int | np.random.SeedSequence | None = None,
+        dtype: Optional[DTypeLike] = None,
+    ) -> None:
+        self._seed_sequence = (
+            seed
+            if isinstance(seed, np.random.SeedSequence)
+            else np.random.SeedSequence(seed)
+        )
+        self._scramble = scramble
+        self._dtype = resolve_dtype(dtype)
+        self._sampler = GridSampler(method, bounds, scramble, self._seed_sequence)
+        self._pending = np.empty((0, N_GRID_DIMENSIONS), dtype=np.float64)
+        self._n_drawn = 0
+        self._n_accepted = 0
+
+    @property
+    def method(self) -> str:
+        return self._sampler.method
+
+    @property
+    def bounds(self) -> GridBounds:
+        return self._sampler.bounds
+
+    @property
+    def dtype(self) -> np.dtype[Any]:
+        return self._dtype
+
+    @property
+    def n_drawn(self) -> int:
+        """The number of points drawn from the sequence so far."""
+        return self._n_drawn
+
+    @property
+    def n_accepted(self) -> int:
+        """The number of points drawn so far that lie in the fundamental domain."""
+        return self._n_accepted
+
+    @property
+    def efficiency(self) -> float:
+        """The fraction of the points drawn so far that were kept, or nan if none were."""
+        if self._n_drawn == 0:
+            return math.nan
+
+        return self._n_accepted / self._n_drawn
+
+    def _n_to_draw(self, n_points: int) -> int:
+        # the efficiency is never below 1/24, so this never draws far too few points
+        efficiency = 1.0 / len(PERMUTATIONS)
+        if self._n_accepted > 0:
+            efficiency = max(efficiency, self._n_accepted / self._n_drawn)
+
+        n_draw = math.ceil(1.1 * n_points / efficiency)
+        return min(_MAX_REDUCED_DRAW, max(_MIN_REDUCED_DRAW, n_draw))
+
+    def sample(self, n_points: int) -> NDArray[np.float64]:
+        """
+        Generate the next 'n_points' grid coordinates in the fundamental domain, as an
+        (n_points, 6) array of the sampler's dtype.
+        """
+        chunks = [self._pending]
+        n_found = self._pending.shape[0]
+        while n_found < n_points:
+            candidates = self._sampler.sample(self._n_to_draw(n_points - n_found))
+            accepted = candidates[fundamental_domain_mask(candidates, self.bounds)]
+
+            self._n_drawn += candidates.shape[0]
+            self._n_accepted += accepted.shape[0]
+            chunks.append(accepted)
+            n_found += accepted.shape[0]
+
+        points = np.concatenate(chunks)
+        self._pending = points[n_points:]
+
+        return points[:n_points].astype(self._dtype)
+
+    def spawn(self, n_streams: int) -> List[SymmetryReducedSampler]:
+        """
+        Create 'n_streams' new samplers with the same method and bounds, each with its
+        own independent randomization. The result is reproducible for a given seed.
+        """
+        return [
+            SymmetryReducedSampler(
+                self.method, self.bounds, self._scramble, child_seed, self._dtype
+            )
+            for child_seed in self._seed_sequence.spawn(n_streams)
+        ]
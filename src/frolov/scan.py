@@ -0,0 +1,431 @@
+"""
+This module contains a driver that evaluates a potential energy function over a batch of
+grid coordinates, as in a scan over a potential energy surface.
+
+The potential takes coordinates of one of the kinds in 'frolov.conversions' (Cartesian
+coordinates, by default), and is either:
+ - scalar: called with a single coordinate, as an array of shape (6,) or (4, 3), and
+   returns a float
+ - vectorized: called with an array of shape (N, 6) or (N, 4, 3), and returns an array
+   of N energies
+
+The grid coordinates are split into chunks of 'chunk_size' rows. Each chunk is converted
+and evaluated as a single task in a pool of threads or processes; threads suit
+potentials that release the GIL (such as numpy code or calls into a compiled library),
+and processes suit potentials written in pure python. A potential used with a process
+pool must be picklable (for example, a function defined at the top level of a module).
+
+The energies are written to a '.npy' file with one energy per grid coordinate, as soon
+as each chunk is finished; the rows that are not finished yet hold nan. After each
+chunk is written, its range of rows is appended to a checkpoint file next to the output
+('<output>.checkpoint'). If the scan is interrupted, running it again with the same grid
+coordinates and output skips the chunks recorded in the checkpoint.
+
+If an EnergyCache is given, the energies are also stored in an sqlite3 database, keyed on
+the canonical pair distances of each geometry (see 'frolov.symmetry') rounded to
+'decimals' decimal places. Geometries that are already in the cache, including permuted
+copies of geometries evaluated before, are not evaluated again. The cache is only valid
+for a single potential, and should only be keyed on the canonical geometry (the
+default, 'symmetric=True') if the four particles are identical.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import math
+import os
+import sqlite3
+import time
+from concurrent.futures import FIRST_COMPLETED
+from concurrent.futures import Executor
+from concurrent.futures import Future
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import wait
+from pathlib import Path
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import List
+from typing import NamedTuple
+from typing import Optional
+from typing import Sequence
+from typing import Set
+from typing import Tuple
+from typing import Union
+
+import numpy as np
+from numpy.typing import ArrayLike
+from numpy.typing import NDArray
+
+from frolov.conversions import check_coordinate_kind
+from frolov.conversions import get_batch_conversion
+from frolov.symmetry import canonicalize_pairdistance_batch
+
+DEFAULT_SCAN_CHUNK_SIZE = 256
+
+CHECKPOINT_SUFFIX = ".checkpoint"
+
+PathLike = Union[str, "os.PathLike[str]"]
+
+Potential = Callable[[Any], Any]
+
+# the largest number of keys looked up in a single query of the cache
+_MAX_QUERY_KEYS = 500
+
+# the number of chunks waiting in the pool for each worker; a few keep every worker busy
+# without holding many chunks in memory at once
+_PENDING_CHUNKS_PER_WORKER = 2
+
+
+class ScanSummary(NamedTuple):
+    n_rows: int
+    """The number of grid coordinates in the scan."""
+    n_resumed: int
+    """The number of rows skipped because an earlier run had finished them."""
+    n_cached: int
+    """The number of rows whose energy was found in the cache, or in the same chunk."""
+    n_evaluated: int
+    """The number of geometries the potential was evaluated for."""
+    elapsed: float
+    """The time taken, in seconds."""
+
+
+class EnergyCache:
+    """
+    An sqlite3 database of energies, keyed on the rounded (and, if 'symmetric' is True,
+    canonical) pair distances of each geometry. The settings used to create the keys are
+    stored in the database, and must match when it is opened again.
+    """
+
+    def __init__(
+        self, path: PathLike, decimals: int = 10, symmetric: bool = True
+    ) -> None:
+        self._decimals = decimals
+        self._symmetric = symmetric
+        self._connection = sqlite3.connect(os.fspath(path))
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS energies (key BLOB PRIMARY KEY, energy REAL)"
+        )
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS settings (name TEXT PRIMARY KEY, value TEXT)"
+        )
+        self._check_settings({"decimals": str(decimals), "symmetric": str(symmetric)})
+
+    def _check_settings(self, settings: Dict[str, str]) -> None:
+        for name, value in settings.items():
+            row = self._connection.execute(
+                "SELECT value FROM settings WHERE name = ?", (name,)
+            ).fetchone()
+            if row is None:
+                self._connection.execute(
+                    "INSERT INTO settings (name, value) VALUES (?, ?)", (name, value)
+                )
+            elif row[0] != value:
+                raise ValueError(
+                    f"The cache was created with {name}={row[0]}, not {name}={value}"
+                )
+        self._connection.commit()
+
+    @property
+    def decimals(self) -> int:
+        return self._decimals
+
+    @property
+    def symmetric(self) -> bool:
+        return self._symmetric
+
+    def __len__(self) -> int:
+        return int(
+            self._connection.execute("SELECT COUNT(*) FROM energies").fetchone()[0]
+        )
+
+    def keys(self, pairdists: NDArray[np.float64]) -> List[bytes]:
+        """The keys of the geometries in an (N, 6) array of pair distances."""
+        tolerance = 10.0 ** (-self._decimals)
+        if self._symmetric:
+            pairdists, _ = canonicalize_pairdistance_batch(pairdists, atol=tolerance)
+
+        # adding zero turns -0.0 into 0.0, so that both give the same key
+        rounded = np.round(pairdists, self._decimals) + 0.0
+        return [row.tobytes() for row in rounded]
+
+    def get(self, keys: Sequence[bytes]) -> Dict[bytes, float]:
+        """The stored energies of the keys that are in the cache."""
+        found: Dict[bytes, float] = {}
+        for i_start in range(0, len(keys), _MAX_QUERY_KEYS):
+            query_keys = keys[i_start : i_start + _MAX_QUERY_KEYS]
+            placeholders = ", ".join("?" * len(query_keys))
+            rows = self._connection.execute(
+                f"SELECT key, energy FROM energies WHERE key IN ({placeholders})",
+                query_keys,
+            )
+            for key, energy in rows:
+                found[key] = energy if energy is not None else np.nan
+
+        return found
+
+    def put(self, keys: Sequence[bytes], energies: ArrayLike) -> None:
+        # sqlite3 stores nan as NULL
+        values = [
+            (key, None if math.isnan(energy) else energy)
+            for (key, energy) in zip(keys, np.asarray(energies).tolist())
+        ]
+        self._connection.executemany(
+            "INSERT OR REPLACE INTO energies (key, energy) VALUES (?, ?)", values
+        )
+        self._connection.commit()
+
+    def close(self) -> None:
+        self._connection.close()
+
+    def __enter__(self) -> EnergyCache:
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+def _evaluate_chunk(
+    potential: Potential,
+    kind: str,
+    vectorized: bool,
+    gridcoords: NDArray[np.float64],
+) -> NDArray[np.float64]:
+    """Convert grid coordinates to the potential's kind, and evaluate the potential."""
+    with np.errstate(invalid="ignore", divide="ignore"):
+        coords = get_batch_conversion("grid", kind)(gridcoords)
+
+    if vectorized:
+        energies = np.asarray(potential(coords), dtype=np.float64).reshape(-1)
+        if energies.size != coords.shape[0]:
+            raise ValueError(
+                f"The potential returned {energies.size} energies for {coords.shape[0]} coordinates"
+            )
+        return energies
+
+    return np.array([potential(coord) for coord in coords], dtype=np.float64)
+
+
+class _Checkpoint:
+    """
+    The file that records the chunks of a scan that are finished. The first line holds
+    the size of the scan and a fingerprint of the grid coordinates; each later line
+    holds the (i_start, i_stop) of a finished chunk.
+    """
+
+    def __init__(self, path: Path, header: Dict[str, Any], resume: bool) -> None:
+        self.finished: Set[Tuple[int, int]] = set()
+
+        if resume and path.exists():
+            with open(path, "r") as fin:
+                lines = fin.readlines()
+            if len(lines) > 0 and json.loads(lines[0]) != header:
+                raise ValueError(
+                    f"The checkpoint '{path}' belongs to a different scan; remove it, "
+                    "or run the scan with resume=False"
+                )
+            for line in lines[1:]:
+                # a line without a newline was cut short when the scan was interrupted
+                if line.endswith("\n"):
+                    i_start, i_stop = line.split()
+                    self.finished.add((int(i_start), int(i_stop)))
+
+        self._fout = open(path, "a" if self.finished else "w")
+        if not self.finished:
+            self._fout.write(json.dumps(header) + "\n")
+            self._fout.flush()
+
+    @property
+    def is_resumed(self) -> bool:
+        return len(self.finished) > 0
+
+    def add(self, i_start: int, i_stop: int) -> None:
+        self._fout.write(f"{i_start} {i_stop}\n")
+        self._fout.flush()
+        self.finished.add((i_start, i_stop))
+
+    def close(self) -> None:
+        self._fout.close()
+
+
+def _open_output(path: Path, n_rows: int, resume: bool) -> np.memmap[Any, Any]:
+    if resume:
+        energies = np.lib.format.open_memmap(path, mode="r+")
+        if energies.shape != (n_rows,) or energies.dtype != np.float64:
+            raise ValueError(
+                f"'{path}' holds an array of shape {energies.shape} and dtype "
+                f"{energies.dtype}, expected ({n_rows},) and float64"
+            )
+        return energies
+
+    energies = np.lib.format.open_memmap(
+        path, mode="w+", dtype=np.float64, shape=(n_rows,)
+    )
+    energies[:] = np.nan
+    return energies
+
+
+class _ChunkTask(NamedTuple):
+    i_start: int
+    i_stop: int
+    energies: NDArray[np.float64]
+    """The energies of the chunk, with nan for the rows still to be evaluated."""
+    i_evaluated: NDArray[np.int64]
+    """The rows of the chunk still to be evaluated."""
+    i_unique: NDArray[np.int64]
+    """The rows passed to the potential; one for each distinct key in 'i_evaluated'."""
+    keys: List[bytes]
+
+
+def _prepare_chunk(
+    i_start: int,
+    i_stop: int,
+    gridcoords: NDArray[np.float64],
+    cache: Optional[EnergyCache],
+) -> _ChunkTask:
+    """Look up the energies of a chunk in the cache, and find the rows to evaluate."""
+    energies = np.full(i_stop - i_start, np.nan)
+    i_evaluated = np.arange(i_stop - i_start)
+    if cache is None:
+        return _ChunkTask(i_start, i_stop, energies, i_evaluated, i_evaluated, [])
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        pairdists = get_batch_conversion("grid", "pairdistance")(gridcoords)
+    keys = cache.keys(pairdists)
+    found = cache.get(keys)
+    is_found = np.array([key in found for key in keys], dtype=np.bool_)
+    energies[is_found] = [found[key] for key in keys if key in found]
+
+    # rows with the same key are only evaluated once
+    i_evaluated = np.flatnonzero(~is_found)
+    first_rows: Dict[bytes, int] = {}
+    for i_row in i_evaluated.tolist():
+        first_rows.setdefault(keys[i_row], i_row)
+    i_unique = np.array(list(first_rows.values()), dtype=np.int64)
+
+    return _ChunkTask(i_start, i_stop, energies, i_evaluated, i_unique, keys)
+
+
+def _complete_chunk(
+    task: _ChunkTask, evaluated: NDArray[np.float64], cache: Optional[EnergyCache]
+) -> NDArray[np.float64]:
+    """Fill in the evaluated energies of a chunk, and store them in the cache."""
+    if cache is None:
+        task.energies[task.i_unique] = evaluated
+        return task.energies
+
+    unique_keys = [task.keys[i_row] for i_row in task.i_unique.tolist()]
+    cache.put(unique_keys, evaluated)
+    energy_of_key = dict(zip(unique_keys, evaluated.tolist()))
+    task.energies[task.i_evaluated] = [
+        energy_of_key[task.keys[i_row]] for i_row in task.i_evaluated.tolist()
+    ]
+
+    return task.energies
+
+
+def _create_executor(pool: str, n_workers: int) -> Executor:
+    if pool == "thread":
+        return ThreadPoolExecutor(max_workers=n_workers)
+    if pool == "process":
+        return ProcessPoolExecutor(max_workers=n_workers)
+
+    raise ValueError(f"Unknown pool '{pool}'; expected 'thread' or 'process'")
+
+
+def scan_potential(
+    gridcoords: ArrayLike,
+    potential: Potential,
+    output: PathLike,
+    kind: str = "cartesian",
+    vectorized: bool = False,
+    n_workers: int = 1,
+    pool: str = "thread",
+    chunk_size: int = DEFAULT_SCAN_CHUNK_SIZE,
+    cache: Optional[EnergyCache] = None,
+    resume: bool = True,
+) -> ScanSummary:
+    """
+    Evaluate 'potential' for each row of an (N, 6) array of grid coordinates, converted
+    to coordinates of kind 'kind', and write the energies to the '.npy' file 'output'.
+    The pool is either 'thread' or 'process'. If 'cache' is given, the energies already
+    stored in it are not evaluated again, and the new energies are added to it.
+
+    If 'resume' is True and a checkpoint for the same grid coordinates exists, only the
+    unfinished chunks are evaluated; otherwise the scan starts from the beginning.
+    """
+    check_coordinate_kind(kind)
+    if chunk_size < 1:
+        raise ValueError(f"The chunk size must be positive, found {chunk_size}")
+    if n_workers < 1:
+        raise ValueError(f"At least one worker is needed, found {n_workers}")
+
+    gridcoords = np.ascontiguousarray(gridcoords, dtype=np.float64)
+    if gridcoords.ndim != 2 or gridcoords.shape[1] != 6:
+        raise ValueError(f"Expected an array of shape (N, 6), found {gridcoords.shape}")
+
+    start = time.perf_counter()
+    n_rows = gridcoords.shape[0]
+    output_path = Path(output)
+    header = {
+        "n_rows": n_rows,
+        "chunk_size": chunk_size,
+        "fingerprint": hashlib.sha256(gridcoords.data).hexdigest(),
+    }
+    checkpoint = _Checkpoint(
+        output_path.with_name(output_path.name + CHECKPOINT_SUFFIX),
+        header,
+        resume and output_path.exists(),
+    )
+
+    n_resumed = 0
+    n_evaluated = 0
+    pending: Dict[Future[NDArray[np.float64]], _ChunkTask] = {}
+    max_pending = _PENDING_CHUNKS_PER_WORKER * n_workers
+    executor = _create_executor(pool, n_workers)
+    try:
+        energies = _open_output(output_path, n_rows, checkpoint.is_resumed)
+
+        def write_chunk(i_start: int, i_stop: int, values: NDArray[np.float64]) -> None:
+            energies[i_start:i_stop] = values
+            energies.flush()
+            checkpoint.add(i_start, i_stop)
+
+        def collect_finished() -> None:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                task = pending.pop(future)
+                values = _complete_chunk(task, future.result(), cache)
+                write_chunk(task.i_start, task.i_stop, values)
+
+        for i_start in range(0, n_rows, chunk_size):
+            i_stop = min(i_start + chunk_size, n_rows)
+            if (i_start, i_stop) in checkpoint.finished:
+                n_resumed += i_stop - i_start
+                continue
+
+            task = _prepare_chunk(i_start, i_stop, gridcoords[i_start:i_stop], cache)
+            if task.i_unique.size == 0:
+                write_chunk(i_start, i_stop, task.energies)
+                continue
+
+            rows = gridcoords[i_start:i_stop][task.i_unique]
+            future = executor.submit(_evaluate_chunk, potential, kind, vectorized, rows)
+            pending[future] = task
+            n_evaluated += task.i_unique.size
+
+            while len(pending) >= max_pending:
+                collect_finished()
+
+        while len(pending) > 0:
+            collect_finished()
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+        checkpoint.close()
+
+    n_cached = n_rows - n_resumed - n_evaluated
+    return ScanSummary(
+        n_rows, n_resumed, n_cached, n_evaluated, time.perf_counter() - start
+    )
@@ -0,0 +1,276 @@
+"""
+This module contains methods to select a diverse subset of a large batch of coordinates,
+such as a set of training geometries taken from a pool of candidates.
+
+Both methods add one coordinate at a time, always choosing the coordinate of the pool
+that lies farthest from everything selected so far:
+ - 'farthest_point_sampling()' returns the selected coordinates, in the order they were
+   chosen, and the distance of each one from the coordinates chosen before it
+ - 'greedy_k_center()' treats the selected coordinates as the centres of clusters, and
+   also returns the centre each coordinate of the pool is closest to; the covering
+   radius of its result is at most twice that of the best possible choice of centres
+
+The selection can start from coordinates that were already chosen, either given as rows
+of the pool ('initial_indices') or as coordinates outside the pool ('initial_points'),
+such as an existing training set. It stops once 'n_select' coordinates are chosen, or
+once every coordinate of the pool lies within 'radius' of a chosen coordinate, whichever
+comes first. It also stops early if every coordinate of the pool is already chosen (or
+duplicates a chosen one).
+
+As with the KD-tree in 'frolov.spatial', the coordinates are rows of six values, and the
+distance between two coordinates can weight the squared difference along each axis.
+
+The distance from each coordinate of the pool to the nearest chosen coordinate is kept
+in a single array, and updated after each choice; the distances are calculated in
+chunks of rows, so that the memory used is proportional to the size of the pool.
+"""
+
+from __future__ import annotations
+
+from typing import List
+from typing import NamedTuple
+from typing import Optional
+from typing import Sequence
+from typing import Tuple
+
+import numpy as np
+from numpy.typing import ArrayLike
+from numpy.typing import NDArray
+
+from frolov.spatial import Coordinates
+from frolov.spatial import _as_2d_array
+from frolov.spatial import _axis_scale
+from frolov.stream import DEFAULT_CHUNK_SIZE
+
+# the label of a coordinate whose nearest chosen coordinate is one of 'initial_points'
+_EXTERNAL_LABEL = -1
+
+# the number of rows of the pool, and of initial points, compared at a time when the
+# initial points are added; each block of squared distances takes 32 MB
+_ROW_BLOCK_SIZE = 4096
+_POINT_BLOCK_SIZE = 1024
+
+
+class FarthestPointSelection(NamedTuple):
+    indices: NDArray[np.int64]
+    """The rows of the pool that were chosen, in the order they were chosen."""
+    distances: NDArray[np.float64]
+    """The distance of each chosen row from everything chosen before it."""
+    radius: float
+    """The largest distance between any row of the pool and its nearest chosen row."""
+
+
+class KCenterSelection(NamedTuple):
+    centers: NDArray[np.int64]
+    """The rows of the pool chosen as centres, starting with 'initial_indices'."""
+    assignment: NDArray[np.int64]
+    """
+    For each row of the pool, the position in 'centers' of its nearest centre, or -1 if
+    it lies closer to one of 'initial_points'.
+    """
+    radius: float
+    """The largest distance between any row of the pool and its nearest centre."""
+
+
+class _GreedyState:
+    """
+    The squared distance from each row of the (scaled) pool to the nearest chosen
+    coordinate, and the label of that coordinate.
+
+    The pool is stored one axis at a time (as an array of shape (D, N)), since updating
+    the distances axis by axis over contiguous memory is faster than over rows of six
+    values.
+    """
+
+    def __init__(self, data: NDArray[np.float64], chunk_size: int) -> None:
+        if chunk_size < 1:
+            raise ValueError(f"The chunk size must be positive, found {chunk_size}")
+
+        self.columns = np.ascontiguousarray(data.T)
+        self.n_rows = data.shape[0]
+        self.chunk_size = chunk_size
+        self.min_dist_sq = np.full(self.n_rows, np.inf)
+        self.labels = np.full(self.n_rows, _EXTERNAL_LABEL, dtype=np.int64)
+
+    def add_point(self, point: NDArray[np.float64], label: int) -> None:
+        for i_start in range(0, self.n_rows, self.chunk_size):
+            rows = slice(i_start, i_start + self.chunk_size)
+            dist_sq = np.zeros(self.min_dist_sq[rows].shape)
+            for column, value in zip(self.columns[:, rows], point):
+                sep = column - value
+                sep *= sep
+                dist_sq += sep
+
+            closer = dist_sq < self.min_dist_sq[rows]
+            np.copyto(self.min_dist_sq[rows], dist_sq, where=closer)
+            np.copyto(self.labels[rows], label, where=closer)
+
+    def add_points(self, points: NDArray[np.float64]) -> None:
+        """
+        Add many coordinates at once, all with the external label. The squared distances
+        are expanded as |a|^2 + |b|^2 - 2 a.b, so that each block of rows and points is a
+        single matrix product; |a|^2 is the same for a whole row, and is added after the
+        minimum over the points is found.
+        """
+        minus_twice_points = -2.0 * points.T
+        point_norms = np.einsum("ij,ij->i", points, points)
+
+        for i_start in range(0, self.n_rows, _ROW_BLOCK_SIZE):
+            rows = slice(i_start, i_start + _ROW_BLOCK_SIZE)
+            chunk = self.columns[:, rows].T
+            nearest = np.full(chunk.shape[0], np.inf)
+            for j_start in range(0, points.shape[0], _POINT_BLOCK_SIZE):
+                cols = slice(j_start, j_start + _POINT_BLOCK_SIZE)
+                partial = chunk @ minus_twice_points[:, cols]
+                partial += point_norms[cols]
+                np.minimum(nearest, partial.min(axis=1), out=nearest)
+
+            nearest += np.einsum("ij,ij->i", chunk, chunk)
+            np.maximum(nearest, 0.0, out=nearest)
+            np.minimum(self.min_dist_sq[rows], nearest, out=self.min_dist_sq[rows])
+
+    def choose(self, i_row: int, label: int) -> None:
+        self.add_point(self.columns[:, i_row], label)
+        # the expansion used by 'add_points()' can leave a tiny non-zero distance
+        self.min_dist_sq[i_row] = 0.0
+        self.labels[i_row] = label
+
+
+def _check_stopping_rule(n_select: Optional[int], radius: Optional[float]) -> None:
+    if n_select is None and radius is None:
+        raise ValueError("At least one of 'n_select' and 'radius' must be given")
+    if n_select is not None and n_select < 0:
+        raise ValueError(f"The number to select must be non-negative, found {n_select}")
+    if radius is not None and radius < 0.0:
+        raise ValueError(f"The radius must be non-negative, found {radius}")
+
+
+def _prepare(
+    coords: Coordinates,
+    weights: Optional[ArrayLike],
+    initial_indices: Optional[Sequence[int]],
+    initial_points: Optional[Coordinates],
+    chunk_size: int,
+) -> Tuple[_GreedyState, NDArray[np.int64]]:
+    data = _as_2d_array(coords)
+    scale = _axis_scale(weights, data.shape[1])
+    state = _GreedyState(data * scale, chunk_size)
+
+    if initial_points is not None:
+        points = _as_2d_array(initial_points)
+        if points.shape[1] != data.shape[1]:
+            raise ValueError(
+                f"Expected initial points with {data.shape[1]} columns, found {points.shape[1]}"
+            )
+        state.add_points(points * scale)
+
+    indices = np.asarray(
+        initial_indices if initial_indices is not None else [], dtype=np.int64
+    ).reshape(-1)
+    if np.any((indices < 0) | (indices >= data.shape[0])):
+        raise ValueError(f"The initial indices must lie in [0, {data.shape[0]})")
+    for label, i_row in enumerate(indices):
+        state.choose(int(i_row), label)
+
+    return (state, indices)
+
+
+def _select(
+    state: _GreedyState,
+    n_select: Optional[int],
+    radius: Optional[float],
+    first_row: int,
+    first_label: int,
+) -> Tuple[NDArray[np.int64], NDArray[np.float64]]:
+    """
+    Choose rows, one at a time, until a stopping rule is met. If nothing has been chosen
+    yet, every distance is infinite, and the first row chosen is 'first_row'. Returns
+    the chosen rows and their distances from the rows chosen before them.
+    """
+    radius_sq = radius * radius if radius is not None else -1.0
+    chosen: List[int] = []
+    distances: List[float] = []
+    if state.n_rows == 0:
+        return (np.array(chosen, dtype=np.int64), np.array(distances, dtype=np.float64))
+
+    i_row = first_row if np.isinf(state.min_dist_sq.min()) else None
+    while n_select is None or len(chosen) < n_select:
+        if i_row is None:
+            i_row = int(np.argmax(state.min_dist_sq))
+
+        dist_sq = float(state.min_dist_sq[i_row])
+        if dist_sq <= radius_sq or dist_sq == 0.0:
+            break
+
+        state.choose(i_row, first_label + len(chosen))
+        chosen.append(i_row)
+        distances.append(np.sqrt(dist_sq))
+        i_row = None
+
+    return (np.array(chosen, dtype=np.int64), np.array(distances, dtype=np.float64))
+
+
+def _covering_radius(state: _GreedyState) -> float:
+    if state.min_dist_sq.size == 0:
+        return 0.0
+
+    return float(np.sqrt(state.min_dist_sq.max()))
+
+
+def farthest_point_sampling(
+    coords: Coordinates,
+    n_select: Optional[int] = None,
+    weights: Optional[ArrayLike] = None,
+    initial_indices: Optional[Sequence[int]] = None,
+    initial_points: Optional[Coordinates] = None,
+    radius: Optional[float] = None,
+    start: int = 0,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> FarthestPointSelection:
+    """
+    Choose up to 'n_select' rows of 'coords', each as far as possible from the rows (and
+    initial points) chosen before it. If nothing was chosen beforehand, the first row
+    chosen is 'start'. The 'initial_indices' are not included in the result.
+    """
+    _check_stopping_rule(n_select, radius)
+    state, _ = _prepare(coords, weights, initial_indices, initial_points, chunk_size)
+    if not 0 <= start < max(1, state.n_rows):
+        raise ValueError(f"The start index {start} is out of range")
+
+    indices, distances = _select(state, n_select, radius, start, 0)
+
+    return FarthestPointSelection(indices, distances, _covering_radius(state))
+
+
+def greedy_k_center(
+    coords: Coordinates,
+    k: Optional[int] = None,
+    weights: Optional[ArrayLike] = None,
+    initial_indices: Optional[Sequence[int]] = None,
+    initial_points: Optional[Coordinates] = None,
+    radius: Optional[float] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> KCenterSelection:
+    """
+    Choose up to 'k' rows of 'coords' as cluster centres (in addition to any
+    'initial_indices'), with the greedy 2-approximation to the k-center problem. If
+    nothing was chosen beforehand, the first centre is the row closest to the mean of
+    the pool.
+    """
+    _check_stopping_rule(k, radius)
+    state, centers = _prepare(
+        coords, weights, initial_indices, initial_points, chunk_size
+    )
+
+    first_row = 0
+    if state.n_rows > 0:
+        sep = state.columns - state.columns.mean(axis=1, keepdims=True)
+        first_row = int(np.argmin(np.einsum("ij,ij->j", sep, sep)))
+
+    new_centers, _ = _select(state, k, radius, first_row, centers.size)
+
+    return KCenterSelection(
+        np.concatenate([centers, new_centers]),
+        state.labels.copy(),
+        _covering_radius(state),
+    )
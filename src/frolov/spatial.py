@@ -0,0 +1,285 @@
+"""
+This module contains a KD-tree, used to find the stored coordinates that lie closest to
+a query coordinate without comparing the query against every stored coordinate.
+
+The tree works with any coordinate type that is stored as six values per coordinate
+(grid, perimetric, and pair distance coordinates). The distance between two coordinates
+is the square root of the sum of the squared differences between their elements, which
+is the square root of the value returned by 'grid_distance_squared()',
+'perimetric_distance_squared()' or 'pairdistance_distance_squared()'.
+
+Those functions weight all six elements equally. Since that is not necessarily the
+best choice, the tree accepts an optional weight for each element; the squared
+difference along each axis is multiplied by its weight.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+from typing import List
+from typing import Optional
+from typing import Tuple
+from typing import Union
+
+import numpy as np
+from numpy.typing import ArrayLike
+from numpy.typing import NDArray
+
+from frolov.coordinates.coordinate_batch import CoordinateBatch
+
+Coordinates = Union[CoordinateBatch[Any], ArrayLike]
+
+
+def _as_2d_array(coords: Coordinates) -> NDArray[np.float64]:
+    if isinstance(coords, CoordinateBatch):
+        coords = coords.data
+
+    array = np.asarray(coords, dtype=np.float64)
+    if array.ndim == 1:
+        array = array[np.newaxis, :]
+    if array.ndim != 2:
+        raise ValueError(f"Expected an array of shape (N, D), found {array.shape}")
+
+    return array
+
+
+def _axis_scale(weights: Optional[ArrayLike], n_dims: int) -> NDArray[np.float64]:
+    """
+    The factor to multiply each axis by, so that the plain Euclidean distance between
+    scaled coordinates is the weighted distance between the original coordinates.
+    """
+    if weights is None:
+        return np.ones(n_dims)
+
+    weights = np.asarray(weights, dtype=np.float64)
+    if weights.shape != (n_dims,) or np.any(weights < 0.0):
+        raise ValueError(f"Expected {n_dims} non-negative weights, found {weights}")
+
+    scales: NDArray[np.float64] = np.sqrt(weights)
+    return scales
+
+
+class KDTree:
+    """
+    A KD-tree built over a batch of coordinates, supporting k-nearest-neighbour queries
+    and radius queries. Each query method accepts a single coordinate (a 1D array) or a
+    batch of coordinates (a 2D array, or a CoordinateBatch instance).
+
+    The indices returned by the queries refer to the rows of the batch the tree was
+    built from.
+    """
+
+    def __init__(
+        self,
+        coords: Coordinates,
+        weights: Optional[ArrayLike] = None,
+        leaf_size: int = 32,
+    ) -> None:
+        data = _as_2d_array(coords)
+        if leaf_size < 1:
+            raise ValueError(f"The leaf size must be positive, found {leaf_size}")
+
+        n_dims = data.shape[1]
+        self._scale = _axis_scale(weights, n_dims)
+
+        self._leaf_size = leaf_size
+        self._n_dims = n_dims
+
+        # the tree is built over the scaled coordinates, so that the weighted distance
+        # becomes the plain Euclidean distance
+        scaled = data * self._scale
+        self._indices = np.arange(data.shape[0])
+
+        self._node_start: List[int] = []
+        self._node_stop: List[int] = []
+        self._node_children: List[Tuple[int, int]] = []
+        lower_bounds: List[NDArray[np.float64]] = []
+        upper_bounds: List[NDArray[np.float64]] = []
+
+        self._build(scaled, 0, data.shape[0], lower_bounds, upper_bounds)
+
+        self._points = scaled[self._indices]
+        self._lower = np.array(lower_bounds).reshape(-1, n_dims)
+        self._upper = np.array(upper_bounds).reshape(-1, n_dims)
+
+    def __len__(self) -> int:
+        return self._indices.shape[0]
+
+    def _build(
+        self,
+        scaled: NDArray[np.float64],
+        i_start: int,
+        i_stop: int,
+        lower_bounds: List[NDArray[np.float64]],
+        upper_bounds: List[NDArray[np.float64]],
+    ) -> int:
+        """Create the node holding the points [i_start, i_stop); returns its index."""
+        i_node = len(self._node_start)
+        node_points = scaled[self._indices[i_start:i_stop]]
+
+        self._node_start.append(i_start)
+        self._node_stop.append(i_stop)
+        self._node_children.append((-1, -1))
+        if i_stop > i_start:
+            lower_bounds.append(node_points.min(axis=0))
+            upper_bounds.append(node_points.max(axis=0))
+        else:
+            lower_bounds.append(np.full(self._n_dims, np.inf))
+            upper_bounds.append(np.full(self._n_dims, -np.inf))
+
+        if i_stop - i_start <= self._leaf_size:
+            return i_node
+
+        # split along the axis with the widest spread, at the median
+        split_dim = int(np.argmax(upper_bounds[i_node] - lower_bounds[i_node]))
+        i_middle = (i_stop - i_start) // 2
+        order = np.argpartition(node_points[:, split_dim], i_middle)
+        self._indices[i_start:i_stop] = self._indices[i_start:i_stop][order]
+
+        i_left = self._build(
+            scaled, i_start, i_start + i_middle, lower_bounds, upper_bounds
+        )
+        i_right = self._build(
+            scaled, i_start + i_middle, i_stop, lower_bounds, upper_bounds
+        )
+        self._node_children[i_node] = (i_left, i_right)
+
+        return i_node
+
+    def _min_distance_squared(self, i_node: int, query: NDArray[np.float64]) -> float:
+        """The smallest squared distance between the query and the bounding box of a node."""
+        below = self._lower[i_node] - query
+        above = query - self._upper[i_node]
+        gap = np.maximum(np.maximum(below, above), 0.0)
+        return float(gap @ gap)
+
+    def _leaf_distances_squared(
+        self, i_node: int, query: NDArray[np.float64]
+    ) -> Tuple[NDArray[np.float64], NDArray[np.int64]]:
+        i_start = self._node_start[i_node]
+        i_stop = self._node_stop[i_node]
+        separations = self._points[i_start:i_stop] - query
+
+        return (
+            np.einsum("ij,ij->i", separations, separations),
+            self._indices[i_start:i_stop],
+        )
+
+    def _prepare_queries(self, queries: Coordinates) -> NDArray[np.float64]:
+        queries = _as_2d_array(queries)
+        if queries.shape[1] != self._n_dims:
+            raise ValueError(
+                f"Expected queries with {self._n_dims} elements, found {queries.shape[1]}"
+            )
+
+        return queries * self._scale
+
+    def _query_one(
+        self, query: NDArray[np.float64], k: int
+    ) -> Tuple[NDArray[np.float64], NDArray[np.int64]]:
+        best_dist_sq = np.full(k, np.inf)
+        best_indices = np.full(k, -1, dtype=np.int64)
+
+        stack = [0]
+        while stack:
+            i_node = stack.pop()
+            if self._min_distance_squared(i_node, query) > best_dist_sq[-1]:
+                continue
+
+            i_left, i_right = self._node_children[i_node]
+            if i_left < 0:
+                dist_sq, indices = self._leaf_distances_squared(i_node, query)
+                all_dist_sq = np.concatenate([best_dist_sq, dist_sq])
+                all_indices = np.concatenate([best_indices, indices])
+                order = np.argsort(all_dist_sq, kind="stable")[:k]
+                best_dist_sq = all_dist_sq[order]
+                best_indices = all_indices[order]
+                continue
+
+            # visit the nearer child first; it is pushed onto the stack last
+            left_dist_sq = self._min_distance_squared(i_left, query)
+            right_dist_sq = self._min_distance_squared(i_right, query)
+            if left_dist_sq <= right_dist_sq:
+                stack.extend([i_right, i_left])
+            else:
+                stack.extend([i_left, i_right])
+
+        return np.sqrt(best_dist_sq), best_indices
+
+    def query(
+        self, queries: Coordinates, k: int = 1
+    ) -> Tuple[NDArray[np.float64], NDArray[np.int64]]:
+        """
+        Find the 'k' stored coordinates closest to each query.
+
+        Returns two (M, k) arrays, holding the distances (in increasing order) and the
+        indices of the neighbours of each of the M queries. If fewer than 'k' coordinates
+        are stored, the missing neighbours have a distance of infinity and an index of -1.
+        """
+        if k < 1:
+            raise ValueError(f"The number of neighbours must be positive, found {k}")
+
+        queries = self._prepare_queries(queries)
+
+        distances = np.empty((queries.shape[0], k))
+        indices = np.empty((queries.shape[0], k), dtype=np.int64)
+        for i_query, query in enumerate(queries):
+            distances[i_query], indices[i_query] = self._query_one(query, k)
+
+        return distances, indices
+
+    def _query_radius_one(
+        self, query: NDArray[np.float64], radius_sq: float
+    ) -> Tuple[NDArray[np.float64], NDArray[np.int64]]:
+        found_dist_sq = []
+        found_indices = []
+
+        stack = [0]
+        while stack:
+            i_node = stack.pop()
+            if self._min_distance_squared(i_node, query) > radius_sq:
+                continue
+
+            i_left, i_right = self._node_children[i_node]
+            if i_left < 0:
+                dist_sq, indices = self._leaf_distances_squared(i_node, query)
+                is_inside = dist_sq <= radius_sq
+                found_dist_sq.append(dist_sq[is_inside])
+                found_indices.append(indices[is_inside])
+            else:
+                stack.extend([i_left, i_right])
+
+        if not found_indices:
+            return np.empty(0), np.empty(0, dtype=np.int64)
+
+        dist_sq = np.concatenate(found_dist_sq)
+        indices = np.concatenate(found_indices)
+        order = np.argsort(indices)
+
+        return np.sqrt(dist_sq[order]), indices[order]
+
+    def query_radius(
+        self, queries: Coordinates, radius: float, return_distances: bool = False
+    ) -> List[Any]:
+        """
+        Find all the stored coordinates within a distance of 'radius' of each query.
+
+        Returns a list with one entry per query, holding the indices (in increasing
+        order) of the coordinates found. If 'return_distances' is True, each entry is
+        instead a tuple holding the distances and the indices.
+        """
+        queries = self._prepare_queries(queries)
+
+        results: List[Any] = []
+        for query in queries:
+            distances, indices = self._query_radius_one(query, radius**2)
+            results.append((distances, indices) if return_distances else indices)
+
+        return results
+
+    def count_within(self, queries: Coordinates, radius: float) -> NDArray[np.int64]:
+        """The number of stored coordinates within a distance of 'radius' of each query."""
+        return np.array(
+            [indices.size for indices in self.query_radius(queries, radius)],
+            dtype=np.int64,
+        )
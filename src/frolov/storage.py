@@ -0,0 +1,231 @@
+"""
+This module contains a simple binary file format for storing a large collection of
+coordinates of a single kind, so that it can be shared between many jobs.
+
+Each file holds a fixed-size header, followed by the raw values of the coordinates
+stored as a C-ordered array. The header records:
+ - the kind of coordinate (grid, perimetric, pairdistance, or cartesian)
+ - the names of the fields, in storage order
+ - the dtype of the values
+ - the number of coordinates stored
+
+Because the values are stored in exactly the layout used in memory, a file can be opened
+with 'open_memmap()' without parsing anything; the operating system only reads the
+pages of the file that are actually accessed.
+
+The header is laid out as follows:
+ - the magic string b"FROLOV", followed by two bytes holding the format version
+ - the length of the JSON-encoded header, as a little-endian uint32
+ - the JSON-encoded header, padded with spaces to a total of HEADER_SIZE bytes
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import struct
+from dataclasses import dataclass
+from typing import Any
+from typing import Dict
+from typing import Iterable
+from typing import Literal
+from typing import Tuple
+from typing import Type
+from typing import Union
+
+import numpy as np
+from numpy.typing import DTypeLike
+from numpy.typing import NDArray
+
+from frolov.conversions import check_coordinate_kind
+from frolov.conversions import row_shape
+from frolov.coordinates.cartesian_coordinate import CartesianCoordinateBatch
+from frolov.coordinates.coordinate_batch import CoordinateBatch
+from frolov.coordinates.grid_coordinate import GridCoordinateBatch
+from frolov.coordinates.pairdistance_coordinate import PairDistanceCoordinateBatch
+from frolov.coordinates.perimetric_coordinate import PerimetricCoordinateBatch
+from frolov.precision import DEFAULT_DTYPE
+from frolov.precision import SUPPORTED_DTYPES
+from frolov.precision import resolve_dtype
+
+FILE_SUFFIX = ".frolov"
+HEADER_SIZE = 256
+
+_MAGIC = b"FROLOV"
+_VERSION = b"\x01\x00"
+_PREFIX_SIZE = len(_MAGIC) + len(_VERSION) + 4
+
+BATCH_TYPES: Dict[str, Type[CoordinateBatch[Any]]] = {
+    "grid": GridCoordinateBatch,
+    "perimetric": PerimetricCoordinateBatch,
+    "pairdistance": PairDistanceCoordinateBatch,
+    "cartesian": CartesianCoordinateBatch,
+}
+
+PathLike = Union[str, "os.PathLike[str]"]
+
+# the modes in which 'open_memmap()' can map a file, as in 'numpy.memmap'
+MemmapMode = Literal["r", "r+", "c"]
+
+
+@dataclass(frozen=True)
+class StorageHeader:
+    kind: str
+    fields: Tuple[str, ...]
+    dtype: str
+    count: int
+
+    @property
+    def shape(self) -> Tuple[int, ...]:
+        return (self.count,) + row_shape(self.kind)
+
+    def to_bytes(self) -> bytes:
+        contents = {
+            "kind": self.kind,
+            "fields": list(self.fields),
+            "dtype": self.dtype,
+            "count": self.count,
+        }
+        encoded = json.dumps(contents).encode("utf-8")
+        n_padding = HEADER_SIZE - _PREFIX_SIZE - len(encoded)
+        if n_padding < 0:
+            raise ValueError("The header does not fit into the reserved space")
+
+        prefix = _MAGIC + _VERSION + struct.pack("<I", len(encoded))
+        return prefix + encoded + b" " * n_padding
+
+    @classmethod
+    def from_bytes(cls, header: bytes) -> StorageHeader:
+        if len(header) < HEADER_SIZE or not header.startswith(_MAGIC):
+            raise ValueError("The file is not a frolov coordinate file")
+
+        version = header[len(_MAGIC) : len(_MAGIC) + len(_VERSION)]
+        if version != _VERSION:
+            raise ValueError(f"Unsupported frolov file format version: {version!r}")
+
+        (n_encoded,) = struct.unpack("<I", header[_PREFIX_SIZE - 4 : _PREFIX_SIZE])
+        contents = json.loads(header[_PREFIX_SIZE : _PREFIX_SIZE + n_encoded])
+
+        return cls(
+            kind=contents["kind"],
+            fields=tuple(contents["fields"]),
+            dtype=contents["dtype"],
+            count=contents["count"],
+        )
+
+
+def _make_header(kind: str, dtype: np.dtype[Any], count: int) -> StorageHeader:
+    check_coordinate_kind(kind)
+    fields = BATCH_TYPES[kind]._fields
+
+    return StorageHeader(kind, fields, np.dtype(dtype).str, count)
+
+
+def save(
+    path: PathLike,
+    coords: CoordinateBatch[Any] | NDArray[np.float64],
+    kind: str | None = None,
+    dtype: DTypeLike | None = None,
+) -> None:
+    """
+    Write a batch of coordinates to the file at 'path'. The kind of coordinate must be
+    given if 'coords' is a plain array instead of a CoordinateBatch instance.
+
+    The values are stored with the given dtype; by default, float32 and float64 values
+    keep their dtype, and anything else is stored as float64.
+    """
+    if isinstance(coords, CoordinateBatch):
+        kind = coords.kind if kind is None else kind
+        data = coords.data
+    elif kind is None:
+        raise ValueError("The kind of coordinate must be given when saving an array")
+    else:
+        data = np.asarray(coords)
+
+    if dtype is None:
+        dtype = data.dtype if data.dtype in SUPPORTED_DTYPES else DEFAULT_DTYPE
+
+    with CoordinateWriter(path, kind, dtype=resolve_dtype(dtype)) as writer:
+        writer.write(data)
+
+
+def read_header(path: PathLike) -> StorageHeader:
+    with open(path, "rb") as fin:
+        return StorageHeader.from_bytes(fin.read(HEADER_SIZE))
+
+
+def open_memmap(path: PathLike, mode: MemmapMode = "r") -> CoordinateBatch[Any]:
+    """
+    Open the file at 'path' as a batch of coordinates of the kind recorded in its header.
+
+    The batch wraps a memory-mapped view of the file; nothing is read from the file until
+    it is accessed. The coordinates are not checked against their constraints, either
+    here or when they were written ('save()' and 'CoordinateWriter' store arrays as
+    given); callers that need the check can pass 'batch.data' to the matching
+    'validate_*_batch()' function in 'frolov.validation'.
+    """
+    header = read_header(path)
+    batch_type = BATCH_TYPES[header.kind]
+
+    if header.count == 0:
+        data = np.empty(header.shape, dtype=header.dtype)
+    else:
+        data = np.memmap(
+            path,
+            dtype=np.dtype(header.dtype),
+            mode=mode,
+            offset=HEADER_SIZE,
+            shape=header.shape,
+        )
+
+    return batch_type._wrap(data)
+
+
+class CoordinateWriter:
+    """
+    Write coordinates to a file one chunk at a time, so that collections that are too
+    large to hold in memory can be saved. The header is rewritten with the final count
+    when the writer is closed.
+    """
+
+    def __init__(
+        self, path: PathLike, kind: str, dtype: np.dtype[Any] | type = np.float64
+    ) -> None:
+        self._kind = kind
+        self._dtype = np.dtype(dtype)
+        self._count = 0
+        self._shape = row_shape(kind)
+        self._fout = open(path, "wb")
+        self._fout.write(_make_header(kind, self._dtype, 0).to_bytes())
+
+    @property
+    def count(self) -> int:
+        return self._count
+
+    def write(self, chunk: NDArray[np.float64]) -> None:
+        chunk = np.ascontiguousarray(chunk, dtype=self._dtype)
+        if chunk.shape[1:] != self._shape:
+            raise ValueError(
+                f"Expected {self._kind} coordinates of shape {('N',) + self._shape}, found {chunk.shape}"
+            )
+
+        self._fout.write(chunk.tobytes())
+        self._count += chunk.shape[0]
+
+    def write_all(self, chunks: Iterable[NDArray[np.float64]]) -> None:
+        for chunk in chunks:
+            self.write(chunk)
+
+    def close(self) -> None:
+        if self._fout.closed:
+            return
+
+        self._fout.seek(0)
+        self._fout.write(_make_header(self._kind, self._dtype, self._count).to_bytes())
+        self._fout.close()
+
+    def __enter__(self) -> CoordinateWriter:
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
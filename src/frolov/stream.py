@@ -0,0 +1,151 @@
+"""
+This module contains a generator-based pipeline that converts collections of coordinates
+that are too large to hold in memory all at once.
+
+The coordinates are pulled from the source in chunks of at most 'chunk_size' rows, each
+chunk is converted with the batched conversions in 'frolov.conversions', and the
+converted chunk is yielded before the next chunk is read. The peak memory used is
+proportional to the chunk size, and not to the size of the source.
+
+The source can be:
+ - an array (or a memory-mapped array) holding all the coordinates
+ - an iterable of rows, where each row holds the values of a single coordinate
+ - the path to a '.npy' file, or a '.frolov' file written by 'frolov.storage'; the
+   file is memory-mapped, and not loaded all at once
+ - the path to a text file with one coordinate per row; the values are separated by
+   commas in '.csv' files, and by whitespace otherwise
+
+In text files and row iterables, a Cartesian coordinate is written as a flat row of 12
+values (x0, y0, z0, x1, ..., z3). Arrays of Cartesian coordinates can have the shape
+(N, 4, 3) or (N, 12), and arrays of any other kind must have the shape (N, 6); a
+one-dimensional array holds a single coordinate. Any other shape is rejected, rather
+than having its values rearranged into rows.
+"""
+
+from __future__ import annotations
+
+import itertools
+import os
+from pathlib import Path
+from typing import Any
+from typing import Iterable
+from typing import Iterator
+from typing import Tuple
+from typing import Union
+
+import numpy as np
+from numpy.typing import NDArray
+
+from frolov.conversions import get_batch_conversion
+from frolov.conversions import row_shape
+from frolov.storage import FILE_SUFFIX
+from frolov.storage import open_memmap
+
+DEFAULT_CHUNK_SIZE = 65536
+
+Source = Union[NDArray[np.float64], Iterable[Any], str, "os.PathLike[str]"]
+
+
+def convert(
+    source: Source,
+    from_: str,
+    to: str,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Iterator[NDArray[np.float64]]:
+    """
+    Convert the coordinates in 'source' from kind 'from_' to kind 'to', and yield the
+    results one chunk at a time. The coordinate kinds are named as in
+    'frolov.conversions.COORDINATE_KINDS'.
+    """
+    conversion = get_batch_conversion(from_, to)
+
+    for chunk in iter_chunks(source, from_, chunk_size):
+        yield conversion(chunk)
+
+
+def iter_chunks(
+    source: Source, kind: str, chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> Iterator[NDArray[np.float64]]:
+    """
+    Yield the coordinates of kind 'kind' held in 'source', as arrays of at most
+    'chunk_size' coordinates.
+    """
+    if chunk_size < 1:
+        raise ValueError(f"The chunk size must be positive, found {chunk_size}")
+
+    shape = row_shape(kind)
+
+    if isinstance(source, (str, os.PathLike)):
+        yield from _iter_file_chunks(Path(source), kind, chunk_size)
+    elif isinstance(source, np.ndarray):
+        yield from _iter_array_chunks(source, shape, chunk_size)
+    else:
+        yield from _iter_row_chunks(iter(source), shape, chunk_size)
+
+
+def _reshape_chunk(
+    chunk: NDArray[np.float64], shape: Tuple[int, ...]
+) -> NDArray[np.float64]:
+    """
+    Arrange a chunk of coordinates into the shape (N,) + 'shape'; each coordinate in the
+    chunk must already have that shape, or be flattened into a single row of values.
+    """
+    n_values = int(np.prod(shape))
+    chunk = np.asarray(chunk, dtype=np.float64)
+    if chunk.ndim < 2 or chunk.shape[1:] not in (shape, (n_values,)):
+        raise ValueError(
+            f"Expected coordinates of shape {shape} or rows of {n_values} values, "
+            f"found a chunk of shape {chunk.shape}"
+        )
+
+    return chunk.reshape((-1,) + shape)
+
+
+def _iter_array_chunks(
+    array: NDArray[Any], shape: Tuple[int, ...], chunk_size: int
+) -> Iterator[NDArray[np.float64]]:
+    # a one-dimensional array holds a single coordinate
+    if array.ndim == 1:
+        array = array.reshape(1, -1)
+
+    for i_start in range(0, array.shape[0], chunk_size):
+        yield _reshape_chunk(array[i_start : i_start + chunk_size], shape)
+
+
+def _iter_row_chunks(
+    rows: Iterator[Any], shape: Tuple[int, ...], chunk_size: int
+) -> Iterator[NDArray[np.float64]]:
+    while True:
+        chunk = list(itertools.islice(rows, chunk_size))
+        if len(chunk) == 0:
+            return
+
+        yield _reshape_chunk(np.array(chunk, dtype=np.float64), shape)
+
+
+def _iter_file_chunks(
+    path: Path, kind: str, chunk_size: int
+) -> Iterator[NDArray[np.float64]]:
+    shape = row_shape(kind)
+
+    if path.suffix == FILE_SUFFIX:
+        batch = open_memmap(path)
+        if batch.kind != kind:
+            raise ValueError(f"'{path}' holds {batch.kind} coordinates, not {kind}")
+        yield from _iter_array_chunks(batch.data, shape, chunk_size)
+        return
+
+    if path.suffix == ".npy":
+        yield from _iter_array_chunks(np.load(path, mmap_mode="r"), shape, chunk_size)
+        return
+
+    delimiter = "," if path.suffix == ".csv" else None
+    with open(path, "r") as fin:
+        while True:
+            lines = list(itertools.islice(fin, chunk_size))
+            if len(lines) == 0:
+                return
+
+            values = np.loadtxt(lines, delimiter=delimiter, ndmin=2)
+            if values.size > 0:
+                yield _reshape_chunk(values, shape)
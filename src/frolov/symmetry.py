@@ -0,0 +1,328 @@
+"""
+This module deals with the symmetry of a four-body geometry under relabelling of its
+particles.
+
+If all four particles are identical, each of the 4! = 24 ways of labelling them
+describes the same physical geometry. However, each labelling gives a different
+PairDistanceCoordinate (and hence a different PerimetricCoordinate, GridCoordinate,
+etc.) for that geometry.
+
+To recognize permuted copies of the same geometry, each geometry is mapped to a
+canonical labelling; we choose the labelling whose six pair distances, in the order
+(r01, r02, r03, r12, r13, r23), are lexicographically smallest. Two geometries are
+permuted copies of one another exactly when their canonical pair distances are equal.
+"""
+
+from __future__ import annotations
+
+import itertools
+from typing import Dict
+from typing import Iterator
+from typing import List
+from typing import Set
+from typing import Tuple
+
+import numpy as np
+from numpy.typing import NDArray
+
+from frolov.conversions import pairdistance_to_perimetric_batch
+from frolov.conversions import perimetric_to_pairdistance_batch
+
+PAIRS = ((0, 1), (0, 2), (0, 3), (1, 2), (1, 3), (2, 3))
+
+# PERMUTATIONS[i][j] is the original label of the particle that is given the label 'j'
+# under the i-th permutation; the identity permutation comes first
+PERMUTATIONS = tuple(itertools.permutations(range(4)))
+
+
+def _pair_column(i0: int, i1: int) -> int:
+    return PAIRS.index((min(i0, i1), max(i0, i1)))
+
+
+# PERMUTATION_COLUMNS[i] holds the columns of the original pair distances that become
+# the columns (r01, r02, r03, r12, r13, r23) under the i-th permutation
+PERMUTATION_COLUMNS = np.array(
+    [[_pair_column(perm[i0], perm[i1]) for (i0, i1) in PAIRS] for perm in PERMUTATIONS]
+)
+
+_CANONICALIZATION_CHUNK_SIZE = 16384
+
+
+def permute_pairdistance_batch(
+    pairdists: NDArray[np.float64], permutation: Tuple[int, ...]
+) -> NDArray[np.float64]:
+    """
+    Relabel the particles of each geometry in an (N, 6) array of pair distances. The
+    particle with the original label 'permutation[j]' is given the new label 'j'.
+    """
+    i_perm = PERMUTATIONS.index(tuple(permutation))
+    return np.asarray(pairdists)[:, PERMUTATION_COLUMNS[i_perm]]
+
+
+def _canonicalize_chunk(
+    pairdists: NDArray[np.float64], atol: float
+) -> Tuple[NDArray[np.float64], NDArray[np.int64]]:
+    n_rows = pairdists.shape[0]
+    permuted = pairdists[:, PERMUTATION_COLUMNS]
+
+    # keep narrowing down the permutations that are (within 'atol') lexicographically
+    # smallest, one column at a time
+    candidates = np.ones((n_rows, len(PERMUTATIONS)), dtype=np.bool_)
+    for i_column in range(6):
+        values = permuted[:, :, i_column]
+        minimum = np.min(np.where(candidates, values, np.inf), axis=1, keepdims=True)
+        candidates &= values <= minimum + atol
+
+    i_perms = np.argmax(candidates, axis=1)
+    canonical = permuted[np.arange(n_rows), i_perms]
+
+    return canonical, i_perms
+
+
+def canonicalize_pairdistance_batch(
+    pairdists: NDArray[np.float64], atol: float = 0.0
+) -> Tuple[NDArray[np.float64], NDArray[np.int64]]:
+    """
+    Map each row of an (N, 6) array of pair distances to its canonical labelling.
+
+    Returns the canonical pair distances, and the index (into PERMUTATIONS) of the
+    permutation that produced them.
+
+    Pair distances that differ by no more than 'atol' are treated as equal when choosing
+    the lexicographically smallest labelling; this keeps the choice of labelling stable
+    when some of the pair distances are equal up to round-off error.
+    """
+    pairdists = np.asarray(pairdists, dtype=np.float64)
+    if pairdists.ndim != 2 or pairdists.shape[1] != 6:
+        raise ValueError(f"Expected an array of shape (N, 6), found {pairdists.shape}")
+
+    canonical = np.empty_like(pairdists)
+    i_perms = np.empty(pairdists.shape[0], dtype=np.int64)
+    for i_start in range(0, pairdists.shape[0], _CANONICALIZATION_CHUNK_SIZE):
+        i_stop = i_start + _CANONICALIZATION_CHUNK_SIZE
+        chunk_canonical, chunk_perms = _canonicalize_chunk(
+            pairdists[i_start:i_stop], atol
+        )
+        canonical[i_start:i_stop] = chunk_canonical
+        i_perms[i_start:i_stop] = chunk_perms
+
+    return canonical, i_perms
+
+
+def canonicalize_perimetric_batch(
+    perimetrics: NDArray[np.float64], atol: float = 0.0
+) -> Tuple[NDArray[np.float64], NDArray[np.int64]]:
+    """
+    The perimetric counterpart of 'canonicalize_pairdistance_batch()'; the canonical
+    labelling is still chosen using the pair distances.
+    """
+    pairdists = perimetric_to_pairdistance_batch(perimetrics)
+    canonical, i_perms = canonicalize_pairdistance_batch(pairdists, atol)
+
+    return pairdistance_to_perimetric_batch(canonical), i_perms
+
+
+def _smaller_labellings_chunk(pairdists: NDArray[np.float64]) -> NDArray[np.bool_]:
+    permuted = pairdists[:, PERMUTATION_COLUMNS]
+
+    # the first column in which a labelling differs from the row decides whether it is
+    # smaller; 'undecided' marks the labellings that have matched the row so far
+    smaller = np.zeros(permuted.shape[:2], dtype=np.bool_)
+    undecided = np.ones(permuted.shape[:2], dtype=np.bool_)
+    for i_column in range(6):
+        values = permuted[:, :, i_column]
+        row_values = pairdists[:, i_column, np.newaxis]
+        smaller |= undecided & (values < row_values)
+        undecided &= values == row_values
+
+    return smaller
+
+
+def smaller_labellings_pairdistance_batch(
+    pairdists: NDArray[np.float64],
+) -> NDArray[np.bool_]:
+    """
+    For each row of an (N, 6) array of pair distances, find the labellings (in the order
+    of PERMUTATIONS) whose pair distances are lexicographically smaller than those of
+    the row itself. Returns an (N, 24) boolean array.
+    """
+    pairdists = np.asarray(pairdists, dtype=np.float64)
+    if pairdists.ndim != 2 or pairdists.shape[1] != 6:
+        raise ValueError(f"Expected an array of shape (N, 6), found {pairdists.shape}")
+
+    smaller = np.empty((pairdists.shape[0], len(PERMUTATIONS)), dtype=np.bool_)
+    for i_start in range(0, pairdists.shape[0], _CANONICALIZATION_CHUNK_SIZE):
+        i_stop = i_start + _CANONICALIZATION_CHUNK_SIZE
+        smaller[i_start:i_stop] = _smaller_labellings_chunk(pairdists[i_start:i_stop])
+
+    return smaller
+
+
+def is_canonical_pairdistance_batch(
+    pairdists: NDArray[np.float64],
+) -> NDArray[np.bool_]:
+    """
+    Check which rows of an (N, 6) array of pair distances are already in their canonical
+    labelling; this is faster than comparing against 'canonicalize_pairdistance_batch()'.
+    """
+    smaller = smaller_labellings_pairdistance_batch(pairdists)
+    return np.asarray(~np.any(smaller, axis=1), dtype=np.bool_)
+
+
+class DeduplicationIndex:
+    """
+    Keep track of the distinct geometries seen so far, up to relabelling of particles.
+
+    Two geometries are considered duplicates if the Euclidean distance between the pair
+    distances of some labelling of one and those of the other is no greater than
+    'tolerance'.
+
+    The canonical pair distances are hashed into cells of a grid, so that each query only
+    needs to compare against the few stored geometries in the neighbouring cells. When
+    some pair distances are within about 'tolerance' of one another, two nearly equal
+    geometries can have different canonical labellings; so every labelling of a queried
+    geometry is compared, and not just its canonical one.
+    """
+
+    # the width of each cell, in units of the tolerance; a wider cell means fewer
+    # neighbouring cells need to be checked, but more geometries are held in each cell
+    _CELL_WIDTH_FACTOR = 8.0
+
+    def __init__(self, tolerance: float) -> None:
+        if not tolerance > 0.0:
+            raise ValueError(f"The tolerance must be positive, found {tolerance}")
+
+        self._tolerance = tolerance
+        self._cell_width = tolerance * self._CELL_WIDTH_FACTOR
+        self._cells: Dict[Tuple[int, ...], List[int]] = {}
+        self._canonical = np.empty((0, 6), dtype=np.float64)
+        self._size = 0
+
+    @property
+    def tolerance(self) -> float:
+        return self._tolerance
+
+    @property
+    def canonical(self) -> NDArray[np.float64]:
+        """The canonical pair distances of the distinct geometries, in insertion order."""
+        return self._canonical[: self._size]
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _neighbour_keys(
+        self, lower: NDArray[np.int64], upper: NDArray[np.int64]
+    ) -> Iterator[Tuple[int, ...]]:
+        ranges = [range(lo, hi + 1) for (lo, hi) in zip(lower.tolist(), upper.tolist())]
+        return itertools.product(*ranges)
+
+    def _find(
+        self,
+        labellings: NDArray[np.float64],
+        lower: NDArray[np.int64],
+        upper: NDArray[np.int64],
+    ) -> bool:
+        """
+        Check whether any of the (M, 6) labellings of a geometry lies within the
+        tolerance of a stored geometry; 'lower' and 'upper' hold the range of cells to
+        search around each labelling.
+        """
+        keys: Set[Tuple[int, ...]] = set()
+        for labelling_lower, labelling_upper in zip(lower, upper):
+            keys.update(self._neighbour_keys(labelling_lower, labelling_upper))
+
+        for key in keys:
+            indices = self._cells.get(key)
+            if indices is None:
+                continue
+
+            separations = self._canonical[indices] - labellings[:, np.newaxis, :]
+            if np.any(
+                np.einsum("ijk,ijk->ij", separations, separations) <= self._tolerance**2
+            ):
+                return True
+
+        return False
+
+    def _append(self, canonical_row: NDArray[np.float64], key: Tuple[int, ...]) -> None:
+        if self._size == self._canonical.shape[0]:
+            capacity = max(1024, 2 * self._size)
+            grown = np.empty((capacity, 6), dtype=np.float64)
+            grown[: self._size] = self._canonical[: self._size]
+            self._canonical = grown
+
+        self._canonical[self._size] = canonical_row
+        self._cells.setdefault(key, []).append(self._size)
+        self._size += 1
+
+    def _prepare(self, pairdists: NDArray[np.float64]) -> Tuple[
+        NDArray[np.float64],
+        NDArray[np.int64],
+        NDArray[np.float64],
+        NDArray[np.bool_],
+        NDArray[np.int64],
+        NDArray[np.int64],
+    ]:
+        canonical, _ = canonicalize_pairdistance_batch(pairdists, atol=self._tolerance)
+        keys = np.floor(canonical / self._cell_width).astype(np.int64)
+
+        # the range of cells to search around every labelling of each geometry
+        labellings = canonical[:, PERMUTATION_COLUMNS]
+        lower = np.floor((labellings - self._tolerance) / self._cell_width).astype(
+            np.int64
+        )
+        upper = np.floor((labellings + self._tolerance) / self._cell_width).astype(
+            np.int64
+        )
+
+        # the first pair distance of a stored (canonical) labelling is within the
+        # tolerance of its smallest, so only the labellings whose first pair distance is
+        # within three times the tolerance of their smallest can be close enough to it
+        smallest = np.min(canonical, axis=1, keepdims=True)
+        is_candidate = labellings[:, :, 0] <= smallest + 3.0 * self._tolerance
+
+        return canonical, keys, labellings, is_candidate, lower, upper
+
+    def contains(self, pairdists: NDArray[np.float64]) -> NDArray[np.bool_]:
+        """Check which rows of an (N, 6) array of pair distances are already stored."""
+        _, _, labellings, is_candidate, lower, upper = self._prepare(pairdists)
+
+        return np.array(
+            [
+                self._find(rows[mask], lo[mask], hi[mask])
+                for (rows, mask, lo, hi) in zip(labellings, is_candidate, lower, upper)
+            ],
+            dtype=np.bool_,
+        )
+
+    def add(self, pairdists: NDArray[np.float64]) -> NDArray[np.bool_]:
+        """
+        Add the rows of an (N, 6) array of pair distances that are not duplicates of any
+        stored geometry (or of any earlier row of the same array).
+
+        Returns True for each row that was new, and was added.
+        """
+        canonical, keys, labellings, is_candidate, lower, upper = self._prepare(
+            pairdists
+        )
+
+        is_new = np.zeros(canonical.shape[0], dtype=np.bool_)
+        for i_row in range(canonical.shape[0]):
+            mask = is_candidate[i_row]
+            rows = labellings[i_row, mask]
+            if not self._find(rows, lower[i_row, mask], upper[i_row, mask]):
+                self._append(canonical[i_row], tuple(keys[i_row].tolist()))
+                is_new[i_row] = True
+
+        return is_new
+
+
+def deduplicate_pairdistance_batch(
+    pairdists: NDArray[np.float64], tolerance: float
+) -> NDArray[np.int64]:
+    """
+    Find the indices of the rows of an (N, 6) array of pair distances that remain after
+    removing permuted duplicates; the first occurrence of each geometry is kept.
+    """
+    index = DeduplicationIndex(tolerance)
+    return np.flatnonzero(index.add(pairdists))
@@ -0,0 +1,236 @@
+"""
+This module contains a tensor-product grid of GridCoordinate instances, which is never
+stored in full.
+
+A scan over a potential energy surface often uses every combination of a set of nodes
+along each of the six grid axes. Such a grid can be far too large to hold in memory (a
+grid of 30 nodes per axis holds 30^6 = 729 million coordinates), but each of its points
+is easily calculated from its index.
+
+The points are numbered in C order; the index along the last axis (grid_w3) changes
+fastest. A point is identified either by its flat index in [0, len(grid)), or by its
+six per-axis indices.
+
+Each axis must satisfy the grid constraints, and so every point of the grid does too.
+Contiguous ranges of points can be created as GridCoordinateBatch instances, and the
+grid can be split into ranges of flat indices to be handed out to different workers.
+"""
+
+from __future__ import annotations
+
+import math
+from typing import Iterator
+from typing import List
+from typing import Optional
+from typing import Sequence
+from typing import Tuple
+
+import numpy as np
+from numpy.typing import ArrayLike
+from numpy.typing import NDArray
+
+from frolov.coordinates.grid_coordinate import GridCoordinate
+from frolov.coordinates.grid_coordinate import GridCoordinateBatch
+from frolov.sampling import GridBounds
+from frolov.stream import DEFAULT_CHUNK_SIZE
+
+AXIS_NAMES = ("grid_u1", "grid_u2", "grid_u3", "grid_t3", "grid_s3", "grid_w3")
+
+
+def _as_axis(nodes: ArrayLike, name: str) -> NDArray[np.float64]:
+    axis = np.array(nodes, dtype=np.float64).reshape(-1)
+    if axis.size == 0:
+        raise ValueError(f"The axis '{name}' has no nodes")
+    if not np.all(np.isfinite(axis)) or np.any(np.diff(axis) <= 0.0):
+        raise ValueError(
+            f"The nodes of the axis '{name}' must be finite and increasing"
+        )
+
+    axis.setflags(write=False)
+    return axis
+
+
+class TensorGrid:
+    """
+    The grid of all GridCoordinate instances whose six values are taken from the given
+    per-axis nodes.
+    """
+
+    def __init__(
+        self,
+        grid_u1: ArrayLike,
+        grid_u2: ArrayLike,
+        grid_u3: ArrayLike,
+        grid_t3: ArrayLike,
+        grid_s3: ArrayLike,
+        grid_w3: ArrayLike,
+    ) -> None:
+        nodes = (grid_u1, grid_u2, grid_u3, grid_t3, grid_s3, grid_w3)
+        self._axes = tuple(
+            _as_axis(axis, name) for (axis, name) in zip(nodes, AXIS_NAMES)
+        )
+        self._shape = tuple(axis.size for axis in self._axes)
+        self._size = math.prod(self._shape)
+
+        # raises a ValueError if any of the axes leave the region allowed by the grid
+        # constraints
+        self._bounds = GridBounds(
+            *[(float(axis[0]), float(axis[-1])) for axis in self._axes]
+        )
+
+    @classmethod
+    def from_bounds(
+        cls, bounds: GridBounds, n_nodes: int | Sequence[int]
+    ) -> TensorGrid:
+        """Create a grid of evenly spaced nodes that span the bounds along each axis."""
+        if isinstance(n_nodes, int):
+            n_nodes = (n_nodes,) * len(AXIS_NAMES)
+
+        axes = [
+            np.linspace(lower, upper, n)
+            for (lower, upper, n) in zip(bounds.lower, bounds.upper, n_nodes)
+        ]
+        return cls(*axes)
+
+    @property
+    def axes(self) -> Tuple[NDArray[np.float64], ...]:
+        return self._axes
+
+    @property
+    def shape(self) -> Tuple[int, ...]:
+        return self._shape
+
+    @property
+    def bounds(self) -> GridBounds:
+        return self._bounds
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __repr__(self) -> str:
+        return f"TensorGrid(shape={self._shape})"
+
+    def _check_index(self, index: int) -> int:
+        index = int(index)
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError(
+                f"Index {index} is out of range for a grid of {self._size} points"
+            )
+
+        return index
+
+    def unravel(self, index: int) -> Tuple[int, ...]:
+        """The six per-axis indices of the point with the given flat index."""
+        index = self._check_index(index)
+
+        multi_index = []
+        for n_nodes in reversed(self._shape):
+            index, axis_index = divmod(index, n_nodes)
+            multi_index.append(axis_index)
+
+        return tuple(reversed(multi_index))
+
+    def ravel(self, multi_index: Sequence[int]) -> int:
+        """The flat index of the point with the given six per-axis indices."""
+        if len(multi_index) != len(self._shape):
+            raise ValueError(
+                f"Expected {len(self._shape)} indices, found {len(multi_index)}"
+            )
+
+        index = 0
+        for axis_index, n_nodes in zip(multi_index, self._shape):
+            if not 0 <= axis_index < n_nodes:
+                raise IndexError(
+                    f"Axis index {axis_index} is out of range for {n_nodes} nodes"
+                )
+            index = index * n_nodes + int(axis_index)
+
+        return index
+
+    def coordinate(self, index: int) -> GridCoordinate:
+        """The point with the given flat index."""
+        multi_index = self.unravel(index)
+        values = [float(axis[i]) for (axis, i) in zip(self._axes, multi_index)]
+
+        return GridCoordinate(*values)
+
+    def index_of(self, coord: GridCoordinate) -> int:
+        """
+        The flat index of a coordinate that lies exactly on the grid; raises a ValueError
+        if it does not.
+        """
+        multi_index = []
+        for axis, value, name in zip(self._axes, coord.unpack(), AXIS_NAMES):
+            axis_index = int(np.searchsorted(axis, value))
+            if axis_index == axis.size or axis[axis_index] != value:
+                raise ValueError(
+                    f"The value {value} of '{name}' is not a node of the grid"
+                )
+            multi_index.append(axis_index)
+
+        return self.ravel(multi_index)
+
+    def values(self, i_start: int, i_stop: int) -> NDArray[np.float64]:
+        """
+        The points with flat indices in [i_start, i_stop), as an (N, 6) array. Only the
+        requested points are created.
+        """
+        i_start, i_stop, _ = slice(i_start, i_stop).indices(self._size)
+        indices = np.arange(i_start, max(i_start, i_stop), dtype=np.int64)
+        multi_indices = np.unravel_index(indices, self._shape)
+
+        values = np.empty((indices.size, len(self._axes)), dtype=np.float64)
+        for i_axis, (axis, axis_indices) in enumerate(zip(self._axes, multi_indices)):
+            values[:, i_axis] = axis[axis_indices]
+
+        return values
+
+    def batch(self, i_start: int, i_stop: int) -> GridCoordinateBatch:
+        """The points with flat indices in [i_start, i_stop), as a GridCoordinateBatch."""
+        # every point satisfies the grid constraints, since every axis does
+        return GridCoordinateBatch._wrap(self.values(i_start, i_stop))
+
+    def __getitem__(self, index: int | slice) -> GridCoordinate | GridCoordinateBatch:
+        if isinstance(index, slice):
+            if index.step not in (None, 1):
+                raise ValueError("Only contiguous slices of the grid can be created")
+            return self.batch(*index.indices(self._size)[:2])
+
+        return self.coordinate(index)
+
+    def iter_batches(
+        self,
+        batch_size: int = DEFAULT_CHUNK_SIZE,
+        indices: Optional[range] = None,
+    ) -> Iterator[NDArray[np.float64]]:
+        """
+        Yield the points of the grid (or of the range of flat indices 'indices'), as
+        (N, 6) arrays of at most 'batch_size' points.
+        """
+        if batch_size < 1:
+            raise ValueError(f"The batch size must be positive, found {batch_size}")
+
+        indices = indices if indices is not None else range(self._size)
+        for i_start in range(indices.start, indices.stop, batch_size):
+            yield self.values(i_start, min(i_start + batch_size, indices.stop))
+
+    def shard(self, i_shard: int, n_shards: int) -> range:
+        """
+        The range of flat indices of the 'i_shard'-th of 'n_shards' contiguous shards of
+        the grid. The shards cover the grid, and differ in size by at most one point.
+        """
+        if not 0 <= i_shard < n_shards:
+            raise ValueError(f"Expected 0 <= i_shard < {n_shards}, found {i_shard}")
+
+        return range(
+            i_shard * self._size // n_shards, (i_shard + 1) * self._size // n_shards
+        )
+
+    def shards(self, n_shards: int) -> List[range]:
+        return [self.shard(i_shard, n_shards) for i_shard in range(n_shards)]
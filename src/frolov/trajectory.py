@@ -0,0 +1,205 @@
+"""
+This module contains readers for trajectories of four-particle geometries, such as the
+output of a molecular dynamics or path integral simulation, and a pipeline that turns
+the frames of a trajectory into perimetric (or any other) coordinates.
+
+A trajectory can be stored as:
+ - an XYZ text file ('.xyz'); each frame is a line holding the number of atoms (which
+   must be 4), a comment line, and one line per atom holding its symbol followed by its
+   x, y and z positions; any further columns on an atom line (such as velocities or
+   forces in the extended XYZ format) are ignored
+ - a '.npy' file holding an array of shape (n_frames, 4, 3), which is memory-mapped
+ - a raw binary file holding the positions of each frame in turn, as 12 values in the
+   order (x0, y0, z0, x1, ..., z3), with no padding between frames; the type of the
+   values (float64 by default), and the size of any header to skip, must be given
+
+As with the pipeline in 'frolov.stream', the frames are read in chunks of at most
+'chunk_size' frames, and each chunk is returned as a single array of shape (N, 4, 3).
+The lines of an XYZ file are parsed a whole chunk at a time, rather than one frame at a
+time, and the conversions are carried out with the batched conversions of
+'frolov.conversions', so no object is created for any single frame. The memory used is
+proportional to the chunk size, and not to the length of the trajectory.
+"""
+
+from __future__ import annotations
+
+import itertools
+import os
+from pathlib import Path
+from typing import Iterator
+from typing import List
+from typing import Optional
+from typing import Union
+
+import numpy as np
+from numpy.typing import DTypeLike
+from numpy.typing import NDArray
+
+from frolov.conversions import get_batch_conversion
+from frolov.stream import DEFAULT_CHUNK_SIZE
+from frolov.stream import _iter_array_chunks
+
+TRAJECTORY_FORMATS = ("xyz", "npy", "raw")
+
+FRAME_SHAPE = (4, 3)
+
+_N_ATOMS = 4
+
+# the count line, the comment line, and one line per atom
+_LINES_PER_FRAME = _N_ATOMS + 2
+
+TrajectorySource = Union[str, "os.PathLike[str]"]
+
+
+def _check_chunk_size(chunk_size: int) -> None:
+    if chunk_size < 1:
+        raise ValueError(f"The chunk size must be positive, found {chunk_size}")
+
+
+def _parse_xyz_lines(lines: List[str], i_first_frame: int) -> NDArray[np.float64]:
+    """The positions held in the lines of a whole number of XYZ frames."""
+    for i_frame, count_line in enumerate(lines[::_LINES_PER_FRAME], i_first_frame):
+        if count_line.strip() != str(_N_ATOMS):
+            raise ValueError(
+                f"Frame {i_frame} has an atom count of '{count_line.strip()}', "
+                f"expected {_N_ATOMS}"
+            )
+
+    atom_lines = list(
+        itertools.chain.from_iterable(
+            zip(
+                *[
+                    lines[i_line::_LINES_PER_FRAME]
+                    for i_line in range(2, _LINES_PER_FRAME)
+                ]
+            )
+        )
+    )
+    positions = np.loadtxt(atom_lines, usecols=(1, 2, 3), ndmin=2)
+
+    return positions.reshape((-1,) + FRAME_SHAPE)
+
+
+def iter_xyz_frames(
+    path: TrajectorySource, chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> Iterator[NDArray[np.float64]]:
+    """
+    Yield the frames of an XYZ file, as arrays of shape (N, 4, 3) holding at most
+    'chunk_size' frames. Blank lines after the last frame are ignored.
+    """
+    _check_chunk_size(chunk_size)
+    n_chunk_lines = chunk_size * _LINES_PER_FRAME
+
+    i_frame = 0
+    with open(path, "r") as fin:
+        while True:
+            lines = list(itertools.islice(fin, n_chunk_lines))
+            if len(lines) < n_chunk_lines:
+                while len(lines) > 0 and lines[-1].strip() == "":
+                    lines.pop()
+                if len(lines) % _LINES_PER_FRAME != 0:
+                    raise ValueError(
+                        f"The last frame of '{path}' is incomplete; each frame must "
+                        f"have {_LINES_PER_FRAME} lines"
+                    )
+            if len(lines) == 0:
+                return
+
+            frames = _parse_xyz_lines(lines, i_frame)
+            i_frame += frames.shape[0]
+            yield frames
+
+
+def iter_binary_frames(
+    path: TrajectorySource,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    frame_dtype: DTypeLike = np.float64,
+    offset: int = 0,
+) -> Iterator[NDArray[np.float64]]:
+    """
+    Yield the frames of a raw binary file, as float64 arrays of shape (N, 4, 3) holding
+    at most 'chunk_size' frames. The values in the file have the type 'frame_dtype'
+    (which can include the byte order, as in '>f4'), and start 'offset' bytes into the
+    file.
+    """
+    _check_chunk_size(chunk_size)
+    n_frame_values = int(np.prod(FRAME_SHAPE))
+
+    with open(path, "rb") as fin:
+        fin.seek(offset)
+        while True:
+            values = np.fromfile(
+                fin, dtype=frame_dtype, count=chunk_size * n_frame_values
+            )
+            if values.size == 0:
+                return
+            if values.size % n_frame_values != 0:
+                raise ValueError(
+                    f"The last frame of '{path}' is incomplete; each frame must hold "
+                    f"{n_frame_values} values"
+                )
+
+            yield values.astype(np.float64, copy=False).reshape((-1,) + FRAME_SHAPE)
+
+
+def _guess_format(path: Path) -> str:
+    if path.suffix == ".xyz":
+        return "xyz"
+    if path.suffix == ".npy":
+        return "npy"
+
+    return "raw"
+
+
+def iter_frames(
+    source: TrajectorySource,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    format: Optional[str] = None,
+    frame_dtype: DTypeLike = np.float64,
+    offset: int = 0,
+) -> Iterator[NDArray[np.float64]]:
+    """
+    Yield the frames of a trajectory file, as arrays of shape (N, 4, 3) holding at most
+    'chunk_size' frames. The format is one of 'TRAJECTORY_FORMATS'; if it is None, it is
+    chosen from the suffix of the file ('.xyz', '.npy', and raw binary otherwise). The
+    'frame_dtype' and 'offset' are only used by raw binary files.
+    """
+    _check_chunk_size(chunk_size)
+    path = Path(source)
+    format = format if format is not None else _guess_format(path)
+
+    if format == "xyz":
+        yield from iter_xyz_frames(path, chunk_size)
+    elif format == "npy":
+        frames = np.load(path, mmap_mode="r")
+        if frames.ndim != 3 or frames.shape[1:] != FRAME_SHAPE:
+            raise ValueError(
+                f"Expected frames of shape (N, 4, 3) in '{path}', found {frames.shape}"
+            )
+        yield from _iter_array_chunks(frames, FRAME_SHAPE, chunk_size)
+    elif format == "raw":
+        yield from iter_binary_frames(path, chunk_size, frame_dtype, offset)
+    else:
+        raise ValueError(
+            f"Unknown trajectory format '{format}'; expected one of {TRAJECTORY_FORMATS}"
+        )
+
+
+def convert_trajectory(
+    source: TrajectorySource,
+    to: str = "perimetric",
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    format: Optional[str] = None,
+    frame_dtype: DTypeLike = np.float64,
+    offset: int = 0,
+    dtype: Optional[DTypeLike] = None,
+) -> Iterator[NDArray[np.float64]]:
+    """
+    Convert the frames of a trajectory file to coordinates of kind 'to', and yield the
+    results one chunk at a time, in the precision 'dtype'. The arguments that describe
+    the file are those of 'iter_frames()'.
+    """
+    conversion = get_batch_conversion("cartesian", to, dtype)
+
+    for frames in iter_frames(source, chunk_size, format, frame_dtype, offset):
+        yield conversion(frames)
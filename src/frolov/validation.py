@@ -0,0 +1,303 @@
+"""
+This module contains the machinery used to check that coordinates satisfy their
+constraints (the grid constraints, the inequalities in equation (32) of the paper, and
+the non-negativity of the pair distances).
+
+Pair distances that satisfy their constraints are not necessarily those of four points
+in 3D space; 'validate_embeddable_pairdistance_batch()' performs the stricter check (the
+Cayley-Menger condition), and is never run automatically. Passing that check does not
+mean that 'pairdistance_to_cartesian_batch()' can place the points: it returns nan for
+degenerate (planar, collinear or coincident) geometries, which the check accepts.
+
+When and how the checks are performed is controlled by the global validation mode:
+ - EAGER (the default)
+    - every scalar coordinate is checked when it is constructed
+    - every batch is checked as a whole when it is constructed
+    - an InvalidCoordinateError is raised as soon as a violation is found
+ - DEFERRED
+    - scalar coordinates are not checked individually
+    - every batch is checked as a whole, once, when it is constructed; the result is
+      kept as a ValidationReport, and nothing is raised
+    - the invalid rows of a batch can then be inspected or filtered out
+ - OFF
+    - no checks are performed automatically; the 'validate_*_batch()' functions can
+      still be called explicitly
+
+Unlike the plain 'assert' statements these checks replace, the checks performed in the
+EAGER mode are not removed when python is run with the '-O' flag.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import enum
+from dataclasses import dataclass
+from typing import Dict
+from typing import Iterator
+from typing import NamedTuple
+
+import numpy as np
+from numpy.typing import NDArray
+
+from frolov import profiling
+
+
+class ValidationMode(enum.Enum):
+    EAGER = "eager"
+    DEFERRED = "deferred"
+    OFF = "off"
+
+
+class InvalidCoordinateError(AssertionError):
+    """
+    Raised when a coordinate does not satisfy its constraints.
+
+    This is a subclass of AssertionError, so that code written against the original
+    'assert'-based checks keeps working.
+    """
+
+
+_mode = ValidationMode.EAGER
+
+# 'checks_each_coordinate()' is called every time a scalar coordinate is created, so the
+# answer is kept up to date here rather than recalculated from '_mode'
+_checks_each_coordinate = True
+
+
+def get_validation_mode() -> ValidationMode:
+    return _mode
+
+
+def set_validation_mode(mode: ValidationMode | str) -> None:
+    global _mode, _checks_each_coordinate
+    _mode = ValidationMode(mode)
+    _checks_each_coordinate = _mode is ValidationMode.EAGER
+
+
+@contextlib.contextmanager
+def validation_mode(mode: ValidationMode | str) -> Iterator[None]:
+    """Temporarily change the validation mode within a 'with' block."""
+    previous_mode = get_validation_mode()
+    set_validation_mode(mode)
+    try:
+        yield
+    finally:
+        set_validation_mode(previous_mode)
+
+
+def checks_each_coordinate() -> bool:
+    """Whether scalar coordinates should check their constraints when constructed."""
+    return _checks_each_coordinate
+
+
+@dataclass(frozen=True)
+class ValidationReport:
+    """
+    The result of checking every row of a batch against every constraint.
+
+    'mask' holds True for each row that satisfies all the constraints. Each entry of
+    'violations' maps the name of a constraint to an array holding True for each row
+    that violates that constraint.
+    """
+
+    mask: NDArray[np.bool_]
+    violations: Dict[str, NDArray[np.bool_]]
+
+    @property
+    def all_valid(self) -> bool:
+        return bool(np.all(self.mask))
+
+    @property
+    def n_invalid(self) -> int:
+        return int(self.mask.size - np.count_nonzero(self.mask))
+
+    def violation_counts(self) -> Dict[str, int]:
+        """The number of rows that violate each constraint."""
+        return {
+            name: int(np.count_nonzero(violated))
+            for (name, violated) in self.violations.items()
+        }
+
+    def raise_if_invalid(self, kind: str) -> None:
+        if self.all_valid:
+            return
+
+        first_invalid_row = int(np.argmin(self.mask))
+        counts = {name: n for (name, n) in self.violation_counts().items() if n > 0}
+        raise InvalidCoordinateError(
+            f"{self.n_invalid} {kind} coordinate(s) violate their constraints "
+            f"(first invalid row: {first_invalid_row}); violations: {counts}"
+        )
+
+
+class EmbeddabilityReport(NamedTuple):
+    report: ValidationReport
+    """Which rows can be realized by four points in 3D space, and why the others cannot."""
+    volume_squared: NDArray[np.float64]
+    """
+    The squared volume of the tetrahedron of each row, from the Cayley-Menger
+    determinant; negative for rows that cannot be realized.
+    """
+
+
+def _make_report(
+    violations: Dict[str, NDArray[np.bool_]], n_rows: int, stage: str
+) -> ValidationReport:
+    mask = np.ones(n_rows, dtype=np.bool_)
+    for violated in violations.values():
+        mask &= ~violated
+
+    report = ValidationReport(mask, violations)
+    if profiling.is_profiling_enabled():
+        profiling.record_validation_failures(stage, report.n_invalid)
+
+    return report
+
+
+@profiling.profiled
+def validate_grid_batch(
+    gridcoords: NDArray[np.float64], atol: float = 0.0
+) -> ValidationReport:
+    """
+    Check each row of an (N, 6) array of grid coordinates against the grid constraints.
+
+    The constraints are relaxed by 'atol', to allow for round-off error. Rows holding
+    NaN values are always reported as invalid.
+    """
+    grid_u1, grid_u2, grid_u3, grid_t3, grid_s3, grid_w3 = np.asarray(gridcoords).T
+
+    violations = {
+        "grid_u1 >= 0": ~(grid_u1 >= -atol),
+        "grid_u2 >= 0": ~(grid_u2 >= -atol),
+        "grid_u3 >= 1": ~(grid_u3 >= 1.0 - atol),
+        "grid_t3 >= 1": ~(grid_t3 >= 1.0 - atol),
+        "grid_s3 >= 1": ~(grid_s3 >= 1.0 - atol),
+        "0 <= grid_w3 <= 1": ~((grid_w3 >= -atol) & (grid_w3 <= 1.0 + atol)),
+    }
+
+    return _make_report(violations, grid_u1.shape[0], "validate_grid_batch")
+
+
+@profiling.profiled
+def validate_perimetric_batch(
+    perimetrics: NDArray[np.float64], atol: float = 0.0
+) -> ValidationReport:
+    """
+    Check each row of an (N, 6) array of perimetric coordinates against the inequalities
+    in equation (32) of the paper, and check that none of the coordinates are negative.
+
+    The inequalities are relaxed by 'atol', to allow for round-off error.
+    """
+    u1, u2, u3, t3, s3, w3 = np.asarray(perimetrics).T
+
+    s3_lower = np.maximum(0.0, u3 - t3)
+    s3_upper = u2 + u3
+    w3_lower = np.maximum(s3_lower, s3 - u2)
+    w3_upper = np.minimum(u1 + u3, u1 + s3)
+
+    violations = {
+        "s3 inequality": ~((s3 >= s3_lower - atol) & (s3 <= s3_upper + atol)),
+        "w3 inequality": ~((w3 >= w3_lower - atol) & (w3 <= w3_upper + atol)),
+        "nonnegative": ~np.all(np.asarray(perimetrics) >= -atol, axis=1),
+    }
+
+    return _make_report(violations, u1.shape[0], "validate_perimetric_batch")
+
+
+@profiling.profiled
+def validate_pairdistance_batch(
+    pairdists: NDArray[np.float64], atol: float = 0.0
+) -> ValidationReport:
+    """Check that none of the pair distances in an (N, 6) array are negative."""
+    pairdists = np.asarray(pairdists)
+    violations = {"nonnegative": ~np.all(pairdists >= -atol, axis=1)}
+
+    return _make_report(violations, pairdists.shape[0], "validate_pairdistance_batch")
+
+
+@profiling.profiled
+def validate_cartesian_batch(points: NDArray[np.float64]) -> ValidationReport:
+    """Check that all the components of an (N, 4, 3) array of points are finite."""
+    points = np.asarray(points)
+    violations = {"finite": ~np.all(np.isfinite(points), axis=(1, 2))}
+
+    return _make_report(violations, points.shape[0], "validate_cartesian_batch")
+
+
+# the (point, point, point) labels of the four triangular faces, and the columns of
+# their pair distances, in the order (r01, r02, r03, r12, r13, r23)
+_TRIANGLE_COLUMNS = {
+    "triangle 012": (0, 1, 3),
+    "triangle 013": (0, 2, 4),
+    "triangle 023": (1, 2, 5),
+    "triangle 123": (3, 4, 5),
+}
+
+
+@profiling.profiled
+def cayley_menger_volume_squared_batch(
+    pairdists: NDArray[np.float64],
+) -> NDArray[np.float64]:
+    """
+    Calculate the squared volume of the tetrahedron formed by the four points, for each
+    row of an (N, 6) array of pair distances, from the Cayley-Menger determinant
+    (which is 288 times the squared volume).
+
+    The result is negative for pair distances that cannot be realized by four points in
+    3D space, and zero (up to round-off error) for planar geometries.
+    """
+    d01, d02, d03, d12, d13, d23 = (np.asarray(pairdists, dtype=np.float64) ** 2).T
+
+    # the expansion of the determinant in terms of the three pairs of opposite edges,
+    # and the four triangular faces
+    opposite_edges = (
+        d01 * d23 * (d02 + d03 + d12 + d13 - d01 - d23)
+        + d02 * d13 * (d01 + d03 + d12 + d23 - d02 - d13)
+        + d03 * d12 * (d01 + d02 + d13 + d23 - d03 - d12)
+    )
+    faces = d01 * d02 * d12 + d01 * d03 * d13 + d02 * d03 * d23 + d12 * d13 * d23
+
+    volume_squared: NDArray[np.float64] = (opposite_edges - faces) / 144.0
+    return volume_squared
+
+
+@profiling.profiled
+def validate_embeddable_pairdistance_batch(
+    pairdists: NDArray[np.float64], atol: float = 0.0, rtol: float = 1.0e-10
+) -> EmbeddabilityReport:
+    """
+    Check that each row of an (N, 6) array of pair distances can be realized by four
+    points in 3D space (the Cayley-Menger condition). Returns the report of the checks,
+    together with the squared volumes used for them, so that they need not be
+    calculated again.
+
+    Degenerate geometries are accepted, although 'pairdistance_to_cartesian_batch()'
+    returns nan for them; 'pairdistance_to_cartesian_batch_with_status()' places planar
+    and collinear geometries, and reports the rows it cannot place (such as those where
+    particles 0 and 1 coincide).
+
+    The checks are:
+     - none of the pair distances are negative
+     - each of the four triangular faces satisfies the triangle inequality, relaxed by
+       'atol'
+     - the squared volume from 'cayley_menger_volume_squared_batch()' is not negative;
+       it may be negative by up to 'rtol' times the sixth power of the longest pair
+       distance, to allow for round-off error in planar geometries
+    """
+    pairdists = np.asarray(pairdists, dtype=np.float64)
+
+    violations = {"nonnegative": ~np.all(pairdists >= -atol, axis=1)}
+    for name, columns in _TRIANGLE_COLUMNS.items():
+        sides = pairdists[:, columns]
+        longest = np.max(sides, axis=1)
+        violations[name] = ~(2.0 * longest <= np.sum(sides, axis=1) + atol)
+
+    volume_squared = cayley_menger_volume_squared_batch(pairdists)
+    scale = np.max(pairdists, axis=1) ** 6
+    violations["cayley-menger"] = ~(volume_squared >= -rtol * scale)
+
+    report = _make_report(
+        violations, pairdists.shape[0], "validate_embeddable_pairdistance_batch"
+    )
+
+    return EmbeddabilityReport(report, volume_squared)
@@ -5,11 +5,15 @@ used in various tests.
 
 import random
 
+import numpy as np
+
 from cartesian import Cartesian3D
 
 from frolov.coordinates.cartesian_coordinate import CartesianCoordinate
 from frolov.coordinates.grid_coordinate import GridCoordinate
 
+from frolov.conversions import grid_to_cartesian_batch
+
 
 def random_grid_coordinate(maximum_grid_value: float = 10.0) -> GridCoordinate:
     """
@@ -48,3 +52,57 @@ def random_point_in_positive_octant_box(box_length: float) -> Cartesian3D:
         random.uniform(0.0, box_length),
         random.uniform(0.0, box_length),
     )
+
+
+def random_grid_batch(
+    n_coords: int,
+    maximum_grid_value: float = 10.0,
+    seed: int | np.random.Generator | None = None,
+) -> np.ndarray:
+    """
+    Create an (N, 6) array of random grid coordinates that satisfy the grid constraints;
+    the batched counterpart of 'random_grid_coordinate()'.
+    """
+    assert maximum_grid_value > 1.0
+
+    rng = np.random.default_rng(seed)
+    lower = np.array([0.0, 0.0, 1.0, 1.0, 1.0, 0.0])
+    upper = np.array([maximum_grid_value] * 5 + [1.0])
+
+    return rng.uniform(lower, upper, size=(n_coords, 6))
+
+
+def random_cartesian_batch(
+    n_coords: int, cube_sidelen: float = 1.0, seed: int | None = None
+) -> np.ndarray:
+    """Generate an (N, 4, 3) array of four-point geometries inside a box"""
+    rng = np.random.default_rng(seed)
+
+    return rng.uniform(0.0, cube_sidelen, size=(n_coords, 4, 3))
+
+
+def random_embeddable_grid_batch(
+    n_coords: int, maximum_grid_value: float = 10.0, seed: int | None = None
+) -> np.ndarray:
+    """
+    Create an (N, 6) array of random grid coordinates that correspond to four-body
+    geometries that can actually be placed in 3D space.
+
+    Not every grid coordinate that satisfies the grid constraints describes a physical
+    geometry; we generate candidates, and keep those that can be converted into
+    Cartesian points.
+    """
+    rng = np.random.default_rng(seed)
+
+    accepted = []
+    n_accepted = 0
+    while n_accepted < n_coords:
+        candidates = random_grid_batch(n_coords, maximum_grid_value, seed=rng)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            points = grid_to_cartesian_batch(candidates)
+
+        embeddable = candidates[np.all(np.isfinite(points), axis=(1, 2))]
+        accepted.append(embeddable)
+        n_accepted += embeddable.shape[0]
+
+    return np.concatenate(accepted)[:n_coords]
@@ -0,0 +1,105 @@
+import pytest
+
+from frolov.conversions import cartesian_to_pairdistance
+from frolov.conversions import grid_to_cartesian
+from frolov.conversions import grid_to_perimetric
+
+from frolov.coordinates.grid_coordinate import GridCoordinate
+
+from frolov.cache import ConversionCache
+from frolov.cache import cached_conversion
+
+from randomgen import random_cartesian_coordinate
+
+
+@pytest.fixture
+def gridcoord():
+    return GridCoordinate(1.0, 2.0, 3.0, 4.0, 5.0, 0.5)
+
+
+def test_wrapper_keeps_function_metadata():
+    cached = cached_conversion(grid_to_cartesian)
+
+    assert cached.__name__ == "grid_to_cartesian"
+    assert cached.__doc__ == grid_to_cartesian.__doc__
+    assert cached.__wrapped__ is grid_to_cartesian
+
+
+def test_cached_result_matches_conversion(gridcoord):
+    cached = cached_conversion(grid_to_perimetric)
+
+    assert cached(gridcoord) == grid_to_perimetric(gridcoord)
+    assert cached(gridcoord) == grid_to_perimetric(gridcoord)
+
+
+def test_hits_and_misses(gridcoord):
+    cached = cached_conversion(grid_to_perimetric)
+    other = GridCoordinate(1.0, 2.0, 3.0, 4.0, 5.0, 0.25)
+
+    cached(gridcoord)
+    cached(gridcoord)
+    cached(other)
+    cached(gridcoord)
+
+    info = cached.cache.info()
+    assert (info.hits, info.misses, info.currsize) == (2, 2, 2)
+
+
+def test_least_recently_used_is_evicted():
+    cached = cached_conversion(grid_to_perimetric, maxsize=2)
+    coords = [GridCoordinate(1.0, 2.0, 3.0, 4.0, 5.0, w3) for w3 in (0.1, 0.2, 0.3)]
+
+    cached(coords[0])
+    cached(coords[1])
+    cached(coords[0])  # coords[1] is now the least recently used
+    cached(coords[2])
+
+    assert cached.cache.info().evictions == 1
+    cached(coords[0])
+    assert cached.cache.info().hits == 2
+    cached(coords[1])
+    assert cached.cache.info().misses == 4
+
+
+def test_tolerance_shares_results(gridcoord):
+    cached = cached_conversion(grid_to_perimetric, tolerance=1.0e-6)
+    nearby = GridCoordinate(1.0 + 1.0e-9, 2.0, 3.0, 4.0, 5.0, 0.5)
+
+    first = cached(gridcoord)
+    assert cached(nearby) is first
+    assert cached.cache.info().hits == 1
+
+
+def test_shared_cache_keeps_functions_separate(gridcoord):
+    cache = ConversionCache()
+    cached_perimetric = cache.wrap(grid_to_perimetric)
+    cached_cartesian = cache.wrap(grid_to_cartesian)
+
+    cached_perimetric(gridcoord)
+    cached_cartesian(gridcoord)
+
+    assert cache.info().misses == 2
+    assert len(cache) == 2
+
+
+def test_cartesian_input():
+    points = random_cartesian_coordinate()
+    cached = cached_conversion(cartesian_to_pairdistance)
+
+    assert cached(points) == cartesian_to_pairdistance(points)
+    cached(points)
+    assert cached.cache.info().hits == 1
+
+
+def test_clear(gridcoord):
+    cached = cached_conversion(grid_to_perimetric)
+    cached(gridcoord)
+    cached.cache.clear()
+
+    assert cached.cache.info() == (0, 0, 0, 1024, 0)
+
+
+@pytest.mark.parametrize("kwargs", [{"maxsize": 0}, {"tolerance": 0.0}])
+def test_invalid_arguments_raise(kwargs):
+    with pytest.raises(ValueError):
+        ConversionCache(**kwargs)
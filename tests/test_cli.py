@@ -0,0 +1,207 @@
+import numpy as np
+import pytest
+
+from frolov.cli import main
+from frolov.conversions import grid_to_cartesian_batch
+from frolov.conversions import grid_to_perimetric_batch
+from frolov.storage import open_memmap
+
+from randomgen import random_embeddable_grid_batch
+
+
+@pytest.fixture
+def gridcoords():
+    return random_embeddable_grid_batch(250)
+
+
+def test_csv_to_npy(tmp_path, gridcoords, capsys):
+    input_path = tmp_path / "grid.csv"
+    output_path = tmp_path / "points.npy"
+    np.savetxt(input_path, gridcoords, delimiter=",")
+
+    status = main(
+        [
+            "convert",
+            str(input_path),
+            str(output_path),
+            "--from",
+            "grid",
+            "--to",
+            "cartesian",
+            "--chunk-size",
+            "64",
+        ]
+    )
+
+    assert status == 0
+    np.testing.assert_allclose(
+        np.load(output_path), grid_to_cartesian_batch(gridcoords)
+    )
+    assert "rows/s" in capsys.readouterr().err
+
+
+def test_npy_to_whitespace_text(tmp_path, gridcoords):
+    input_path = tmp_path / "grid.npy"
+    output_path = tmp_path / "points.txt"
+    np.save(input_path, gridcoords)
+
+    main(
+        [
+            "convert",
+            str(input_path),
+            str(output_path),
+            "--from",
+            "grid",
+            "--to",
+            "cartesian",
+            "--quiet",
+        ]
+    )
+
+    points = np.loadtxt(output_path).reshape(-1, 4, 3)
+    np.testing.assert_array_equal(points, grid_to_cartesian_batch(gridcoords))
+
+
+def test_cartesian_text_input_to_frolov_file(tmp_path, gridcoords):
+    input_path = tmp_path / "points.dat"
+    output_path = tmp_path / "grid.frolov"
+    np.savetxt(input_path, grid_to_cartesian_batch(gridcoords).reshape(-1, 12))
+
+    main(
+        [
+            "convert",
+            str(input_path),
+            str(output_path),
+            "--from",
+            "cartesian",
+            "--to",
+            "grid",
+            "--quiet",
+        ]
+    )
+
+    batch = open_memmap(output_path)
+    assert batch.kind == "grid"
+    np.testing.assert_allclose(batch.data, gridcoords)
+
+
+def test_workers(tmp_path, gridcoords):
+    input_path = tmp_path / "grid.npy"
+    output_path = tmp_path / "perimetric.npy"
+    np.save(input_path, gridcoords)
+
+    main(
+        [
+            "convert",
+            str(input_path),
+            str(output_path),
+            "--from",
+            "grid",
+            "--to",
+            "perimetric",
+            "--workers",
+            "2",
+            "--chunk-size",
+            "100",
+            "--quiet",
+        ]
+    )
+
+    np.testing.assert_array_equal(
+        np.load(output_path), grid_to_perimetric_batch(gridcoords)
+    )
+
+
+def test_empty_input(tmp_path):
+    input_path = tmp_path / "grid.csv"
+    output_path = tmp_path / "perimetric.npy"
+    input_path.write_text("")
+
+    main(
+        [
+            "convert",
+            str(input_path),
+            str(output_path),
+            "--from",
+            "grid",
+            "--to",
+            "perimetric",
+            "--quiet",
+        ]
+    )
+
+    assert np.load(output_path).shape == (0, 6)
+
+
+def test_missing_input_exits_with_error(tmp_path, capsys):
+    with pytest.raises(SystemExit) as exit_info:
+        main(
+            [
+                "convert",
+                str(tmp_path / "missing.csv"),
+                str(tmp_path / "out.csv"),
+                "--from",
+                "grid",
+                "--to",
+                "perimetric",
+            ]
+        )
+
+    assert exit_info.value.code == 1
+    assert "missing.csv" in capsys.readouterr().err
+
+
+def test_wrong_kind_exits_with_error(tmp_path, gridcoords, capsys):
+    input_path = tmp_path / "grid.npy"
+    output_path = tmp_path / "out.csv"
+    np.save(input_path, gridcoords)
+
+    with pytest.raises(SystemExit) as exit_info:
+        main(
+            [
+                "convert",
+                str(input_path),
+                str(output_path),
+                "--from",
+                "cartesian",
+                "--to",
+                "grid",
+                "--quiet",
+            ]
+        )
+
+    assert exit_info.value.code == 1
+    assert "(250, 6)" in capsys.readouterr().err
+
+
+def test_unknown_kind_exits_with_error(tmp_path):
+    with pytest.raises(SystemExit):
+        main(["convert", "in.csv", "out.csv", "--from", "polar", "--to", "grid"])
+
+
+def test_float32_output(tmp_path, gridcoords):
+    input_path = tmp_path / "grid.npy"
+    output_path = tmp_path / "points.npy"
+    np.save(input_path, gridcoords)
+
+    status = main(
+        [
+            "convert",
+            str(input_path),
+            str(output_path),
+            "--from",
+            "grid",
+            "--to",
+            "cartesian",
+            "--dtype",
+            "float32",
+            "--quiet",
+        ]
+    )
+
+    assert status == 0
+    points = np.load(output_path)
+    assert points.dtype == np.float32
+    np.testing.assert_array_equal(
+        points, grid_to_cartesian_batch(gridcoords).astype(np.float32)
+    )
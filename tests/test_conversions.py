@@ -1,16 +1,40 @@
+import numpy as np
+import pytest
+
+from cartesian import Cartesian3D
+
 from frolov.conversions import cartesian_to_pairdistance
 from frolov.conversions import pairdistance_to_cartesian
 from frolov.conversions import pairdistance_to_perimetric
 from frolov.conversions import perimetric_to_pairdistance
 from frolov.conversions import perimetric_to_grid
 from frolov.conversions import grid_to_perimetric
+from frolov.conversions import grid_to_cartesian
+from frolov.conversions import cartesian_to_grid
+
+from frolov.conversions import cartesian_to_pairdistance_batch
+from frolov.conversions import pairdistance_to_cartesian_batch
+from frolov.conversions import pairdistance_to_perimetric_batch
+from frolov.conversions import perimetric_to_pairdistance_batch
+from frolov.conversions import perimetric_to_grid_batch
+from frolov.conversions import grid_to_perimetric_batch
+from frolov.conversions import grid_to_cartesian_batch
+from frolov.conversions import cartesian_to_grid_batch
+
+from frolov.coordinates.cartesian_coordinate import CartesianCoordinate
+from frolov.coordinates.grid_coordinate import GridCoordinate
+from frolov.coordinates.pairdistance_coordinate import PairDistanceCoordinate
+from frolov.coordinates.perimetric_coordinate import PerimetricCoordinate
 
 from frolov.coordinates.cartesian_coordinate import cartesian_approx_eq
 from frolov.coordinates.grid_coordinate import grid_approx_eq
 from frolov.coordinates.pairdistance_coordinate import pairdistance_approx_eq
 from frolov.coordinates.perimetric_coordinate import perimetric_approx_eq
 
+from randomgen import random_cartesian_batch
 from randomgen import random_cartesian_coordinate
+from randomgen import random_embeddable_grid_batch
+from randomgen import random_grid_batch
 from randomgen import random_grid_coordinate
 
 
@@ -77,3 +101,138 @@ def test_perimetric_to_grid_and_back():
 
         assert grid_approx_eq(original_gridcoord, recovered_gridcoord)
         assert perimetric_approx_eq(original_pericoord, recovered_pericoord)
+
+
+def test_grid_to_cartesian_matches_chained_path():
+    for row in random_embeddable_grid_batch(1000):
+        gridcoord = GridCoordinate(*row)
+
+        pericoord = grid_to_perimetric(gridcoord)
+        pairdistcoord = perimetric_to_pairdistance(pericoord)
+        expected_cartcoord = pairdistance_to_cartesian(pairdistcoord)
+
+        assert cartesian_approx_eq(grid_to_cartesian(gridcoord), expected_cartcoord)
+
+
+def test_cartesian_to_grid_matches_chained_path():
+    """
+    Not every random set of four points lies within the region of space described by
+    the grid constraints, so we start from points created from grid coordinates.
+    """
+    for row in random_embeddable_grid_batch(1000):
+        cartcoord = grid_to_cartesian(GridCoordinate(*row))
+
+        pairdistcoord = cartesian_to_pairdistance(cartcoord)
+        pericoord = pairdistance_to_perimetric(pairdistcoord)
+        expected_gridcoord = perimetric_to_grid(pericoord)
+
+        assert grid_approx_eq(cartesian_to_grid(cartcoord), expected_gridcoord)
+
+
+class TestBatchConversions:
+    """
+    The batched conversions must give the same results as applying the corresponding
+    scalar conversion to each row.
+    """
+
+    def test_cartesian_to_pairdistance_batch(self):
+        points = random_cartesian_batch(100)
+        pairdists = cartesian_to_pairdistance_batch(points)
+
+        for i_row, cartcoord in enumerate(cartesian_coordinates_from_array(points)):
+            expected = cartesian_to_pairdistance(cartcoord).unpack()
+            np.testing.assert_allclose(pairdists[i_row], expected)
+
+    def test_pairdistance_to_cartesian_batch(self):
+        pairdists = cartesian_to_pairdistance_batch(random_cartesian_batch(100))
+        points = pairdistance_to_cartesian_batch(pairdists)
+
+        for i_row, row in enumerate(pairdists):
+            cartcoord = pairdistance_to_cartesian(PairDistanceCoordinate(*row))
+            expected = [[p[0], p[1], p[2]] for p in cartcoord.unpack()]
+            np.testing.assert_allclose(points[i_row], expected, atol=1.0e-12)
+
+    def test_pairdistance_to_perimetric_batch(self):
+        pairdists = cartesian_to_pairdistance_batch(random_cartesian_batch(100))
+        perimetrics = pairdistance_to_perimetric_batch(pairdists)
+
+        for i_row, row in enumerate(pairdists):
+            pericoord = pairdistance_to_perimetric(PairDistanceCoordinate(*row))
+            np.testing.assert_allclose(perimetrics[i_row], pericoord.unpack())
+
+    def test_perimetric_to_pairdistance_batch(self):
+        perimetrics = grid_to_perimetric_batch(random_grid_batch(100))
+        pairdists = perimetric_to_pairdistance_batch(perimetrics)
+
+        for i_row, row in enumerate(perimetrics):
+            pairdistcoord = perimetric_to_pairdistance(PerimetricCoordinate(*row))
+            np.testing.assert_allclose(pairdists[i_row], pairdistcoord.unpack())
+
+    def test_grid_to_perimetric_batch(self):
+        gridcoords = random_grid_batch(100)
+        perimetrics = grid_to_perimetric_batch(gridcoords)
+
+        for i_row, row in enumerate(gridcoords):
+            pericoord = grid_to_perimetric(GridCoordinate(*row))
+            np.testing.assert_allclose(perimetrics[i_row], pericoord.unpack())
+
+    def test_perimetric_to_grid_batch(self):
+        perimetrics = grid_to_perimetric_batch(random_grid_batch(100))
+        gridcoords = perimetric_to_grid_batch(perimetrics)
+
+        for i_row, row in enumerate(perimetrics):
+            gridcoord = perimetric_to_grid(PerimetricCoordinate(*row))
+            np.testing.assert_allclose(gridcoords[i_row], gridcoord.unpack())
+
+    def test_grid_round_trip_batch(self):
+        gridcoords = random_grid_batch(1000)
+        perimetrics = grid_to_perimetric_batch(gridcoords)
+        pairdists = perimetric_to_pairdistance_batch(perimetrics)
+
+        recovered_perimetrics = pairdistance_to_perimetric_batch(pairdists)
+        recovered_gridcoords = perimetric_to_grid_batch(recovered_perimetrics)
+
+        np.testing.assert_allclose(recovered_perimetrics, perimetrics, atol=1.0e-10)
+        np.testing.assert_allclose(recovered_gridcoords, gridcoords, rtol=1.0e-8)
+
+    def test_grid_to_cartesian_batch(self):
+        gridcoords = random_embeddable_grid_batch(1000)
+
+        pairdists = perimetric_to_pairdistance_batch(
+            grid_to_perimetric_batch(gridcoords)
+        )
+        expected_points = pairdistance_to_cartesian_batch(pairdists)
+        points = grid_to_cartesian_batch(gridcoords)
+
+        np.testing.assert_allclose(points, expected_points)
+
+    def test_cartesian_to_grid_batch(self):
+        points = grid_to_cartesian_batch(random_embeddable_grid_batch(1000))
+
+        perimetrics = pairdistance_to_perimetric_batch(
+            cartesian_to_pairdistance_batch(points)
+        )
+        expected_gridcoords = perimetric_to_grid_batch(perimetrics)
+        gridcoords = cartesian_to_grid_batch(points)
+
+        np.testing.assert_allclose(gridcoords, expected_gridcoords)
+
+    @pytest.mark.parametrize(
+        "function, shape",
+        [
+            (cartesian_to_pairdistance_batch, (10, 6)),
+            (pairdistance_to_cartesian_batch, (10, 4, 3)),
+            (grid_to_perimetric_batch, (10, 5)),
+            (perimetric_to_grid_batch, (6,)),
+            (grid_to_cartesian_batch, (10, 4, 3)),
+            (cartesian_to_grid_batch, (10, 6)),
+        ],
+    )
+    def test_raises_invalid_shape(self, function, shape):
+        with pytest.raises(ValueError):
+            function(np.ones(shape))
+
+
+def cartesian_coordinates_from_array(points):
+    for row in points:
+        yield CartesianCoordinate(*[Cartesian3D(*p) for p in row])
@@ -0,0 +1,113 @@
+import numpy as np
+import pytest
+
+from frolov.coordinates.cartesian_coordinate import CartesianCoordinateBatch
+from frolov.coordinates.cartesian_coordinate import cartesian_approx_eq
+from frolov.coordinates.grid_coordinate import GridCoordinate
+from frolov.coordinates.grid_coordinate import GridCoordinateBatch
+from frolov.coordinates.grid_coordinate import grid_approx_eq
+from frolov.coordinates.pairdistance_coordinate import PairDistanceCoordinateBatch
+from frolov.coordinates.perimetric_coordinate import PerimetricCoordinateBatch
+
+from frolov.conversions import cartesian_to_pairdistance_batch
+from frolov.conversions import grid_to_perimetric_batch
+
+from randomgen import random_cartesian_batch
+from randomgen import random_cartesian_coordinate
+from randomgen import random_grid_batch
+from randomgen import random_grid_coordinate
+
+
+class TestGridCoordinateBatch:
+    def test_column_views(self):
+        data = random_grid_batch(10)
+        batch = GridCoordinateBatch(data)
+
+        np.testing.assert_array_equal(batch.grid_u1, data[:, 0])
+        np.testing.assert_array_equal(batch.grid_w3, data[:, 5])
+        assert np.shares_memory(batch.grid_t3, batch.data)
+
+    def test_integer_index_gives_scalar(self):
+        data = random_grid_batch(10)
+        batch = GridCoordinateBatch(data)
+
+        gridcoord = batch[3]
+        assert isinstance(gridcoord, GridCoordinate)
+        assert gridcoord.unpack() == tuple(data[3])
+
+    def test_slicing_shares_memory(self):
+        batch = GridCoordinateBatch(random_grid_batch(10))
+        sliced = batch[2:5]
+
+        assert isinstance(sliced, GridCoordinateBatch)
+        assert len(sliced) == 3
+        assert np.shares_memory(sliced.data, batch.data)
+
+    def test_boolean_mask_selection(self):
+        batch = GridCoordinateBatch(random_grid_batch(100))
+        selected = batch[batch.grid_w3 < 0.5]
+
+        assert len(selected) == int(np.sum(batch.grid_w3 < 0.5))
+        assert np.all(selected.grid_w3 < 0.5)
+
+    def test_from_coordinates_and_iteration(self):
+        gridcoords = [random_grid_coordinate() for _ in range(20)]
+        batch = GridCoordinateBatch.from_coordinates(gridcoords)
+
+        assert len(batch) == 20
+        for original, recovered in zip(gridcoords, batch):
+            assert grid_approx_eq(original, recovered)
+
+    def test_concatenate(self):
+        batch0 = GridCoordinateBatch(random_grid_batch(4))
+        batch1 = GridCoordinateBatch(random_grid_batch(6))
+        joined = GridCoordinateBatch.concatenate([batch0, batch1])
+
+        assert len(joined) == 10
+        np.testing.assert_array_equal(joined.data[:4], batch0.data)
+        np.testing.assert_array_equal(joined.data[4:], batch1.data)
+
+    def test_concatenate_empty(self):
+        joined = GridCoordinateBatch.concatenate([])
+        assert len(joined) == 0
+
+    def test_raises_invalid_shape(self):
+        with pytest.raises(ValueError):
+            GridCoordinateBatch(np.ones((10, 5)))
+
+
+def test_perimetric_batch_columns():
+    data = grid_to_perimetric_batch(random_grid_batch(10))
+    batch = PerimetricCoordinateBatch(data)
+
+    for i_field, name in enumerate(batch.fields):
+        np.testing.assert_array_equal(getattr(batch, name), data[:, i_field])
+
+
+def test_pairdistance_batch_columns():
+    data = cartesian_to_pairdistance_batch(random_cartesian_batch(10))
+    batch = PairDistanceCoordinateBatch(data)
+
+    for i_field, name in enumerate(batch.fields):
+        np.testing.assert_array_equal(getattr(batch, name), data[:, i_field])
+
+
+class TestCartesianCoordinateBatch:
+    def test_point_views(self):
+        data = random_cartesian_batch(10)
+        batch = CartesianCoordinateBatch(data)
+
+        np.testing.assert_array_equal(batch.point2, data[:, 2, :])
+        assert np.shares_memory(batch.point3, batch.data)
+
+    def test_from_coordinates_and_iteration(self):
+        cartcoords = [random_cartesian_coordinate() for _ in range(20)]
+        batch = CartesianCoordinateBatch.from_coordinates(cartcoords)
+
+        assert batch.data.shape == (20, 4, 3)
+        for original, recovered in zip(cartcoords, batch):
+            assert cartesian_approx_eq(original, recovered)
+
+    def test_raises_invalid_shape(self):
+        with pytest.raises(ValueError):
+            CartesianCoordinateBatch(np.ones((10, 3, 4)))
@@ -0,0 +1,99 @@
+import numpy as np
+import pytest
+
+from frolov.conversions import EmbeddingStatus
+from frolov.conversions import cartesian_to_pairdistance_batch
+from frolov.conversions import pairdistance_to_cartesian_batch
+from frolov.conversions import pairdistance_to_cartesian_batch_with_status
+
+from randomgen import random_cartesian_batch
+
+
+def test_general_geometries_match_plain_conversion():
+    pairdists = cartesian_to_pairdistance_batch(random_cartesian_batch(100, seed=0))
+
+    points, status = pairdistance_to_cartesian_batch_with_status(pairdists)
+
+    np.testing.assert_array_equal(status, EmbeddingStatus.OK)
+    np.testing.assert_allclose(points, pairdistance_to_cartesian_batch(pairdists))
+
+
+def test_planar_geometries():
+    points = random_cartesian_batch(100, seed=1)
+    points[:, :, 2] = 0.0
+    pairdists = cartesian_to_pairdistance_batch(points)
+
+    embedded, status = pairdistance_to_cartesian_batch_with_status(pairdists)
+
+    np.testing.assert_array_equal(status, EmbeddingStatus.PLANAR)
+    np.testing.assert_array_equal(embedded[:, 3, 2], 0.0)
+    np.testing.assert_allclose(
+        cartesian_to_pairdistance_batch(embedded), pairdists, atol=1.0e-6
+    )
+
+
+def test_collinear_geometries():
+    points = random_cartesian_batch(50, seed=2)
+    points[:, :3, 1:] = 0.0
+    pairdists = cartesian_to_pairdistance_batch(points)
+
+    embedded, status = pairdistance_to_cartesian_batch_with_status(pairdists)
+
+    np.testing.assert_array_equal(status, EmbeddingStatus.COLLINEAR)
+    np.testing.assert_allclose(
+        cartesian_to_pairdistance_batch(embedded), pairdists, atol=1.0e-6
+    )
+
+
+def test_round_off_negative_squares_are_clamped():
+    # an equilateral triangle with a fourth point at its centre, in the plane
+    height = np.sqrt(3.0) / 2.0
+    points = np.array(
+        [
+            [
+                [0.0, 0.0, 0.0],
+                [1.0, 0.0, 0.0],
+                [0.5, height, 0.0],
+                [0.5, height / 3.0, 0.0],
+            ]
+        ]
+    )
+    pairdists = cartesian_to_pairdistance_batch(points) * (1.0 - 1.0e-13)
+
+    embedded, status = pairdistance_to_cartesian_batch_with_status(pairdists)
+
+    assert status[0] in (EmbeddingStatus.OK, EmbeddingStatus.PLANAR)
+    assert np.all(np.isfinite(embedded))
+
+
+def test_non_embeddable_rows_are_nan():
+    pairdists = cartesian_to_pairdistance_batch(random_cartesian_batch(3, seed=3))
+    pairdists[1, 3] = pairdists[1, 0] + pairdists[1, 1] + 1.0  # breaks a triangle
+    pairdists[2, 0] = 0.0
+
+    embedded, status = pairdistance_to_cartesian_batch_with_status(pairdists)
+
+    np.testing.assert_array_equal(
+        status,
+        [
+            EmbeddingStatus.OK,
+            EmbeddingStatus.NON_EMBEDDABLE,
+            EmbeddingStatus.NON_EMBEDDABLE,
+        ],
+    )
+    assert np.all(np.isfinite(embedded[0]))
+    assert np.all(np.isnan(embedded[1:]))
+
+
+def test_no_warnings_for_bad_rows():
+    pairdists = np.array([[1.0, 1.0, 1.0, 1.0, 1.0, 5.0], [0.0] * 6, [np.nan] * 6])
+
+    with np.errstate(all="raise"):
+        _, status = pairdistance_to_cartesian_batch_with_status(pairdists)
+
+    np.testing.assert_array_equal(status, EmbeddingStatus.NON_EMBEDDABLE)
+
+
+def test_wrong_shape_raises():
+    with pytest.raises(ValueError):
+        pairdistance_to_cartesian_batch_with_status(np.zeros((3, 5)))
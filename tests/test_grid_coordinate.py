@@ -1,3 +1,5 @@
+import dataclasses
+
 import pytest
 
 
@@ -44,6 +46,18 @@ class TestGridCoordinate:
         with pytest.raises(AssertionError):
             GridCoordinate(*coordinates)
 
+    def test_is_slotted_and_frozen(self):
+        gc = GridCoordinate(0.1, 0.2, 1.3, 1.4, 1.1, 0.6)
+
+        assert not hasattr(gc, "__dict__")
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            gc.grid_u1 = 0.5  # type: ignore[misc]
+
+        assert gc == GridCoordinate(
+            grid_u1=0.1, grid_u2=0.2, grid_u3=1.3, grid_t3=1.4, grid_s3=1.1, grid_w3=0.6
+        )
+        assert hash(gc) == hash(GridCoordinate(*gc.unpack()))
+
     def test_approx_eq(self):
         n_attempts = 100
         for _ in range(n_attempts):
@@ -0,0 +1,147 @@
+import numpy as np
+import pytest
+
+from frolov.conversions import cartesian_to_pairdistance_batch
+from frolov.conversions import get_batch_conversion
+from frolov.conversions import grid_to_perimetric_batch
+from frolov.conversions import perimetric_to_pairdistance_batch
+
+from frolov.coordinates.grid_coordinate import GridCoordinate
+from frolov.coordinates.pairdistance_coordinate import PairDistanceCoordinate
+
+from frolov.jacobians import chain_jacobians
+from frolov.jacobians import get_batch_jacobian
+from frolov.jacobians import grid_to_perimetric_jacobian
+from frolov.jacobians import grid_to_perimetric_jacobian_batch
+from frolov.jacobians import pairdistance_to_cartesian_jacobian
+from frolov.jacobians import perimetric_to_pairdistance_jacobian_batch
+
+from randomgen import random_cartesian_batch
+from randomgen import random_embeddable_grid_batch
+
+
+def finite_difference_jacobians(conversion, coords, step=1.0e-6):
+    """Central finite differences of a batched conversion, with flattened values."""
+    n_coords = coords.shape[0]
+    flat_inputs = coords.reshape(n_coords, -1)
+    n_inputs = flat_inputs.shape[1]
+
+    columns = []
+    for i_input in range(n_inputs):
+        shift = np.zeros(n_inputs)
+        shift[i_input] = step
+        above = conversion((flat_inputs + shift).reshape(coords.shape))
+        below = conversion((flat_inputs - shift).reshape(coords.shape))
+        columns.append((above - below).reshape(n_coords, -1) / (2.0 * step))
+
+    return np.stack(columns, axis=2)
+
+
+def random_coords(kind, n_coords=20, seed=0):
+    gridcoords = random_embeddable_grid_batch(
+        n_coords, maximum_grid_value=3.0, seed=seed
+    )
+    if kind == "cartesian":
+        return random_cartesian_batch(n_coords, seed=seed)
+
+    return get_batch_conversion("grid", kind)(gridcoords)
+
+
+NEIGHBOURS = [
+    ("grid", "perimetric"),
+    ("perimetric", "grid"),
+    ("perimetric", "pairdistance"),
+    ("pairdistance", "perimetric"),
+    ("pairdistance", "cartesian"),
+    ("cartesian", "pairdistance"),
+]
+
+
+@pytest.mark.parametrize("from_, to", NEIGHBOURS)
+def test_matches_finite_differences(from_, to):
+    coords = random_coords(from_)
+    jacobians = get_batch_jacobian(from_, to)(coords)
+    expected = finite_difference_jacobians(get_batch_conversion(from_, to), coords)
+
+    np.testing.assert_allclose(jacobians, expected, rtol=1.0e-5, atol=1.0e-6)
+
+
+@pytest.mark.parametrize(
+    "from_, to",
+    [("grid", "cartesian"), ("grid", "pairdistance"), ("cartesian", "grid")],
+)
+def test_composed_paths_match_finite_differences(from_, to):
+    coords = random_coords(from_)
+    if from_ == "cartesian":
+        # keep the geometries inside the region allowed by the grid constraints
+        coords = get_batch_conversion("grid", "cartesian")(random_coords("grid"))
+
+    jacobians = get_batch_jacobian(from_, to)(coords)
+    expected = finite_difference_jacobians(get_batch_conversion(from_, to), coords)
+
+    np.testing.assert_allclose(jacobians, expected, rtol=1.0e-5, atol=1.0e-5)
+
+
+def test_identity_jacobian():
+    coords = random_coords("grid", n_coords=3)
+    jacobians = get_batch_jacobian("grid", "grid")(coords)
+
+    np.testing.assert_array_equal(jacobians, np.broadcast_to(np.eye(6), (3, 6, 6)))
+
+
+def test_jacobian_shapes():
+    assert get_batch_jacobian("grid", "cartesian")(random_coords("grid")).shape == (
+        20,
+        12,
+        6,
+    )
+    cartesian = random_cartesian_batch(5)
+    assert get_batch_jacobian("cartesian", "pairdistance")(cartesian).shape == (
+        5,
+        6,
+        12,
+    )
+
+
+def test_chain_jacobians_applies_in_conversion_order():
+    gridcoords = random_coords("grid")
+    perimetrics = grid_to_perimetric_batch(gridcoords)
+
+    jacobians = chain_jacobians(
+        grid_to_perimetric_jacobian_batch(gridcoords),
+        perimetric_to_pairdistance_jacobian_batch(perimetrics),
+    )
+    expected = finite_difference_jacobians(
+        lambda g: perimetric_to_pairdistance_batch(grid_to_perimetric_batch(g)),
+        gridcoords,
+    )
+
+    np.testing.assert_allclose(jacobians, expected, rtol=1.0e-5, atol=1.0e-6)
+
+
+def test_chain_jacobians_needs_arguments():
+    with pytest.raises(ValueError):
+        chain_jacobians()
+
+
+def test_scalar_matches_batch():
+    gridcoord = GridCoordinate(1.0, 2.0, 1.5, 1.2, 1.1, 0.5)
+    expected = grid_to_perimetric_jacobian_batch(np.array([gridcoord.unpack()]))[0]
+
+    np.testing.assert_array_equal(grid_to_perimetric_jacobian(gridcoord), expected)
+
+
+def test_cartesian_jacobian_of_regular_tetrahedron():
+    pairdists = PairDistanceCoordinate(1.0, 1.0, 1.0, 1.0, 1.0, 1.0)
+    jacobian = pairdistance_to_cartesian_jacobian(pairdists)
+
+    assert jacobian.shape == (12, 6)
+    assert np.all(np.isfinite(jacobian))
+
+    # moving the geometry along the Jacobian columns must reproduce the pair distances
+    points = get_batch_conversion("pairdistance", "cartesian")(
+        np.array([pairdists.unpack()])
+    )
+    np.testing.assert_allclose(
+        cartesian_to_pairdistance_batch(points)[0], pairdists.unpack()
+    )
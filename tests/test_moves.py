@@ -0,0 +1,140 @@
+import numpy as np
+import pytest
+
+from frolov.conversions import cartesian_to_pairdistance_batch
+from frolov.conversions import pairdistance_to_perimetric_batch
+from frolov.conversions import perimetric_to_grid_batch
+from frolov.moves import Walker
+from frolov.moves import WalkerBatch
+from randomgen import random_cartesian_batch
+
+
+def expected_coordinates(points):
+    pairdists = cartesian_to_pairdistance_batch(points)
+    perimetrics = pairdistance_to_perimetric_batch(pairdists)
+    gridcoords = perimetric_to_grid_batch(perimetrics)
+
+    return (pairdists, perimetrics, gridcoords)
+
+
+def assert_walker_matches(walker, points):
+    pairdists, perimetrics, gridcoords = expected_coordinates(points[np.newaxis])
+    np.testing.assert_allclose(walker.positions, points)
+    np.testing.assert_allclose(walker.pairdists, pairdists[0], rtol=1e-12)
+    np.testing.assert_allclose(walker.perimetrics, perimetrics[0], atol=1e-12)
+    np.testing.assert_allclose(walker.gridcoords, gridcoords[0], rtol=1e-9)
+
+
+@pytest.mark.parametrize("i_particle", [0, 1, 2, 3])
+def test_walker_move_matches_full_recalculation(i_particle):
+    points = random_cartesian_batch(1, seed=0)[0]
+    new_position = np.array([0.3, -0.2, 0.7])
+
+    walker = Walker(points)
+    walker.move(i_particle, new_position)
+
+    points[i_particle] = new_position
+    assert_walker_matches(walker, points)
+
+
+def test_walker_many_moves_do_not_drift():
+    rng = np.random.default_rng(1)
+    points = random_cartesian_batch(1, seed=1)[0]
+    walker = Walker(points)
+
+    for _ in range(2000):
+        i_particle = int(rng.integers(4))
+        points[i_particle] += rng.normal(scale=0.05, size=3)
+        walker.move(i_particle, points[i_particle])
+
+    assert_walker_matches(walker, points)
+
+
+def test_walker_moved_leaves_original_unchanged():
+    points = random_cartesian_batch(1, seed=2)[0]
+    walker = Walker(points)
+
+    proposal = walker.moved(1, [1.0, 1.0, 1.0])
+
+    assert_walker_matches(walker, points)
+    assert proposal.pairdists != walker.pairdists
+
+
+def test_walker_coordinate_instances():
+    points = random_cartesian_batch(1, seed=3)[0]
+    walker = Walker(points)
+
+    assert walker.pairdistance_coordinate().unpack() == walker.pairdists
+    assert walker.perimetric_coordinate().unpack() == walker.perimetrics
+
+
+@pytest.mark.parametrize("i_particle", [-1, 4])
+def test_walker_rejects_invalid_particle(i_particle):
+    walker = Walker(random_cartesian_batch(1, seed=4)[0])
+    with pytest.raises(ValueError):
+        walker.move(i_particle, [0.0, 0.0, 0.0])
+
+
+def test_walker_rejects_invalid_shape():
+    with pytest.raises(ValueError):
+        Walker(np.zeros((3, 3)))
+
+
+@pytest.mark.parametrize("i_particle", [0, 1, 2, 3])
+def test_batch_move_matches_full_recalculation(i_particle):
+    points = random_cartesian_batch(50, seed=5)
+    new_positions = random_cartesian_batch(50, seed=6)[:, 0]
+
+    walkers = WalkerBatch(points)
+    walkers.move(i_particle, new_positions)
+
+    points[:, i_particle] = new_positions
+    pairdists, perimetrics, gridcoords = expected_coordinates(points)
+    np.testing.assert_allclose(walkers.positions, points)
+    np.testing.assert_allclose(walkers.pairdists, pairdists, rtol=1e-12)
+    np.testing.assert_allclose(walkers.perimetrics, perimetrics, atol=1e-12)
+    np.testing.assert_allclose(walkers.gridcoords, gridcoords, rtol=1e-9)
+
+
+def test_batch_move_with_per_walker_particles():
+    points = random_cartesian_batch(40, seed=7)
+    new_positions = random_cartesian_batch(40, seed=8)[:, 0]
+    i_particles = np.arange(40) % 4
+
+    walkers = WalkerBatch(points)
+    walkers.move(i_particles, new_positions)
+
+    points[np.arange(40), i_particles] = new_positions
+    pairdists, perimetrics, _ = expected_coordinates(points)
+    np.testing.assert_allclose(walkers.pairdists, pairdists, rtol=1e-12)
+    np.testing.assert_allclose(walkers.perimetrics, perimetrics, atol=1e-12)
+
+
+def test_batch_accept_copies_only_masked_walkers():
+    points = random_cartesian_batch(10, seed=9)
+    new_positions = random_cartesian_batch(10, seed=10)[:, 0]
+    mask = np.arange(10) % 2 == 0
+
+    walkers = WalkerBatch(points)
+    proposal = walkers.moved(2, new_positions)
+    np.testing.assert_array_equal(walkers.positions, points)
+
+    walkers.accept(proposal, mask)
+
+    points[mask, 2] = new_positions[mask]
+    pairdists, perimetrics, _ = expected_coordinates(points)
+    np.testing.assert_allclose(walkers.pairdists, pairdists, rtol=1e-12)
+    np.testing.assert_allclose(walkers.perimetrics, perimetrics, atol=1e-12)
+
+
+def test_batch_rejects_invalid_arguments():
+    walkers = WalkerBatch(random_cartesian_batch(5, seed=11))
+
+    with pytest.raises(ValueError):
+        walkers.move(0, np.zeros((4, 3)))
+    with pytest.raises(ValueError):
+        walkers.move(4, np.zeros((5, 3)))
+    with pytest.raises(ValueError):
+        walkers.move(np.array([0, 1, 2, 3, 5]), np.zeros((5, 3)))
+    with pytest.raises(ValueError):
+        walkers.accept(WalkerBatch(random_cartesian_batch(4, seed=12)))
@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+
+from frolov.conversions import grid_to_cartesian_batch
+from frolov.conversions import grid_to_perimetric_batch
+from frolov.parallel import ParallelConverter
+
+from randomgen import random_embeddable_grid_batch
+from randomgen import random_grid_batch
+
+
+class TestParallelConverter:
+    def test_matches_serial_conversion(self):
+        gridcoords = random_embeddable_grid_batch(1000)
+
+        with ParallelConverter("grid", "cartesian", n_workers=2, chunk_size=128) as pc:
+            points = pc.convert(gridcoords)
+
+        np.testing.assert_array_equal(points, grid_to_cartesian_batch(gridcoords))
+
+    def test_reuse_between_calls(self):
+        with ParallelConverter("grid", "perimetric", n_workers=2, chunk_size=50) as pc:
+            for n_rows in [120, 333]:
+                gridcoords = random_grid_batch(n_rows)
+                perimetrics = pc.convert(gridcoords)
+
+                np.testing.assert_array_equal(
+                    perimetrics, grid_to_perimetric_batch(gridcoords)
+                )
+
+    def test_small_input_converted_in_process(self):
+        gridcoords = random_grid_batch(10)
+
+        with ParallelConverter("grid", "perimetric", n_workers=2, chunk_size=50) as pc:
+            perimetrics = pc.convert(gridcoords)
+            assert pc._executor is None
+
+        np.testing.assert_array_equal(perimetrics, grid_to_perimetric_batch(gridcoords))
+
+    def test_settings(self):
+        pc = ParallelConverter("grid", "cartesian", n_workers=3, chunk_size=7)
+
+        assert pc.n_workers == 3
+        assert pc.chunk_size == 7
+
+    def test_raises_invalid_shape(self):
+        with ParallelConverter("cartesian", "grid", n_workers=2) as pc:
+            with pytest.raises(ValueError):
+                pc.convert(np.ones((10, 6)))
+
+    @pytest.mark.parametrize("n_workers, chunk_size", [(0, 10), (2, 0)])
+    def test_raises_invalid_settings(self, n_workers, chunk_size):
+        with pytest.raises(ValueError):
+            ParallelConverter("grid", "cartesian", n_workers, chunk_size)
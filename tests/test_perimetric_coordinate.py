@@ -2,11 +2,15 @@ import pytest
 
 import math
 
+import numpy as np
+
 from cartesian import Cartesian3D
 
 from frolov.conversions import cartesian_to_pairdistance
 from frolov.conversions import pairdistance_to_perimetric
 from frolov.coordinates.cartesian_coordinate import CartesianCoordinate
+from frolov.coordinates.perimetric_coordinate import PerimetricCoordinate
+from frolov.validation import validation_mode
 
 from randomgen import random_cartesian_coordinate
 
@@ -64,3 +68,27 @@ def test_inequality_satisfaction():
         cartcoord = random_cartesian_coordinate(cube_sidelen)
         pairdists = cartesian_to_pairdistance(cartcoord)
         pairdistance_to_perimetric(pairdists)
+
+
+def test_inequalities_match_equation_32():
+    """
+    The inequalities are checked without calling 'max()' and 'min()'; compare them
+    against the limits exactly as written in equation (32) of the paper.
+    """
+    rng = np.random.default_rng(0)
+    with validation_mode("off"):
+        for values in rng.uniform(-0.5, 2.0, size=(2000, 6)):
+            u1, u2, u3, t3, s3, w3 = values.tolist()
+            perimetrics = PerimetricCoordinate(u1, u2, u3, t3, s3, w3)
+
+            s3_lower = max(0.0, u3 - t3)
+            s3_upper = u2 + u3
+            w3_lower = max(0.0, u3 - t3, s3 - u2)
+            w3_upper = min(u1 + u3, u1 + s3)
+
+            assert perimetrics._satisfies_s3_inequality() == (
+                s3_lower <= s3 <= s3_upper
+            )
+            assert perimetrics._satisfies_w3_inequality() == (
+                w3_lower <= w3 <= w3_upper
+            )
@@ -0,0 +1,133 @@
+import numpy as np
+import pytest
+
+from frolov.conversions import get_batch_conversion
+from frolov.conversions import grid_to_cartesian_batch
+from frolov.conversions import grid_to_perimetric_batch
+from frolov.conversions import pairdistance_to_cartesian_batch
+from frolov.conversions import pairdistance_to_cartesian_batch_with_status
+from frolov.conversions import perimetric_to_pairdistance_batch
+from frolov.coordinates.grid_coordinate import GridCoordinateBatch
+from frolov.coordinates.grid_coordinate import grid_approx_eq
+from frolov.precision import approx_eq_eps_sq
+from frolov.precision import resolve_dtype
+from frolov.sampling import GridSampler
+from frolov.storage import open_memmap
+from frolov.storage import read_header
+from frolov.storage import save
+
+from randomgen import random_embeddable_grid_batch
+from randomgen import random_grid_batch
+
+
+def test_resolve_dtype():
+    assert resolve_dtype(None) == np.float64
+    assert resolve_dtype("float32") == np.float32
+    assert resolve_dtype(np.float64) == np.float64
+
+    with pytest.raises(ValueError):
+        resolve_dtype(np.float16)
+    with pytest.raises(ValueError):
+        resolve_dtype(np.int64)
+
+
+def test_approx_eq_eps_sq():
+    assert approx_eq_eps_sq(np.float64, 1.0e6) == 1.0e-6
+    assert approx_eq_eps_sq(np.float32, 1.0) == 1.0e-6
+    assert approx_eq_eps_sq(np.float32, 1000.0) > 1.0e-6
+
+
+@pytest.mark.parametrize("dtype", [np.float32, np.float64])
+def test_six_value_conversion_dtype(dtype):
+    gridcoords = random_grid_batch(100, seed=0)
+
+    perimetrics = grid_to_perimetric_batch(gridcoords, dtype=dtype)
+
+    assert perimetrics.dtype == dtype
+    np.testing.assert_allclose(
+        perimetrics, grid_to_perimetric_batch(gridcoords), rtol=1.0e-5
+    )
+
+
+def test_default_dtype_is_float64():
+    gridcoords = random_grid_batch(10, seed=1).astype(np.float32)
+    assert grid_to_perimetric_batch(gridcoords).dtype == np.float64
+
+
+def test_cartesian_is_placed_in_float64():
+    gridcoords = random_embeddable_grid_batch(200, seed=2)
+    pairdists = perimetric_to_pairdistance_batch(grid_to_perimetric_batch(gridcoords))
+
+    expected = pairdistance_to_cartesian_batch(pairdists).astype(np.float32)
+
+    np.testing.assert_array_equal(
+        pairdistance_to_cartesian_batch(pairdists, dtype=np.float32), expected
+    )
+    np.testing.assert_array_equal(
+        grid_to_cartesian_batch(gridcoords, dtype=np.float32),
+        grid_to_cartesian_batch(gridcoords).astype(np.float32),
+    )
+
+    points, _ = pairdistance_to_cartesian_batch_with_status(pairdists, dtype=np.float32)
+    np.testing.assert_array_equal(points, expected)
+
+
+def test_get_batch_conversion_rounds_only_the_result():
+    gridcoords = random_embeddable_grid_batch(100, seed=3)
+
+    convert = get_batch_conversion("perimetric", "cartesian", dtype="float32")
+    perimetrics = grid_to_perimetric_batch(gridcoords)
+    points = convert(perimetrics)
+
+    expected = get_batch_conversion("perimetric", "cartesian")(perimetrics)
+    assert points.dtype == np.float32
+    np.testing.assert_array_equal(points, expected.astype(np.float32))
+
+    assert get_batch_conversion("grid", "grid", np.float32)(gridcoords).dtype == (
+        np.float32
+    )
+
+
+def test_batch_dtype():
+    gridcoords = random_grid_batch(20, seed=4)
+
+    batch = GridCoordinateBatch(gridcoords, dtype=np.float32)
+    assert batch.dtype == np.float32
+    assert batch.data.nbytes == 20 * 6 * 4
+    assert grid_approx_eq(batch[3], GridCoordinateBatch(gridcoords)[3])
+
+    assert GridCoordinateBatch(gridcoords).dtype == np.float64
+    assert batch.astype(np.float64).dtype == np.float64
+    assert GridCoordinateBatch.concatenate([batch, batch]).dtype == np.float32
+
+
+def test_sampler_dtype():
+    sampler = GridSampler(seed=5, dtype=np.float32)
+    reference = GridSampler(seed=5)
+
+    points = sampler.sample(64)
+
+    assert points.dtype == np.float32
+    np.testing.assert_array_equal(points, reference.sample(64).astype(np.float32))
+    assert all(child.dtype == np.float32 for child in sampler.spawn(2))
+
+
+def test_save_keeps_float32(tmp_path):
+    gridcoords = random_grid_batch(30, seed=6).astype(np.float32)
+    path = tmp_path / "grid.frolov"
+
+    save(path, gridcoords, kind="grid")
+
+    assert read_header(path).dtype == np.dtype(np.float32).str
+    np.testing.assert_array_equal(open_memmap(path).data, gridcoords)
+
+
+def test_save_with_dtype(tmp_path):
+    gridcoords = random_grid_batch(30, seed=7)
+    path = tmp_path / "grid.frolov"
+
+    save(path, GridCoordinateBatch(gridcoords), dtype="float32")
+
+    batch = open_memmap(path)
+    assert batch.dtype == np.float32
+    np.testing.assert_array_equal(batch.data, gridcoords.astype(np.float32))
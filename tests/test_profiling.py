@@ -0,0 +1,107 @@
+import json
+
+import numpy as np
+import pytest
+
+from frolov import profiling
+from frolov.conversions import get_batch_conversion
+from frolov.conversions import grid_to_cartesian_batch
+from frolov.conversions import grid_to_perimetric
+from frolov.conversions import grid_to_perimetric_batch
+from frolov.validation import validate_grid_batch
+
+from randomgen import random_embeddable_grid_batch
+from randomgen import random_grid_coordinate
+
+
+@pytest.fixture(autouse=True)
+def restore_profiling():
+    yield
+    profiling.disable_profiling()
+    profiling.get_registry().reset()
+
+
+def test_nothing_recorded_when_disabled():
+    grid_to_perimetric_batch(random_embeddable_grid_batch(10))
+
+    assert profiling.get_registry().as_dict() == {}
+
+
+def test_batch_calls_and_rows():
+    gridcoords = random_embeddable_grid_batch(25)
+
+    with profiling.profiling() as registry:
+        grid_to_cartesian_batch(gridcoords)
+        grid_to_cartesian_batch(gridcoords[:5])
+
+    stats = registry.stats("grid_to_cartesian_batch")
+    assert stats.calls == 2
+    assert stats.rows == 30
+    assert stats.seconds > 0.0
+
+
+def test_scalar_calls_are_not_recorded():
+    with profiling.profiling() as registry:
+        for _ in range(3):
+            grid_to_perimetric(random_grid_coordinate())
+
+    assert registry.as_dict() == {}
+
+
+def test_scalar_loop_as_stage():
+    with profiling.profiling() as registry:
+        with profiling.stage("scalar_loop", rows=3):
+            for _ in range(3):
+                grid_to_perimetric(random_grid_coordinate())
+
+    stats = registry.stats("scalar_loop")
+    assert (stats.calls, stats.rows) == (1, 3)
+
+
+def test_chained_conversion_records_each_step():
+    gridcoords = random_embeddable_grid_batch(10)
+
+    with profiling.profiling() as registry:
+        get_batch_conversion("grid", "pairdistance")(gridcoords)
+
+    assert registry.stats("grid_to_perimetric_batch").calls == 1
+    assert registry.stats("perimetric_to_pairdistance_batch").calls == 1
+
+
+def test_validation_failures():
+    gridcoords = random_embeddable_grid_batch(10)
+    gridcoords[[2, 7], 5] = 2.0
+
+    with profiling.profiling() as registry:
+        validate_grid_batch(gridcoords)
+
+    stats = registry.stats("validate_grid_batch")
+    assert (stats.calls, stats.rows, stats.validation_failures) == (1, 10, 2)
+
+
+def test_user_stage():
+    with profiling.profiling() as registry:
+        with profiling.stage("potential", rows=4):
+            pass
+
+    assert registry.stats("potential").rows == 4
+
+
+def test_profiling_context_restores_state():
+    with profiling.profiling():
+        assert profiling.is_profiling_enabled()
+
+    assert not profiling.is_profiling_enabled()
+
+
+def test_export_and_merge():
+    with profiling.profiling() as registry:
+        grid_to_perimetric_batch(np.ones((4, 6)))
+
+    exported = json.loads(registry.to_json())
+    merged = profiling.ProfileRegistry()
+    merged.merge(exported)
+    merged.merge(exported)
+
+    assert merged.stats("grid_to_perimetric_batch").rows == 8
+    assert "grid_to_perimetric_batch" in profiling.profile_summary(merged)
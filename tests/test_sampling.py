@@ -0,0 +1,230 @@
+import numpy as np
+import pytest
+
+from frolov.sampling import GridBounds
+from frolov.sampling import GridSampler
+from frolov.sampling import SymmetryReducedSampler
+from frolov.sampling import fundamental_domain_mask
+from frolov.sampling import halton_points
+from frolov.sampling import sobol_points
+from frolov.conversions import grid_to_perimetric_batch
+from frolov.conversions import pairdistance_to_perimetric_batch
+from frolov.conversions import perimetric_to_grid_batch
+from frolov.conversions import perimetric_to_pairdistance_batch
+from frolov.symmetry import PERMUTATIONS
+from frolov.symmetry import permute_pairdistance_batch
+from frolov.validation import validate_grid_batch
+
+
+def test_sobol_first_points():
+    """The first points of the unscrambled Sobol sequence are known exactly."""
+    points = sobol_points(0, 4)
+
+    np.testing.assert_array_equal(points[0], np.zeros(6))
+    np.testing.assert_array_equal(points[1], np.full(6, 0.5))
+    np.testing.assert_array_equal(points[2, :2], [0.75, 0.25])
+    np.testing.assert_array_equal(points[3, :2], [0.25, 0.75])
+
+
+def test_halton_first_points():
+    points = halton_points(1, 2)
+
+    np.testing.assert_allclose(points[0], [1.0 / b for b in (2, 3, 5, 7, 11, 13)])
+    np.testing.assert_allclose(points[1, :2], [0.25, 2.0 / 3.0])
+
+
+@pytest.mark.parametrize("n_bits", [4, 8])
+def test_sobol_is_stratified(n_bits):
+    """
+    The first 2^k points of the Sobol sequence place exactly one point in each of the
+    2^k equal intervals along every axis.
+    """
+    n_points = 2**n_bits
+    points = sobol_points(0, n_points)
+
+    for i_dim in range(6):
+        bins = np.floor(points[:, i_dim] * n_points).astype(int)
+        np.testing.assert_array_equal(np.sort(bins), np.arange(n_points))
+
+
+@pytest.mark.parametrize("i_start", [0, 100, 1025])
+def test_sobol_offsets_are_consistent(i_start):
+    all_points = sobol_points(0, 2048)
+    np.testing.assert_array_equal(
+        sobol_points(i_start, 50), all_points[i_start : i_start + 50]
+    )
+
+
+class TestGridSampler:
+    @pytest.mark.parametrize("method", ["sobol", "halton"])
+    def test_samples_satisfy_grid_constraints(self, method):
+        sampler = GridSampler(method, seed=0)
+        gridcoords = sampler.sample(1000)
+
+        assert gridcoords.shape == (1000, 6)
+        assert validate_grid_batch(gridcoords).all_valid
+
+    def test_respects_bounds(self):
+        bounds = GridBounds(grid_u1=(2.0, 3.0), grid_s3=(1.5, 2.5), grid_w3=(0.2, 0.4))
+        gridcoords = GridSampler("sobol", bounds=bounds, seed=0).sample(512)
+
+        assert np.all(gridcoords >= bounds.lower)
+        assert np.all(gridcoords <= bounds.upper)
+
+    def test_sequence_continues_between_calls(self):
+        sampler0 = GridSampler("sobol", seed=42)
+        sampler1 = GridSampler("sobol", seed=42)
+
+        first = sampler0.sample(100)
+        second = sampler0.sample(100)
+
+        np.testing.assert_array_equal(
+            np.concatenate([first, second]), sampler1.sample(200)
+        )
+        assert sampler0.position == 200
+
+    def test_skip(self):
+        sampler0 = GridSampler("halton", seed=7)
+        sampler1 = GridSampler("halton", seed=7)
+
+        sampler0.skip(30)
+        np.testing.assert_array_equal(sampler0.sample(10), sampler1.sample(40)[30:])
+
+    @pytest.mark.parametrize("method", ["sobol", "halton"])
+    def test_spawned_streams_are_independent_and_reproducible(self, method):
+        streams0 = GridSampler(method, seed=3).spawn(4)
+        streams1 = GridSampler(method, seed=3).spawn(4)
+
+        samples = [stream.sample(64) for stream in streams0]
+        for i_stream, stream in enumerate(streams1):
+            np.testing.assert_array_equal(stream.sample(64), samples[i_stream])
+
+        for i_stream in range(1, 4):
+            assert not np.allclose(samples[0], samples[i_stream])
+
+    def test_unscrambled_matches_sequence(self):
+        sampler = GridSampler("sobol", scramble=False)
+        np.testing.assert_array_equal(sampler.sample_unit(16), sobol_points(0, 16))
+
+    def test_lower_discrepancy_than_random(self):
+        """
+        Compare the largest gap along each axis of the sampled points against that of
+        uniformly random points; the quasi-random points fill each axis more evenly.
+        """
+        n_points = 1024
+        quasi = GridSampler("sobol", seed=0).sample_unit(n_points)
+        random = np.random.default_rng(0).random((n_points, 6))
+
+        def largest_gap(points):
+            sorted_points = np.sort(points, axis=0)
+            return np.max(np.diff(sorted_points, axis=0))
+
+        assert largest_gap(quasi) < largest_gap(random)
+
+    def test_raises_unknown_method(self):
+        with pytest.raises(ValueError):
+            GridSampler("lhs")
+
+
+def labellings_in_bounds(gridcoords, bounds):
+    """The grid coordinates of every labelling of each geometry, and whether each is in the box."""
+    pairdists = perimetric_to_pairdistance_batch(grid_to_perimetric_batch(gridcoords))
+
+    labellings = []
+    for permutation in PERMUTATIONS:
+        permuted = permute_pairdistance_batch(pairdists, permutation)
+        labellings.append(
+            perimetric_to_grid_batch(pairdistance_to_perimetric_batch(permuted))
+        )
+
+    labellings = np.stack(labellings, axis=1)
+    return labellings, bounds.contains(labellings.reshape(-1, 6)).reshape(-1, 24)
+
+
+class TestFundamentalDomain:
+    @pytest.mark.parametrize(
+        "bounds",
+        [GridBounds(), GridBounds(grid_u1=(1.0, 2.0), grid_t3=(1.0, 3.0))],
+    )
+    def test_one_labelling_of_each_geometry_is_kept(self, bounds):
+        gridcoords = GridSampler(bounds=bounds, seed=0).sample(200)
+        labellings, in_bounds = labellings_in_bounds(gridcoords, bounds)
+
+        for row_labellings, row_in_bounds in zip(labellings, in_bounds):
+            kept = fundamental_domain_mask(row_labellings[row_in_bounds], bounds)
+            assert np.count_nonzero(kept) == 1
+
+    def test_keeps_identity_when_no_other_labelling_is_in_the_box(self):
+        bounds = GridBounds()
+        gridcoords = GridSampler(bounds=bounds, seed=1).sample(500)
+        _, in_bounds = labellings_in_bounds(gridcoords, bounds)
+
+        only_identity = np.count_nonzero(in_bounds, axis=1) == 1
+        assert np.any(only_identity)
+        assert np.all(fundamental_domain_mask(gridcoords[only_identity], bounds))
+
+
+class TestSymmetryReducedSampler:
+    def test_samples_lie_in_the_fundamental_domain(self):
+        bounds = GridBounds(grid_u1=(1.0, 2.0), grid_w3=(0.1, 0.9))
+        sampler = SymmetryReducedSampler(bounds=bounds, seed=0)
+        gridcoords = sampler.sample(3000)
+
+        assert gridcoords.shape == (3000, 6)
+        assert np.all(bounds.contains(gridcoords))
+        assert np.all(fundamental_domain_mask(gridcoords, bounds))
+
+    def test_reports_efficiency(self):
+        sampler = SymmetryReducedSampler(seed=0)
+        assert np.isnan(sampler.efficiency)
+
+        sampler.sample(1000)
+
+        assert sampler.n_accepted >= 1000
+        assert sampler.efficiency == sampler.n_accepted / sampler.n_drawn
+        assert 1.0 / len(PERMUTATIONS) <= sampler.efficiency < 1.0
+
+    def test_sequence_continues_between_calls(self):
+        sampler0 = SymmetryReducedSampler("halton", seed=5)
+        sampler1 = SymmetryReducedSampler("halton", seed=5)
+
+        first = sampler0.sample(700)
+        second = sampler0.sample(900)
+
+        np.testing.assert_array_equal(
+            np.concatenate([first, second]), sampler1.sample(1600)
+        )
+
+    def test_matches_filtered_grid_sampler(self):
+        sampler = SymmetryReducedSampler(seed=2)
+        gridcoords = sampler.sample(100)
+
+        candidates = GridSampler(seed=2).sample(sampler.n_drawn)
+        expected = candidates[fundamental_domain_mask(candidates)]
+
+        np.testing.assert_array_equal(gridcoords, expected[:100])
+
+    def test_dtype(self):
+        gridcoords = SymmetryReducedSampler(seed=0, dtype=np.float32).sample(10)
+        assert gridcoords.dtype == np.float32
+
+    def test_spawned_streams_are_reproducible(self):
+        streams0 = SymmetryReducedSampler(seed=3).spawn(2)
+        streams1 = SymmetryReducedSampler(seed=3).spawn(2)
+
+        np.testing.assert_array_equal(streams0[1].sample(50), streams1[1].sample(50))
+        assert not np.allclose(streams0[0].sample(50), streams0[1].sample(50))
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {"grid_u1": (-1.0, 1.0)},
+        {"grid_u3": (0.5, 2.0)},
+        {"grid_w3": (0.0, 1.5)},
+        {"grid_t3": (3.0, 2.0)},
+    ],
+)
+def test_grid_bounds_raises_outside_grid_constraints(kwargs):
+    with pytest.raises(ValueError):
+        GridBounds(**kwargs)
@@ -0,0 +1,245 @@
+import numpy as np
+import pytest
+
+from frolov.conversions import get_batch_conversion
+from frolov.conversions import pairdistance_to_perimetric_batch
+from frolov.conversions import perimetric_to_grid_batch
+from frolov.scan import CHECKPOINT_SUFFIX
+from frolov.scan import EnergyCache
+from frolov.scan import scan_potential
+from frolov.symmetry import PERMUTATIONS
+from frolov.symmetry import permute_pairdistance_batch
+
+from randomgen import random_embeddable_grid_batch
+
+
+def pair_potential(pairdists):
+    """A scalar sum of pair energies, which does not depend on the particle labels."""
+    return float(np.sum(1.0 / pairdists**12 - 1.0 / pairdists**6))
+
+
+def vectorized_pair_potential(pairdists):
+    return np.sum(1.0 / pairdists**12 - 1.0 / pairdists**6, axis=1)
+
+
+def cartesian_potential(points):
+    """The squared distance of the last particle from the origin."""
+    return float(np.dot(points[3], points[3]))
+
+
+def expected_energies(gridcoords):
+    pairdists = get_batch_conversion("grid", "pairdistance")(gridcoords)
+    return vectorized_pair_potential(pairdists)
+
+
+class CountingPotential:
+    def __init__(self, fail_after=None):
+        self.n_calls = 0
+        self.fail_after = fail_after
+
+    def __call__(self, pairdists):
+        if self.fail_after is not None and self.n_calls >= self.fail_after:
+            raise RuntimeError("interrupted")
+        self.n_calls += 1
+        return vectorized_pair_potential(pairdists)
+
+
+@pytest.fixture
+def gridcoords():
+    return random_embeddable_grid_batch(100, seed=0)
+
+
+class TestScanPotential:
+    @pytest.mark.parametrize("n_workers", [1, 3])
+    def test_scalar_potential(self, tmp_path, gridcoords, n_workers):
+        output = tmp_path / "energies.npy"
+        summary = scan_potential(
+            gridcoords,
+            pair_potential,
+            output,
+            kind="pairdistance",
+            n_workers=n_workers,
+            chunk_size=16,
+        )
+
+        np.testing.assert_allclose(np.load(output), expected_energies(gridcoords))
+        assert summary.n_rows == 100
+        assert summary.n_evaluated == 100
+        assert summary.n_resumed == summary.n_cached == 0
+
+    def test_vectorized_potential(self, tmp_path, gridcoords):
+        output = tmp_path / "energies.npy"
+        scan_potential(
+            gridcoords,
+            vectorized_pair_potential,
+            output,
+            kind="pairdistance",
+            vectorized=True,
+            chunk_size=30,
+        )
+
+        np.testing.assert_allclose(np.load(output), expected_energies(gridcoords))
+
+    def test_cartesian_potential_in_process_pool(self, tmp_path, gridcoords):
+        output = tmp_path / "energies.npy"
+        scan_potential(
+            gridcoords, cartesian_potential, output, n_workers=2, pool="process"
+        )
+
+        points = get_batch_conversion("grid", "cartesian")(gridcoords)
+        expected = np.einsum("ij,ij->i", points[:, 3], points[:, 3])
+        np.testing.assert_allclose(np.load(output), expected)
+
+    def test_resumes_after_interruption(self, tmp_path, gridcoords):
+        output = tmp_path / "energies.npy"
+        interrupted = CountingPotential(fail_after=3)
+        with pytest.raises(RuntimeError):
+            scan_potential(
+                gridcoords,
+                interrupted,
+                output,
+                kind="pairdistance",
+                vectorized=True,
+                chunk_size=10,
+            )
+
+        partial = np.load(output)
+        assert np.count_nonzero(np.isfinite(partial)) == 30
+        checkpoint = output.with_name(output.name + CHECKPOINT_SUFFIX)
+        assert len(checkpoint.read_text().splitlines()) == 4
+
+        resumed = CountingPotential()
+        summary = scan_potential(
+            gridcoords,
+            resumed,
+            output,
+            kind="pairdistance",
+            vectorized=True,
+            chunk_size=10,
+        )
+
+        assert resumed.n_calls == 7
+        assert summary.n_resumed == 30
+        assert summary.n_evaluated == 70
+        np.testing.assert_allclose(np.load(output), expected_energies(gridcoords))
+
+    def test_restarts_without_resume(self, tmp_path, gridcoords):
+        output = tmp_path / "energies.npy"
+        kwargs = dict(kind="pairdistance", vectorized=True, chunk_size=10)
+        scan_potential(gridcoords, CountingPotential(), output, **kwargs)
+
+        potential = CountingPotential()
+        summary = scan_potential(gridcoords, potential, output, resume=False, **kwargs)
+
+        assert potential.n_calls == 10
+        assert summary.n_resumed == 0
+
+    def test_raises_checkpoint_of_different_scan(self, tmp_path, gridcoords):
+        output = tmp_path / "energies.npy"
+        kwargs = dict(kind="pairdistance", vectorized=True)
+        scan_potential(gridcoords, vectorized_pair_potential, output, **kwargs)
+
+        with pytest.raises(ValueError):
+            scan_potential(gridcoords[:50], vectorized_pair_potential, output, **kwargs)
+
+    def test_raises_wrong_number_of_energies(self, tmp_path, gridcoords):
+        with pytest.raises(ValueError):
+            scan_potential(
+                gridcoords,
+                lambda coords: np.zeros(3),
+                tmp_path / "energies.npy",
+                kind="pairdistance",
+                vectorized=True,
+            )
+
+    @pytest.mark.parametrize(
+        "kwargs",
+        [{"kind": "spherical"}, {"chunk_size": 0}, {"n_workers": 0}, {"pool": "gpu"}],
+    )
+    def test_raises_invalid_arguments(self, tmp_path, gridcoords, kwargs):
+        with pytest.raises(ValueError):
+            scan_potential(
+                gridcoords, pair_potential, tmp_path / "energies.npy", **kwargs
+            )
+
+
+class TestEnergyCache:
+    def test_skips_cached_and_permuted_geometries(self, tmp_path, gridcoords):
+        pairdists = get_batch_conversion("grid", "pairdistance")(gridcoords)
+        permuted = permute_pairdistance_batch(pairdists, PERMUTATIONS[5])
+        permuted_gridcoords = perimetric_to_grid_batch(
+            pairdistance_to_perimetric_batch(permuted)
+        )
+
+        with EnergyCache(tmp_path / "cache.sqlite") as cache:
+            scan_potential(
+                gridcoords,
+                pair_potential,
+                tmp_path / "first.npy",
+                kind="pairdistance",
+                cache=cache,
+            )
+            assert len(cache) == 100
+
+            potential = CountingPotential()
+            summary = scan_potential(
+                permuted_gridcoords,
+                potential,
+                tmp_path / "second.npy",
+                kind="pairdistance",
+                vectorized=True,
+                cache=cache,
+            )
+
+        assert potential.n_calls == 0
+        assert summary.n_cached == 100
+        np.testing.assert_allclose(
+            np.load(tmp_path / "second.npy"), expected_energies(gridcoords)
+        )
+
+    def test_duplicates_are_evaluated_once(self, tmp_path, gridcoords):
+        repeated = np.concatenate([gridcoords[:20]] * 3)
+
+        with EnergyCache(tmp_path / "cache.sqlite") as cache:
+            summary = scan_potential(
+                repeated,
+                pair_potential,
+                tmp_path / "energies.npy",
+                kind="pairdistance",
+                chunk_size=100,
+                cache=cache,
+            )
+
+        assert summary.n_evaluated == 20
+        assert summary.n_cached == 40
+        np.testing.assert_allclose(
+            np.load(tmp_path / "energies.npy"), expected_energies(repeated)
+        )
+
+    def test_persists_between_connections(self, tmp_path):
+        keys = [b"a", b"b", b"c"]
+        with EnergyCache(tmp_path / "cache.sqlite") as cache:
+            cache.put(keys, [1.0, np.nan, -np.inf])
+
+        with EnergyCache(tmp_path / "cache.sqlite") as cache:
+            found = cache.get(keys + [b"d"])
+
+        assert found[b"a"] == 1.0
+        assert np.isnan(found[b"b"])
+        assert found[b"c"] == -np.inf
+        assert b"d" not in found
+
+    def test_symmetric_keys(self, tmp_path, gridcoords):
+        pairdists = get_batch_conversion("grid", "pairdistance")(gridcoords)
+        permuted = permute_pairdistance_batch(pairdists, PERMUTATIONS[-1])
+
+        with EnergyCache(tmp_path / "symmetric.sqlite") as cache:
+            assert cache.keys(pairdists) == cache.keys(permuted)
+        with EnergyCache(tmp_path / "labelled.sqlite", symmetric=False) as cache:
+            assert cache.keys(pairdists) != cache.keys(permuted)
+
+    def test_raises_different_settings(self, tmp_path):
+        EnergyCache(tmp_path / "cache.sqlite", decimals=8).close()
+
+        with pytest.raises(ValueError):
+            EnergyCache(tmp_path / "cache.sqlite", decimals=6)
@@ -0,0 +1,143 @@
+import numpy as np
+import pytest
+
+from frolov.coordinates.grid_coordinate import GridCoordinateBatch
+from frolov.selection import farthest_point_sampling
+from frolov.selection import greedy_k_center
+from randomgen import random_grid_batch
+
+
+def brute_force_fps(data, n_select, start, weights=None):
+    weights = np.ones(data.shape[1]) if weights is None else np.asarray(weights)
+    chosen = [start]
+    while len(chosen) < n_select:
+        dist_sq = ((data[:, np.newaxis, :] - data[chosen]) ** 2 * weights).sum(axis=2)
+        chosen.append(int(np.argmax(dist_sq.min(axis=1))))
+
+    return np.array(chosen)
+
+
+def brute_force_fps_from(data, chosen, n_select):
+    chosen = list(chosen)
+    n_initial = len(chosen)
+    while len(chosen) < n_initial + n_select:
+        dist_sq = ((data[:, np.newaxis, :] - data[chosen]) ** 2).sum(axis=2)
+        chosen.append(int(np.argmax(dist_sq.min(axis=1))))
+
+    return np.array(chosen[n_initial:])
+
+
+def nearest_distances(data, centers):
+    dist_sq = ((data[:, np.newaxis, :] - centers) ** 2).sum(axis=2)
+    return np.sqrt(dist_sq.min(axis=1))
+
+
+@pytest.mark.parametrize("chunk_size", [7, 1000])
+def test_fps_matches_brute_force(chunk_size):
+    data = random_grid_batch(300, seed=0)
+
+    result = farthest_point_sampling(data, 20, start=5, chunk_size=chunk_size)
+
+    np.testing.assert_array_equal(result.indices, brute_force_fps(data, 20, 5))
+    assert np.isinf(result.distances[0])
+    assert np.all(np.diff(result.distances[1:]) <= 0.0)
+    assert result.radius == pytest.approx(
+        nearest_distances(data, data[result.indices]).max()
+    )
+
+
+def test_fps_with_weights():
+    data = random_grid_batch(200, seed=1)
+    weights = [1.0, 0.0, 4.0, 1.0, 0.5, 2.0]
+
+    result = farthest_point_sampling(data, 15, weights=weights)
+
+    np.testing.assert_array_equal(result.indices, brute_force_fps(data, 15, 0, weights))
+
+
+def test_fps_accepts_coordinate_batch():
+    data = random_grid_batch(100, seed=2)
+    batch = GridCoordinateBatch(data)
+
+    result = farthest_point_sampling(batch, 10)
+
+    np.testing.assert_array_equal(result.indices, brute_force_fps(data, 10, 0))
+
+
+def test_fps_continues_from_initial_indices():
+    data = random_grid_batch(200, seed=3)
+    full = brute_force_fps(data, 12, 0)
+
+    result = farthest_point_sampling(data, 8, initial_indices=full[:4])
+
+    np.testing.assert_array_equal(result.indices, full[4:])
+
+
+def test_fps_with_initial_points():
+    data = random_grid_batch(200, seed=4)
+    existing = random_grid_batch(30, seed=5)
+
+    result = farthest_point_sampling(data, 10, initial_points=existing)
+
+    combined = np.concatenate([existing, data])
+    expected = brute_force_fps_from(combined, list(range(30)), 10) - 30
+    np.testing.assert_array_equal(result.indices, expected)
+    assert result.distances[0] == pytest.approx(nearest_distances(data, existing).max())
+
+
+def test_fps_stops_at_radius():
+    data = random_grid_batch(500, seed=6)
+
+    result = farthest_point_sampling(data, radius=2.0)
+
+    assert result.radius <= 2.0
+    assert np.all(result.distances[1:] > 2.0)
+    assert result.radius == pytest.approx(
+        nearest_distances(data, data[result.indices]).max()
+    )
+
+
+def test_fps_stops_when_everything_is_chosen():
+    data = np.repeat(random_grid_batch(5, seed=7), 3, axis=0)
+
+    result = farthest_point_sampling(data, 100)
+
+    assert len(result.indices) == 5
+    assert result.radius == 0.0
+
+
+def test_fps_requires_a_stopping_rule():
+    with pytest.raises(ValueError):
+        farthest_point_sampling(random_grid_batch(10, seed=8))
+
+
+def test_k_center_assignment_and_radius():
+    data = random_grid_batch(400, seed=9)
+
+    result = greedy_k_center(data, 12, chunk_size=50)
+
+    centers = data[result.centers]
+    dist_sq = ((data[:, np.newaxis, :] - centers) ** 2).sum(axis=2)
+    np.testing.assert_array_equal(result.assignment, np.argmin(dist_sq, axis=1))
+    assert result.radius == pytest.approx(np.sqrt(dist_sq.min(axis=1).max()))
+
+    mean = data.mean(axis=0)
+    assert result.centers[0] == np.argmin(((data - mean) ** 2).sum(axis=1))
+
+
+def test_k_center_with_initial_centers_and_points():
+    data = random_grid_batch(200, seed=10)
+    existing = random_grid_batch(20, seed=11)
+
+    result = greedy_k_center(data, 5, initial_indices=[3, 7], initial_points=existing)
+
+    assert list(result.centers[:2]) == [3, 7]
+    assert len(result.centers) == 7
+
+    dist_sq = ((data[:, np.newaxis, :] - data[result.centers]) ** 2).sum(axis=2)
+    external_dist_sq = ((data[:, np.newaxis, :] - existing) ** 2).sum(axis=2)
+    is_external = external_dist_sq.min(axis=1) < dist_sq.min(axis=1)
+    np.testing.assert_array_equal(result.assignment < 0, is_external)
+    np.testing.assert_array_equal(
+        result.assignment[~is_external], np.argmin(dist_sq, axis=1)[~is_external]
+    )
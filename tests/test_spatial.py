@@ -0,0 +1,106 @@
+import numpy as np
+import pytest
+
+from frolov.coordinates.grid_coordinate import GridCoordinate
+from frolov.coordinates.grid_coordinate import GridCoordinateBatch
+from frolov.coordinates.grid_coordinate import grid_distance_squared
+
+from frolov.spatial import KDTree
+
+from randomgen import random_grid_batch
+
+
+def brute_force_distances(data, query, weights=None):
+    weights = np.ones(data.shape[1]) if weights is None else weights
+    return np.sqrt(((data - query) ** 2 * weights).sum(axis=1))
+
+
+class TestKNearest:
+    @pytest.mark.parametrize("k", [1, 4, 20])
+    @pytest.mark.parametrize("leaf_size", [1, 8, 32])
+    def test_matches_brute_force(self, k, leaf_size):
+        data = random_grid_batch(500, seed=0)
+        queries = random_grid_batch(20, seed=1)
+        tree = KDTree(data, leaf_size=leaf_size)
+
+        distances, indices = tree.query(queries, k=k)
+
+        for query, query_distances, query_indices in zip(queries, distances, indices):
+            expected = brute_force_distances(data, query)
+            np.testing.assert_allclose(query_distances, np.sort(expected)[:k])
+            np.testing.assert_allclose(expected[query_indices], query_distances)
+
+    def test_distances_match_distance_function(self):
+        batch = GridCoordinateBatch(random_grid_batch(200, seed=2))
+        query = GridCoordinate(0.5, 1.5, 2.0, 3.0, 4.0, 0.5)
+        tree = KDTree(batch)
+
+        distances, indices = tree.query(np.array(query.unpack()), k=5)
+
+        for distance, index in zip(distances[0], indices[0]):
+            expected = grid_distance_squared(query, batch[int(index)])
+            assert distance**2 == pytest.approx(expected)
+
+    def test_weights(self):
+        weights = np.array([1.0, 2.0, 0.5, 0.0, 4.0, 10.0])
+        data = random_grid_batch(300, seed=3)
+        queries = random_grid_batch(10, seed=4)
+        tree = KDTree(data, weights=weights)
+
+        distances, _ = tree.query(queries, k=3)
+
+        for query, query_distances in zip(queries, distances):
+            expected = np.sort(brute_force_distances(data, query, weights))[:3]
+            np.testing.assert_allclose(query_distances, expected)
+
+    def test_more_neighbours_than_points(self):
+        data = random_grid_batch(3, seed=5)
+        distances, indices = KDTree(data).query(data[0], k=5)
+
+        assert np.all(np.isfinite(distances[0, :3]))
+        assert np.all(np.isinf(distances[0, 3:]))
+        np.testing.assert_array_equal(indices[0, 3:], [-1, -1])
+
+    def test_invalid_k_raises(self):
+        with pytest.raises(ValueError):
+            KDTree(random_grid_batch(10)).query(random_grid_batch(1), k=0)
+
+
+class TestQueryRadius:
+    def test_matches_brute_force(self):
+        data = random_grid_batch(500, seed=6)
+        queries = random_grid_batch(20, seed=7)
+        radius = 4.0
+        tree = KDTree(data, leaf_size=8)
+
+        results = tree.query_radius(queries, radius, return_distances=True)
+
+        for query, (distances, indices) in zip(queries, results):
+            expected = brute_force_distances(data, query)
+            np.testing.assert_array_equal(indices, np.flatnonzero(expected <= radius))
+            np.testing.assert_allclose(distances, expected[indices])
+
+    def test_count_within(self):
+        data = random_grid_batch(200, seed=8)
+        queries = random_grid_batch(10, seed=9)
+        tree = KDTree(data)
+
+        expected = [np.sum(brute_force_distances(data, q) <= 3.0) for q in queries]
+        np.testing.assert_array_equal(tree.count_within(queries, 3.0), expected)
+
+    def test_empty_result(self):
+        tree = KDTree(random_grid_batch(50, seed=10))
+        (indices,) = tree.query_radius(np.full(6, 100.0), 1.0)
+
+        assert indices.size == 0
+
+
+def test_wrong_query_shape_raises():
+    tree = KDTree(random_grid_batch(10))
+    with pytest.raises(ValueError):
+        tree.query(np.zeros((2, 5)))
+
+
+def test_negative_weights_raise():
+    with pytest.raises(ValueError):
+        KDTree(random_grid_batch(10), weights=[1.0, 1.0, 1.0, 1.0, 1.0, -1.0])
@@ -0,0 +1,110 @@
+import numpy as np
+import pytest
+
+from frolov.coordinates.grid_coordinate import GridCoordinate
+from frolov.coordinates.grid_coordinate import GridCoordinateBatch
+from frolov.coordinates.cartesian_coordinate import CartesianCoordinateBatch
+
+from frolov.conversions import grid_to_cartesian_batch
+from frolov.conversions import grid_to_perimetric_batch
+
+from frolov.storage import HEADER_SIZE
+from frolov.storage import CoordinateWriter
+from frolov.storage import open_memmap
+from frolov.storage import read_header
+from frolov.storage import save
+from frolov.validation import validate_grid_batch
+from frolov.stream import convert
+
+from randomgen import random_embeddable_grid_batch
+from randomgen import random_grid_batch
+
+
+class TestStorage:
+    def test_save_and_open_batch(self, tmp_path):
+        batch = GridCoordinateBatch(random_grid_batch(100))
+        filepath = tmp_path / "grid.frolov"
+        save(filepath, batch)
+
+        loaded = open_memmap(filepath)
+
+        assert isinstance(loaded, GridCoordinateBatch)
+        assert isinstance(loaded.data, np.memmap)
+        np.testing.assert_array_equal(loaded.data, batch.data)
+        assert isinstance(loaded[5], GridCoordinate)
+
+    def test_header(self, tmp_path):
+        batch = GridCoordinateBatch(random_grid_batch(10))
+        filepath = tmp_path / "grid.frolov"
+        save(filepath, batch)
+
+        header = read_header(filepath)
+
+        assert header.kind == "grid"
+        assert header.fields == batch.fields
+        assert header.count == 10
+        assert np.dtype(header.dtype) == np.float64
+        assert filepath.stat().st_size == HEADER_SIZE + batch.data.nbytes
+
+    def test_save_cartesian_array(self, tmp_path):
+        points = grid_to_cartesian_batch(random_embeddable_grid_batch(20))
+        filepath = tmp_path / "points.frolov"
+        save(filepath, points, kind="cartesian")
+
+        loaded = open_memmap(filepath)
+
+        assert isinstance(loaded, CartesianCoordinateBatch)
+        np.testing.assert_array_equal(loaded.data, points)
+
+    def test_save_array_requires_kind(self, tmp_path):
+        with pytest.raises(ValueError):
+            save(tmp_path / "grid.frolov", random_grid_batch(10))
+
+    def test_writer_in_chunks(self, tmp_path):
+        gridcoords = random_grid_batch(100)
+        filepath = tmp_path / "grid.frolov"
+
+        with CoordinateWriter(filepath, "grid") as writer:
+            writer.write_all([gridcoords[:30], gridcoords[30:90], gridcoords[90:]])
+
+        assert read_header(filepath).count == 100
+        np.testing.assert_array_equal(open_memmap(filepath).data, gridcoords)
+
+    def test_empty_file(self, tmp_path):
+        filepath = tmp_path / "grid.frolov"
+        save(filepath, np.empty((0, 6)), kind="grid")
+
+        assert len(open_memmap(filepath)) == 0
+
+    def test_invalid_rows_are_not_checked(self, tmp_path):
+        """Neither saving nor opening a file validates the coordinates."""
+        gridcoords = random_grid_batch(10)
+        gridcoords[3, 5] = 2.0  # grid_w3 must lie in [0, 1]
+        filepath = tmp_path / "grid.frolov"
+        save(filepath, gridcoords, kind="grid")
+
+        batch = open_memmap(filepath)
+
+        np.testing.assert_array_equal(batch.data, gridcoords)
+        assert validate_grid_batch(batch.data).n_invalid == 1
+
+    def test_raises_not_a_frolov_file(self, tmp_path):
+        filepath = tmp_path / "grid.frolov"
+        filepath.write_bytes(b"\0" * 1000)
+
+        with pytest.raises(ValueError):
+            open_memmap(filepath)
+
+
+def test_stream_from_storage_file(tmp_path):
+    gridcoords = random_grid_batch(100)
+    filepath = tmp_path / "grid.frolov"
+    save(filepath, gridcoords, kind="grid")
+
+    chunks = list(convert(filepath, "grid", "perimetric", chunk_size=30))
+    np.testing.assert_allclose(
+        np.concatenate(chunks), grid_to_perimetric_batch(gridcoords)
+    )
+
+    with pytest.raises(ValueError):
+        list(convert(filepath, "perimetric", "grid"))
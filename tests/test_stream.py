@@ -0,0 +1,154 @@
+import numpy as np
+import pytest
+
+from frolov.conversions import cartesian_to_grid_batch
+from frolov.conversions import get_batch_conversion
+from frolov.conversions import grid_to_cartesian_batch
+from frolov.conversions import grid_to_perimetric_batch
+from frolov.conversions import perimetric_to_pairdistance_batch
+from frolov.conversions import pairdistance_to_cartesian_batch
+
+from frolov.stream import convert
+from frolov.stream import iter_chunks
+
+from randomgen import random_embeddable_grid_batch
+
+
+class TestGetBatchConversion:
+    def test_chained_conversion(self):
+        gridcoords = random_embeddable_grid_batch(100)
+
+        conversion = get_batch_conversion("grid", "pairdistance")
+        expected = perimetric_to_pairdistance_batch(
+            grid_to_perimetric_batch(gridcoords)
+        )
+
+        np.testing.assert_allclose(conversion(gridcoords), expected)
+
+    def test_reverse_chained_conversion(self):
+        gridcoords = random_embeddable_grid_batch(100)
+        points = grid_to_cartesian_batch(gridcoords)
+
+        conversion = get_batch_conversion("cartesian", "perimetric")
+        expected = grid_to_perimetric_batch(gridcoords)
+
+        np.testing.assert_allclose(conversion(points), expected, atol=1.0e-10)
+
+    @pytest.mark.parametrize(
+        "from_, to",
+        [("pairdistance", "grid"), ("cartesian", "perimetric"), ("cartesian", "grid")],
+    )
+    def test_reverse_chained_conversion_recovers_source(self, from_, to):
+        """Chains that run backwards through COORDINATE_KINDS, including to 'grid'."""
+        gridcoords = random_embeddable_grid_batch(100)
+        source = get_batch_conversion("grid", from_)(gridcoords)
+        expected = get_batch_conversion("grid", to)(gridcoords)
+
+        conversion = get_batch_conversion(from_, to)
+
+        np.testing.assert_allclose(conversion(source), expected, rtol=1.0e-8)
+
+    def test_identity_conversion_copies(self):
+        gridcoords = random_embeddable_grid_batch(10)
+        converted = get_batch_conversion("grid", "grid")(gridcoords)
+
+        np.testing.assert_array_equal(converted, gridcoords)
+        assert not np.shares_memory(converted, gridcoords)
+
+    def test_raises_unknown_kind(self):
+        with pytest.raises(ValueError):
+            get_batch_conversion("grid", "spherical")
+
+
+class TestConvert:
+    def test_array_source(self):
+        gridcoords = random_embeddable_grid_batch(1000)
+        chunks = list(convert(gridcoords, "grid", "cartesian", chunk_size=300))
+
+        assert [chunk.shape[0] for chunk in chunks] == [300, 300, 300, 100]
+        np.testing.assert_allclose(
+            np.concatenate(chunks), grid_to_cartesian_batch(gridcoords)
+        )
+
+    def test_row_iterable_source(self):
+        gridcoords = random_embeddable_grid_batch(100)
+        rows = (tuple(row) for row in gridcoords)
+        chunks = list(convert(rows, "grid", "perimetric", chunk_size=32))
+
+        assert len(chunks) == 4
+        np.testing.assert_allclose(
+            np.concatenate(chunks), grid_to_perimetric_batch(gridcoords)
+        )
+
+    def test_npy_file_source(self, tmp_path):
+        gridcoords = random_embeddable_grid_batch(100)
+        filepath = tmp_path / "grid.npy"
+        np.save(filepath, gridcoords)
+
+        chunks = list(convert(filepath, "grid", "perimetric", chunk_size=40))
+
+        np.testing.assert_allclose(
+            np.concatenate(chunks), grid_to_perimetric_batch(gridcoords)
+        )
+
+    @pytest.mark.parametrize("suffix, delimiter", [(".csv", ","), (".txt", " ")])
+    def test_text_file_source(self, tmp_path, suffix, delimiter):
+        gridcoords = random_embeddable_grid_batch(100)
+        points = grid_to_cartesian_batch(gridcoords)
+        filepath = tmp_path / f"points{suffix}"
+        np.savetxt(filepath, points.reshape(-1, 12), delimiter=delimiter, fmt="%.17g")
+
+        chunks = list(convert(filepath, "cartesian", "grid", chunk_size=64))
+
+        assert [chunk.shape for chunk in chunks] == [(64, 6), (36, 6)]
+        np.testing.assert_allclose(np.concatenate(chunks), gridcoords, rtol=1.0e-8)
+
+    def test_flat_cartesian_rows(self):
+        points = grid_to_cartesian_batch(random_embeddable_grid_batch(20))
+        chunks = list(convert(points.reshape(-1, 12), "cartesian", "grid"))
+
+        np.testing.assert_allclose(
+            np.concatenate(chunks), cartesian_to_grid_batch(points)
+        )
+
+    def test_single_row(self):
+        gridcoords = random_embeddable_grid_batch(1)
+        chunks = list(convert(gridcoords[0], "grid", "perimetric", chunk_size=4))
+
+        assert len(chunks) == 1
+        np.testing.assert_allclose(chunks[0], grid_to_perimetric_batch(gridcoords))
+
+    @pytest.mark.parametrize(
+        "shape, kind",
+        [
+            ((10, 6), "cartesian"),
+            ((10, 4, 3), "grid"),
+            ((10, 12), "pairdistance"),
+            ((10, 2, 3), "perimetric"),
+            ((60,), "perimetric"),
+        ],
+    )
+    def test_raises_wrong_shape(self, shape, kind):
+        with pytest.raises(ValueError):
+            list(convert(np.ones(shape), kind, "pairdistance"))
+
+    def test_raises_wrong_shape_in_file(self, tmp_path):
+        filepath = tmp_path / "points.npy"
+        np.save(filepath, np.ones((10, 4, 3)))
+
+        with pytest.raises(ValueError):
+            list(convert(filepath, "grid", "perimetric"))
+
+    def test_raises_invalid_chunk_size(self):
+        with pytest.raises(ValueError):
+            list(iter_chunks(np.ones((10, 6)), "grid", chunk_size=0))
+
+
+def test_pairdistance_to_cartesian_stream_matches_batch():
+    gridcoords = random_embeddable_grid_batch(50)
+    pairdists = perimetric_to_pairdistance_batch(grid_to_perimetric_batch(gridcoords))
+
+    chunks = list(convert(pairdists, "pairdistance", "cartesian", chunk_size=7))
+    np.testing.assert_allclose(
+        np.concatenate(chunks), pairdistance_to_cartesian_batch(pairdists)
+    )
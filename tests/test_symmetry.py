@@ -0,0 +1,206 @@
+import numpy as np
+import pytest
+
+from frolov.conversions import cartesian_to_pairdistance_batch
+from frolov.conversions import pairdistance_to_perimetric_batch
+
+from frolov.symmetry import PERMUTATIONS
+from frolov.symmetry import DeduplicationIndex
+from frolov.symmetry import canonicalize_pairdistance_batch
+from frolov.symmetry import canonicalize_perimetric_batch
+from frolov.symmetry import deduplicate_pairdistance_batch
+from frolov.symmetry import is_canonical_pairdistance_batch
+from frolov.symmetry import permute_pairdistance_batch
+from frolov.symmetry import smaller_labellings_pairdistance_batch
+
+from randomgen import random_cartesian_batch
+
+
+def relabel_points(points, permutation):
+    """Give the point with the original label 'permutation[j]' the new label 'j'."""
+    return points[:, list(permutation), :]
+
+
+def test_permute_pairdistance_batch_matches_relabelled_points():
+    points = random_cartesian_batch(50)
+
+    for permutation in PERMUTATIONS:
+        expected = cartesian_to_pairdistance_batch(relabel_points(points, permutation))
+        permuted = permute_pairdistance_batch(
+            cartesian_to_pairdistance_batch(points), permutation
+        )
+
+        np.testing.assert_allclose(permuted, expected)
+
+
+class TestCanonicalize:
+    def test_all_labellings_give_same_canonical_form(self):
+        points = random_cartesian_batch(100)
+        expected, _ = canonicalize_pairdistance_batch(
+            cartesian_to_pairdistance_batch(points)
+        )
+
+        for permutation in PERMUTATIONS:
+            pairdists = cartesian_to_pairdistance_batch(
+                relabel_points(points, permutation)
+            )
+            canonical, _ = canonicalize_pairdistance_batch(pairdists)
+
+            np.testing.assert_allclose(canonical, expected)
+
+    def test_canonical_is_lexicographically_smallest(self):
+        pairdists = cartesian_to_pairdistance_batch(random_cartesian_batch(20))
+        canonical, i_perms = canonicalize_pairdistance_batch(pairdists)
+
+        for row, canonical_row, i_perm in zip(pairdists, canonical, i_perms):
+            labellings = [
+                tuple(permute_pairdistance_batch(row[np.newaxis], perm)[0])
+                for perm in PERMUTATIONS
+            ]
+            assert tuple(canonical_row) == min(labellings)
+            assert labellings[i_perm] == tuple(canonical_row)
+
+    def test_stable_under_round_off(self):
+        """A regular tetrahedron has all pair distances equal; tiny noise must not matter."""
+        rng = np.random.default_rng(0)
+        pairdists = 1.0 + 1.0e-12 * rng.standard_normal((50, 6))
+        canonical, _ = canonicalize_pairdistance_batch(pairdists, atol=1.0e-9)
+
+        np.testing.assert_allclose(canonical, 1.0, atol=1.0e-10)
+
+    def test_perimetric(self):
+        points = random_cartesian_batch(50)
+        pairdists = cartesian_to_pairdistance_batch(points)
+        perimetrics = pairdistance_to_perimetric_batch(pairdists)
+
+        canonical_pairdists, _ = canonicalize_pairdistance_batch(pairdists)
+        canonical_perimetrics, _ = canonicalize_perimetric_batch(perimetrics)
+
+        np.testing.assert_allclose(
+            canonical_perimetrics,
+            pairdistance_to_perimetric_batch(canonical_pairdists),
+            atol=1.0e-12,
+        )
+
+    def test_raises_invalid_shape(self):
+        with pytest.raises(ValueError):
+            canonicalize_pairdistance_batch(np.ones((10, 5)))
+
+
+class TestIsCanonical:
+    def test_matches_canonicalize(self):
+        pairdists = cartesian_to_pairdistance_batch(random_cartesian_batch(200))
+        canonical, _ = canonicalize_pairdistance_batch(pairdists)
+
+        np.testing.assert_array_equal(
+            is_canonical_pairdistance_batch(pairdists),
+            np.all(canonical == pairdists, axis=1),
+        )
+        assert np.all(is_canonical_pairdistance_batch(canonical))
+
+    def test_exactly_one_labelling_is_canonical(self):
+        points = random_cartesian_batch(100)
+        labellings = [
+            cartesian_to_pairdistance_batch(relabel_points(points, permutation))
+            for permutation in PERMUTATIONS
+        ]
+
+        n_canonical = sum(is_canonical_pairdistance_batch(pd) for pd in labellings)
+
+        np.testing.assert_array_equal(n_canonical, 1)
+
+    def test_smaller_labellings(self):
+        pairdists = cartesian_to_pairdistance_batch(random_cartesian_batch(20))
+        smaller = smaller_labellings_pairdistance_batch(pairdists)
+
+        assert smaller.shape == (20, len(PERMUTATIONS))
+        for row, row_smaller in zip(pairdists, smaller):
+            for permutation, is_smaller in zip(PERMUTATIONS, row_smaller):
+                permuted = permute_pairdistance_batch(row[np.newaxis], permutation)[0]
+                assert is_smaller == (tuple(permuted) < tuple(row))
+
+    def test_symmetric_geometry_is_canonical(self):
+        """Labellings that give equal pair distances are not smaller."""
+        assert is_canonical_pairdistance_batch(np.ones((1, 6)))[0]
+
+
+class TestDeduplicationIndex:
+    def test_detects_permuted_duplicates(self):
+        rng = np.random.default_rng(0)
+        points = random_cartesian_batch(500, seed=1)
+        permutations = [PERMUTATIONS[i] for i in rng.integers(0, 24, size=500)]
+        relabelled = np.array(
+            [p[list(perm)] for (p, perm) in zip(points, permutations)]
+        )
+        relabelled += 1.0e-10 * rng.standard_normal(relabelled.shape)
+
+        index = DeduplicationIndex(tolerance=1.0e-6)
+        is_new_original = index.add(cartesian_to_pairdistance_batch(points))
+        is_new_relabelled = index.add(cartesian_to_pairdistance_batch(relabelled))
+
+        assert np.all(is_new_original)
+        assert not np.any(is_new_relabelled)
+        assert len(index) == 500
+
+    def test_detects_relabelled_near_ties(self):
+        # pair distances within the tolerance of one another, so a small perturbation
+        # can change which labelling is the canonical one
+        rng = np.random.default_rng(2)
+        tolerance = 1.0e-3
+        sizes = 1.0 + 0.01 * np.arange(500)
+        pairdists = sizes[:, np.newaxis] + rng.uniform(-2.0e-3, 2.0e-3, size=(500, 6))
+        relabelled = np.array(
+            [
+                permute_pairdistance_batch(row[np.newaxis], PERMUTATIONS[i_perm])[0]
+                for (row, i_perm) in zip(pairdists, rng.integers(0, 24, size=500))
+            ]
+        )
+        noise = rng.standard_normal(relabelled.shape)
+        noise *= 0.9 * tolerance / np.linalg.norm(noise, axis=1, keepdims=True)
+
+        index = DeduplicationIndex(tolerance)
+        assert np.all(index.add(pairdists))
+        assert np.all(index.contains(relabelled + noise))
+
+    def test_duplicates_within_a_batch(self):
+        pairdists = cartesian_to_pairdistance_batch(random_cartesian_batch(10))
+        repeated = np.concatenate([pairdists, pairdists[::-1]])
+
+        index = DeduplicationIndex(tolerance=1.0e-8)
+        is_new = index.add(repeated)
+
+        np.testing.assert_array_equal(is_new, [True] * 10 + [False] * 10)
+
+    def test_contains(self):
+        pairdists = cartesian_to_pairdistance_batch(random_cartesian_batch(20))
+
+        index = DeduplicationIndex(tolerance=1.0e-8)
+        index.add(pairdists[:10])
+
+        np.testing.assert_array_equal(
+            index.contains(pairdists), [True] * 10 + [False] * 10
+        )
+        assert len(index) == 10
+
+    def test_tolerance_boundary(self):
+        index = DeduplicationIndex(tolerance=0.1)
+        index.add(np.array([[1.0, 2.0, 3.0, 4.0, 5.0, 6.0]]))
+
+        near = np.array([[1.0, 2.0, 3.0, 4.0, 5.0, 6.09]])
+        far = np.array([[1.0, 2.0, 3.0, 4.0, 5.0, 6.11]])
+        np.testing.assert_array_equal(
+            index.contains(np.concatenate([near, far])), [True, False]
+        )
+
+    def test_raises_nonpositive_tolerance(self):
+        with pytest.raises(ValueError):
+            DeduplicationIndex(tolerance=0.0)
+
+
+def test_deduplicate_pairdistance_batch():
+    pairdists = cartesian_to_pairdistance_batch(random_cartesian_batch(5))
+    swapped = permute_pairdistance_batch(pairdists, (1, 0, 3, 2))
+    combined = np.concatenate([pairdists, swapped, pairdists[:2]])
+
+    unique_indices = deduplicate_pairdistance_batch(combined, tolerance=1.0e-8)
+    np.testing.assert_array_equal(unique_indices, np.arange(5))
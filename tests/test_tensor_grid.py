@@ -0,0 +1,106 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from frolov.coordinates.grid_coordinate import GridCoordinate
+from frolov.coordinates.grid_coordinate import GridCoordinateBatch
+from frolov.sampling import GridBounds
+from frolov.tensor_grid import TensorGrid
+
+
+@pytest.fixture
+def small_grid():
+    return TensorGrid(
+        [0.0, 1.0],
+        [0.5, 1.5, 2.5],
+        [1.0, 2.0],
+        [1.0],
+        [1.0, 3.0, 5.0, 7.0],
+        [0.0, 0.5, 1.0],
+    )
+
+
+def expected_points(grid):
+    return np.array(list(itertools.product(*grid.axes)))
+
+
+def test_len_and_shape(small_grid):
+    assert small_grid.shape == (2, 3, 2, 1, 4, 3)
+    assert len(small_grid) == 144
+
+
+def test_points_match_itertools_product(small_grid):
+    np.testing.assert_array_equal(
+        small_grid.values(0, len(small_grid)), expected_points(small_grid)
+    )
+
+
+def test_index_round_trip(small_grid):
+    for index in [0, 1, 17, 143]:
+        coord = small_grid.coordinate(index)
+        assert small_grid.index_of(coord) == index
+        assert small_grid.ravel(small_grid.unravel(index)) == index
+        assert coord.unpack() == tuple(expected_points(small_grid)[index])
+
+
+def test_negative_and_out_of_range_indices(small_grid):
+    assert small_grid[-1] == small_grid[143]
+    with pytest.raises(IndexError):
+        small_grid.coordinate(144)
+
+
+def test_index_of_off_grid_coordinate(small_grid):
+    with pytest.raises(ValueError):
+        small_grid.index_of(GridCoordinate(0.5, 0.5, 1.0, 1.0, 1.0, 0.0))
+
+
+def test_slice_returns_batch(small_grid):
+    batch = small_grid[10:20]
+
+    assert isinstance(batch, GridCoordinateBatch)
+    np.testing.assert_array_equal(batch.data, expected_points(small_grid)[10:20])
+
+
+def test_iter_batches_cover_grid(small_grid):
+    batches = list(small_grid.iter_batches(batch_size=50))
+
+    assert [batch.shape[0] for batch in batches] == [50, 50, 44]
+    np.testing.assert_array_equal(np.concatenate(batches), expected_points(small_grid))
+
+
+def test_shards_cover_grid_without_overlap(small_grid):
+    shards = small_grid.shards(5)
+
+    assert shards[0].start == 0
+    assert shards[-1].stop == len(small_grid)
+    assert all(a.stop == b.start for (a, b) in zip(shards[:-1], shards[1:]))
+    assert max(len(s) for s in shards) - min(len(s) for s in shards) <= 1
+
+    points = np.concatenate(
+        [np.concatenate(list(small_grid.iter_batches(7, shard))) for shard in shards]
+    )
+    np.testing.assert_array_equal(points, expected_points(small_grid))
+
+
+def test_huge_grid_is_not_materialized():
+    grid = TensorGrid.from_bounds(GridBounds(), 30)
+
+    assert len(grid) == 30**6
+    last = grid.coordinate(len(grid) - 1)
+    assert last.unpack() == tuple(GridBounds().upper)
+    assert grid.values(len(grid) - 3, len(grid)).shape == (3, 6)
+
+
+@pytest.mark.parametrize(
+    "axes",
+    [
+        ([], [0.0], [1.0], [1.0], [1.0], [0.0]),  # empty axis
+        ([1.0, 0.0], [0.0], [1.0], [1.0], [1.0], [0.0]),  # decreasing
+        ([0.0], [0.0], [0.5, 1.0], [1.0], [1.0], [0.0]),  # grid_u3 < 1
+        ([0.0], [0.0], [1.0], [1.0], [1.0], [0.0, 1.5]),  # grid_w3 > 1
+    ],
+)
+def test_invalid_axes_raise(axes):
+    with pytest.raises(ValueError):
+        TensorGrid(*axes)
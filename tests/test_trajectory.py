@@ -0,0 +1,210 @@
+import numpy as np
+import pytest
+
+from frolov.cli import main
+from frolov.conversions import cartesian_to_grid_batch
+from frolov.conversions import cartesian_to_pairdistance_batch
+from frolov.conversions import pairdistance_to_perimetric_batch
+
+from frolov.trajectory import convert_trajectory
+from frolov.trajectory import iter_binary_frames
+from frolov.trajectory import iter_frames
+from frolov.trajectory import iter_xyz_frames
+
+from randomgen import random_cartesian_batch
+
+
+def write_xyz(path, frames, extra_columns=0, trailing=""):
+    with open(path, "w") as fout:
+        for i_frame, frame in enumerate(frames):
+            fout.write(f"4\nframe {i_frame} energy=-1.0\n")
+            for symbol, (x, y, z) in zip(("H", "H", "He", "Li"), frame):
+                extra = " 0.5" * extra_columns
+                fout.write(f"{symbol} {x:.17g} {y:.17g} {z:.17g}{extra}\n")
+        fout.write(trailing)
+
+
+def expected_perimetrics(frames):
+    return pairdistance_to_perimetric_batch(cartesian_to_pairdistance_batch(frames))
+
+
+class TestIterXYZFrames:
+    def test_round_trip(self, tmp_path):
+        frames = random_cartesian_batch(100, seed=0)
+        filepath = tmp_path / "traj.xyz"
+        write_xyz(filepath, frames)
+
+        chunks = list(iter_xyz_frames(filepath, chunk_size=32))
+
+        assert [chunk.shape for chunk in chunks] == [
+            (32, 4, 3),
+            (32, 4, 3),
+            (32, 4, 3),
+            (4, 4, 3),
+        ]
+        np.testing.assert_array_equal(np.concatenate(chunks), frames)
+
+    def test_ignores_extra_columns_and_trailing_blank_lines(self, tmp_path):
+        frames = random_cartesian_batch(10, seed=1)
+        filepath = tmp_path / "traj.xyz"
+        write_xyz(filepath, frames, extra_columns=3, trailing="\n\n")
+
+        chunks = list(iter_xyz_frames(filepath, chunk_size=5))
+
+        np.testing.assert_array_equal(np.concatenate(chunks), frames)
+
+    def test_raises_wrong_atom_count(self, tmp_path):
+        filepath = tmp_path / "traj.xyz"
+        write_xyz(filepath, random_cartesian_batch(3, seed=2))
+        lines = filepath.read_text().splitlines(keepends=True)
+        lines[12] = "5\n"
+        filepath.write_text("".join(lines))
+
+        with pytest.raises(ValueError, match="Frame 2"):
+            list(iter_xyz_frames(filepath))
+
+    def test_raises_incomplete_frame(self, tmp_path):
+        filepath = tmp_path / "traj.xyz"
+        write_xyz(filepath, random_cartesian_batch(3, seed=3))
+        lines = filepath.read_text().splitlines(keepends=True)
+        filepath.write_text("".join(lines[:-1]))
+
+        with pytest.raises(ValueError, match="incomplete"):
+            list(iter_xyz_frames(filepath))
+
+
+class TestIterBinaryFrames:
+    def test_round_trip(self, tmp_path):
+        frames = random_cartesian_batch(50, seed=4)
+        filepath = tmp_path / "traj.bin"
+        frames.tofile(filepath)
+
+        chunks = list(iter_binary_frames(filepath, chunk_size=20))
+
+        assert [chunk.shape[0] for chunk in chunks] == [20, 20, 10]
+        np.testing.assert_array_equal(np.concatenate(chunks), frames)
+
+    def test_dtype_and_offset(self, tmp_path):
+        frames = random_cartesian_batch(30, seed=5).astype(">f4")
+        filepath = tmp_path / "traj.dat"
+        with open(filepath, "wb") as fout:
+            fout.write(b"HEADER")
+            fout.write(frames.tobytes())
+
+        chunks = list(
+            iter_binary_frames(filepath, chunk_size=8, frame_dtype=">f4", offset=6)
+        )
+
+        assert all(chunk.dtype == np.float64 for chunk in chunks)
+        np.testing.assert_array_equal(np.concatenate(chunks), frames)
+
+    def test_raises_incomplete_frame(self, tmp_path):
+        filepath = tmp_path / "traj.bin"
+        random_cartesian_batch(4, seed=6).reshape(-1)[:-1].tofile(filepath)
+
+        with pytest.raises(ValueError, match="incomplete"):
+            list(iter_binary_frames(filepath))
+
+
+class TestIterFrames:
+    @pytest.mark.parametrize("filename", ["traj.xyz", "traj.npy", "traj.bin"])
+    def test_format_from_suffix(self, tmp_path, filename):
+        frames = random_cartesian_batch(40, seed=7)
+        filepath = tmp_path / filename
+        if filename.endswith(".xyz"):
+            write_xyz(filepath, frames)
+        elif filename.endswith(".npy"):
+            np.save(filepath, frames)
+        else:
+            frames.tofile(filepath)
+
+        chunks = list(iter_frames(filepath, chunk_size=16))
+
+        np.testing.assert_array_equal(np.concatenate(chunks), frames)
+
+    def test_explicit_format(self, tmp_path):
+        frames = random_cartesian_batch(10, seed=8)
+        filepath = tmp_path / "traj.txt"
+        write_xyz(filepath, frames)
+
+        chunks = list(iter_frames(filepath, format="xyz"))
+
+        np.testing.assert_array_equal(np.concatenate(chunks), frames)
+
+    def test_raises_unknown_format(self, tmp_path):
+        with pytest.raises(ValueError):
+            list(iter_frames(tmp_path / "traj.dcd", format="dcd"))
+
+    def test_raises_wrong_npy_shape(self, tmp_path):
+        filepath = tmp_path / "traj.npy"
+        np.save(filepath, np.ones((10, 12)))
+
+        with pytest.raises(ValueError):
+            list(iter_frames(filepath))
+
+
+class TestConvertTrajectory:
+    def test_perimetric(self, tmp_path):
+        frames = random_cartesian_batch(100, seed=9)
+        filepath = tmp_path / "traj.xyz"
+        write_xyz(filepath, frames)
+
+        chunks = list(convert_trajectory(filepath, "perimetric", chunk_size=30))
+
+        assert [chunk.shape for chunk in chunks] == [(30, 6)] * 3 + [(10, 6)]
+        np.testing.assert_allclose(np.concatenate(chunks), expected_perimetrics(frames))
+
+    def test_grid_float32(self, tmp_path):
+        frames = random_cartesian_batch(100, seed=10)
+        filepath = tmp_path / "traj.bin"
+        frames.tofile(filepath)
+
+        chunks = list(convert_trajectory(filepath, "grid", dtype=np.float32))
+
+        assert chunks[0].dtype == np.float32
+        np.testing.assert_allclose(
+            np.concatenate(chunks), cartesian_to_grid_batch(frames), rtol=1.0e-5
+        )
+
+
+def test_cli_converts_xyz(tmp_path):
+    frames = random_cartesian_batch(50, seed=11)
+    input_path = tmp_path / "traj.xyz"
+    output_path = tmp_path / "perimetric.npy"
+    write_xyz(input_path, frames)
+
+    status = main(
+        [
+            "convert",
+            str(input_path),
+            str(output_path),
+            "--from",
+            "cartesian",
+            "--to",
+            "perimetric",
+            "--chunk-size",
+            "16",
+            "--quiet",
+        ]
+    )
+
+    assert status == 0
+    np.testing.assert_allclose(np.load(output_path), expected_perimetrics(frames))
+
+
+def test_cli_raises_xyz_with_wrong_kind(tmp_path):
+    input_path = tmp_path / "traj.xyz"
+    write_xyz(input_path, random_cartesian_batch(5, seed=12))
+
+    with pytest.raises(SystemExit):
+        main(
+            [
+                "convert",
+                str(input_path),
+                str(tmp_path / "out.npy"),
+                "--from",
+                "grid",
+                "--to",
+                "perimetric",
+            ]
+        )
@@ -0,0 +1,243 @@
+import numpy as np
+import pytest
+
+from frolov.coordinates.grid_coordinate import GridCoordinate
+from frolov.coordinates.grid_coordinate import GridCoordinateBatch
+from frolov.coordinates.pairdistance_coordinate import PairDistanceCoordinate
+from frolov.coordinates.perimetric_coordinate import PerimetricCoordinate
+
+from frolov.conversions import grid_to_perimetric
+from frolov.conversions import cartesian_to_pairdistance_batch
+from frolov.conversions import grid_to_perimetric_batch
+from frolov.conversions import pairdistance_to_cartesian_batch
+from frolov.conversions import pairdistance_to_cartesian_batch_with_status
+from frolov.conversions import EmbeddingStatus
+
+from frolov.validation import InvalidCoordinateError
+from frolov.validation import ValidationMode
+from frolov.validation import get_validation_mode
+from frolov.validation import validation_mode
+from frolov.validation import cayley_menger_volume_squared_batch
+from frolov.validation import validate_cartesian_batch
+from frolov.validation import validate_embeddable_pairdistance_batch
+from frolov.validation import validate_grid_batch
+from frolov.validation import validate_pairdistance_batch
+from frolov.validation import validate_perimetric_batch
+
+from randomgen import random_cartesian_batch
+from randomgen import random_grid_batch
+
+
+def grid_batch_with_invalid_rows() -> np.ndarray:
+    """A batch of valid grid coordinates, where rows 1 and 3 are made invalid."""
+    gridcoords = random_grid_batch(5)
+    gridcoords[1, 2] = 0.5  # grid_u3 < 1
+    gridcoords[3, 5] = 1.5  # grid_w3 > 1
+
+    return gridcoords
+
+
+class TestValidationMode:
+    def test_default_is_eager(self):
+        assert get_validation_mode() is ValidationMode.EAGER
+
+    def test_context_manager_restores_mode(self):
+        with validation_mode("off"):
+            assert get_validation_mode() is ValidationMode.OFF
+        assert get_validation_mode() is ValidationMode.EAGER
+
+    def test_eager_raises_for_scalar(self):
+        with pytest.raises(InvalidCoordinateError):
+            GridCoordinate(0.1, 0.2, 0.5, 1.4, 1.1, 0.6)
+
+    @pytest.mark.parametrize("mode", [ValidationMode.DEFERRED, ValidationMode.OFF])
+    def test_non_eager_skips_scalar_checks(self, mode):
+        with validation_mode(mode):
+            GridCoordinate(0.1, 0.2, 0.5, 1.4, 1.1, 0.6)
+            PairDistanceCoordinate(-1.0, 1.0, 1.0, 1.0, 1.0, 1.0)
+            PerimetricCoordinate(-1.0, 1.0, 1.0, 1.0, 1.0, 1.0)
+
+    def test_eager_raises_for_batch(self):
+        with pytest.raises(InvalidCoordinateError):
+            GridCoordinateBatch(grid_batch_with_invalid_rows())
+
+    def test_deferred_keeps_report_for_batch(self):
+        with validation_mode(ValidationMode.DEFERRED):
+            batch = GridCoordinateBatch(grid_batch_with_invalid_rows())
+
+        report = batch.validation_report
+        assert report is not None
+        np.testing.assert_array_equal(report.mask, [True, False, True, False, True])
+        assert len(batch.valid_rows()) == 3
+
+    def test_off_skips_batch_checks(self):
+        with validation_mode(ValidationMode.OFF):
+            batch = GridCoordinateBatch(grid_batch_with_invalid_rows())
+
+        assert batch.validation_report is None
+        assert batch.validate().n_invalid == 2
+
+
+class TestValidateGridBatch:
+    def test_all_valid(self):
+        report = validate_grid_batch(random_grid_batch(100))
+
+        assert report.all_valid
+        assert report.n_invalid == 0
+
+    def test_violation_report(self):
+        report = validate_grid_batch(grid_batch_with_invalid_rows())
+
+        assert report.n_invalid == 2
+        counts = report.violation_counts()
+        assert counts["grid_u3 >= 1"] == 1
+        assert counts["0 <= grid_w3 <= 1"] == 1
+        assert counts["grid_u1 >= 0"] == 0
+
+    def test_nan_is_invalid(self):
+        gridcoords = random_grid_batch(3)
+        gridcoords[0, 0] = np.nan
+
+        report = validate_grid_batch(gridcoords)
+        np.testing.assert_array_equal(report.mask, [False, True, True])
+
+    def test_raise_if_invalid(self):
+        report = validate_grid_batch(grid_batch_with_invalid_rows())
+
+        with pytest.raises(InvalidCoordinateError):
+            report.raise_if_invalid("grid")
+
+
+class TestValidatePerimetricBatch:
+    def test_agrees_with_scalar_checks(self):
+        """
+        Perturb valid perimetric coordinates at random, and make sure the batched check
+        accepts exactly the rows for which the scalar construction succeeds.
+        """
+        rng = np.random.default_rng(0)
+        perimetrics = grid_to_perimetric_batch(random_grid_batch(500))
+        perimetrics += rng.normal(scale=2.0, size=perimetrics.shape)
+
+        report = validate_perimetric_batch(perimetrics)
+
+        for row, is_valid in zip(perimetrics, report.mask):
+            try:
+                PerimetricCoordinate(*row)
+                constructed = True
+            except InvalidCoordinateError:
+                constructed = False
+            assert constructed == is_valid
+
+    def test_valid_from_grid(self):
+        gridcoords = random_grid_batch(100)
+        perimetrics = grid_to_perimetric_batch(gridcoords)
+
+        assert validate_perimetric_batch(perimetrics, atol=1.0e-12).all_valid
+        for row in gridcoords:
+            grid_to_perimetric(GridCoordinate(*row))
+
+
+def test_validate_pairdistance_batch():
+    pairdists = np.ones((4, 6))
+    pairdists[2, 3] = -0.1
+
+    report = validate_pairdistance_batch(pairdists)
+    np.testing.assert_array_equal(report.mask, [True, True, False, True])
+    assert report.violation_counts() == {"nonnegative": 1}
+
+
+def test_validate_cartesian_batch():
+    points = np.zeros((3, 4, 3))
+    points[1, 2, 0] = np.inf
+
+    report = validate_cartesian_batch(points)
+    np.testing.assert_array_equal(report.mask, [True, False, True])
+
+
+class TestValidateEmbeddablePairDistanceBatch:
+    def test_volume_of_real_geometries(self):
+        points = random_cartesian_batch(50, seed=0)
+        edges = points[:, 1:] - points[:, :1]
+        expected = (np.linalg.det(edges) / 6.0) ** 2
+
+        volume_squared = cayley_menger_volume_squared_batch(
+            cartesian_to_pairdistance_batch(points)
+        )
+
+        np.testing.assert_allclose(volume_squared, expected, rtol=1.0e-8, atol=1.0e-14)
+
+    def test_real_and_planar_geometries_are_valid(self):
+        points = random_cartesian_batch(100, seed=1)
+        points[50:, :, 2] = 0.0
+
+        report, _ = validate_embeddable_pairdistance_batch(
+            cartesian_to_pairdistance_batch(points)
+        )
+
+        assert report.all_valid
+
+    def test_triangle_violation(self):
+        pairdists = np.array([[1.0, 1.0, 1.0, 3.0, 1.0, 1.0]])
+        report, _ = validate_embeddable_pairdistance_batch(pairdists)
+
+        assert not report.all_valid
+        assert report.violation_counts()["triangle 012"] == 1
+        assert report.violation_counts()["triangle 013"] == 0
+
+    def test_returns_volumes(self):
+        rng = np.random.default_rng(3)
+        pairdists = rng.uniform(0.5, 1.5, size=(100, 6))
+
+        report, volume_squared = validate_embeddable_pairdistance_batch(pairdists)
+
+        np.testing.assert_array_equal(
+            volume_squared, cayley_menger_volume_squared_batch(pairdists)
+        )
+        scale = np.max(pairdists, axis=1) ** 6
+        np.testing.assert_array_equal(
+            report.violations["cayley-menger"], volume_squared < -1.0e-10 * scale
+        )
+
+    def test_negative_volume_without_triangle_violations(self):
+        # every face is a valid triangle, but the faces cannot be folded into a
+        # tetrahedron: point3 is closer to the corners of the equilateral triangle
+        # formed by the other three points than the centre of that triangle is
+        pairdists = np.array([[1.0, 1.0, 0.55, 1.0, 0.55, 0.55]])
+        report, _ = validate_embeddable_pairdistance_batch(pairdists)
+
+        counts = report.violation_counts()
+        assert counts["cayley-menger"] == 1
+        assert sum(counts[name] for name in counts if name.startswith("triangle")) == 0
+        assert cayley_menger_volume_squared_batch(pairdists)[0] < 0.0
+
+    def test_accepts_degenerate_geometries_the_embedding_cannot_place(self):
+        """A planar unit square, and a geometry where particles 0 and 1 coincide."""
+        pairdists = np.array(
+            [
+                [1.0, np.sqrt(2.0), 1.0, 1.0, np.sqrt(2.0), 1.0],
+                [0.0, 1.0, 1.0, 1.0, 1.0, 1.0],
+            ]
+        )
+
+        report, _ = validate_embeddable_pairdistance_batch(pairdists)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            points = pairdistance_to_cartesian_batch(pairdists)
+            _, status = pairdistance_to_cartesian_batch_with_status(pairdists)
+
+        assert report.all_valid
+        assert np.all(np.isnan(points[:, 3, 2]))
+        assert status.tolist() == [
+            EmbeddingStatus.PLANAR,
+            EmbeddingStatus.NON_EMBEDDABLE,
+        ]
+
+    def test_agrees_with_embedding(self):
+        rng = np.random.default_rng(2)
+        pairdists = rng.uniform(0.5, 1.5, size=(2000, 6))
+
+        report, _ = validate_embeddable_pairdistance_batch(pairdists)
+        with np.errstate(invalid="ignore"):
+            points = pairdistance_to_cartesian_batch(pairdists)
+        embedded = np.all(np.isfinite(points), axis=(1, 2))
+
+        np.testing.assert_array_equal(report.mask, embedded)
@@ -14,15 +14,8 @@ import numpy as np
 
 from frolov.coordinates.cartesian_coordinate import CartesianCoordinate
 from frolov.coordinates.grid_coordinate import GridCoordinate
-from frolov.coordinates.pairdistance_coordinate import PairDistanceCoordinate
-from frolov.coordinates.perimetric_coordinate import PerimetricCoordinate
 
-from frolov.conversions import cartesian_to_pairdistance
-from frolov.conversions import pairdistance_to_cartesian
-from frolov.conversions import pairdistance_to_perimetric
-from frolov.conversions import perimetric_to_pairdistance
-from frolov.conversions import perimetric_to_grid
-from frolov.conversions import grid_to_perimetric
+from frolov.conversions import grid_to_cartesian
 
 
 class ColorGradientPicker:
@@ -41,16 +34,6 @@ class ColorGradientPicker:
         return color
 
 
-def grid_to_cartesian(grid_coord: GridCoordinate) -> CartesianCoordinate:
-    peri_coord = grid_to_perimetric(grid_coord)
-    print(peri_coord)
-    pair_coord = perimetric_to_pairdistance(peri_coord)
-    print(pair_coord)
-    cart_coord = pairdistance_to_cartesian(pair_coord)
-
-    return cart_coord
-
-
 XYZArrays = Tuple[np.ndarray[4], np.ndarray[4], np.ndarray[4]]
 def unwrap_cartesian(cart_coord: CartesianCoordinate) -> XYZArrays:
     xdata = np.array([point[0] for point in cart_coord.unpack()])